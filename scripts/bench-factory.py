@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+bench-factory.py — 合成カタログによる lint / sync / dep-graph のスケーリング計測
+
+factorylib.synth で 100 / 1k / 10k スキル規模のファクトリーを一時ディレクトリに生成し、
+各フェーズ (scan_skills, check_skill, check_dep_depth, print_tree, check_doc_drift など) の
+所要時間を同一プロセス内で計測する。結果は表または JSON (経時比較用) で出力する。
+
+使い方:
+  python3 scripts/bench-factory.py                           # 100 / 1000 / 10000 スキル
+  python3 scripts/bench-factory.py --sizes 100,2000 --shape diamond
+  python3 scripts/bench-factory.py --fanout 4 --resource-kb 64 --repeat 3
+  python3 scripts/bench-factory.py --json --out bench.json   # JSON をファイルに保存
+  python3 scripts/bench-factory.py --generate /tmp/f --skills 5000   # 生成のみ (計測しない)
+
+オプション:
+  --shape random|diamond|chain|mixed   requires: の形 (factorylib.synth 参照)
+  --repeat N    各フェーズを N 回計測して最小値を採用 (既定 1)
+  --budget S    1 フェーズの打ち切り秒数 (既定 10、SIGALRM が使える環境のみ)。
+                打ち切り・例外になったフェーズは null とし、notes に理由を記録する
+"""
+
+import contextlib
+import gc
+import json
+import os
+import platform
+import signal
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from factorylib.loader import load_script
+from factorylib.synth import SHAPES, SynthSpec, generate_factory
+
+# ============================================================
+# 設定
+# ============================================================
+DEFAULT_SIZES  = [100, 1000, 10000]
+DEFAULT_BUDGET = 10.0
+
+BOLD  = "\033[1m"
+DIM   = "\033[2m"
+RED   = "\033[31m"
+RESET = "\033[0m"
+
+
+class PhaseTimeout(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def _budget(seconds: float):
+    """seconds を超えたら PhaseTimeout を送出する (SIGALRM がない環境では無制限)"""
+    if seconds <= 0 or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise PhaseTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# ============================================================
+# フェーズ定義
+# ============================================================
+def phases(root: Path) -> list[tuple[str, object]]:
+    """(フェーズ名, 実行関数) の一覧。state を共有しながら順番に実行する"""
+    from factorylib.catalog import load_catalog
+    from factorylib.graph import DepGraph
+    from factorylib.references import ReferenceResolver
+    from factorylib.route import build_route_index
+
+    lint = load_script("lint-skills")
+    sync = load_script("sync-registry")
+    dep  = load_script("dep-graph")
+    lint.FACTORY_ROOT = root     # check_skill のパス参照・Doc Drift の対象をこのツリーに向ける
+    cache_file = root / ".cache" / "catalog-snapshot.json"
+    state: dict = {}
+
+    def load_cold():
+        state["catalog"] = load_catalog(root, use_cache=False)
+
+    def load_cache_write():
+        cache_file.unlink(missing_ok=True)
+        load_catalog(root, use_cache=True)
+
+    def load_cache_warm():
+        load_catalog(root, use_cache=True)
+
+    def check_skill():
+        catalog = state["catalog"]
+        names = catalog.skill_dir_names()
+        for skill in catalog.skills:
+            lint.check_skill(skill, names)
+
+    def check_agent():
+        catalog = state["catalog"]
+        resolver = ReferenceResolver.from_catalog(catalog)
+        for agent in catalog.agents:
+            lint.check_agent(agent, resolver)
+
+    def check_circular_requires():
+        state["graph"] = DepGraph(state["catalog"].deps())
+        lint.check_circular_requires(state["graph"])
+
+    def check_dep_depth():
+        lint.check_dep_depth(state["graph"])
+
+    def check_teams():
+        catalog = state["catalog"]
+        lint.check_teams(catalog, catalog.skill_dir_names())
+
+    def check_trigger_collisions():
+        lint.check_trigger_collisions(state["catalog"])
+
+    def check_doc_drift():
+        for _ in lint.check_doc_drift(lint.DOC_FORBIDDEN, lint.DOC_TARGETS):
+            pass
+
+    def scan_skills():
+        state["skills"] = sync.scan_skills(state["catalog"])
+
+    def scan_agents():
+        state["agents"] = sync.scan_agents(state["catalog"])
+
+    def render_registry():
+        text = (root / "registry.md").read_text(encoding="utf-8")
+        sync.render_registry(text, state["skills"] + state["agents"])
+
+    def render_readme():
+        text = (root / "README.md").read_text(encoding="utf-8")
+        sync.render_readme(text, state["skills"] + state["agents"], state["catalog"])
+
+    def render_how_it_works():
+        text = (root / "_docs" / "how-it-works.md").read_text(encoding="utf-8")
+        sync.render_how_it_works(text, state["skills"], state["agents"], state["catalog"])
+
+    def render_index():
+        state["index"] = sync.build_index(state["skills"] + state["agents"], state["catalog"].plugins)
+        sync.render_index(state["index"])
+
+    def route_index():
+        build_route_index(state["index"])
+
+    def cmd_check():
+        dep.cmd_check(*dep.build_dep_graph(state["catalog"]))
+
+    def cmd_tree_dedup():
+        dep.cmd_tree_dedup(*dep.build_dep_graph(state["catalog"]), None, None)
+
+    def print_tree():
+        dep.cmd_tree(*dep.build_dep_graph(state["catalog"]))
+
+    def impact_index():
+        DepGraph(state["catalog"].deps()).dependents_bits()
+
+    return [
+        ("catalog.load_cold",            load_cold),
+        ("catalog.load_cache_write",     load_cache_write),
+        ("catalog.load_cache_warm",      load_cache_warm),
+        ("lint.check_skill",             check_skill),
+        ("lint.check_agent",             check_agent),
+        ("lint.check_circular_requires", check_circular_requires),
+        ("lint.check_dep_depth",         check_dep_depth),
+        ("lint.check_teams",             check_teams),
+        ("lint.check_trigger_collisions", check_trigger_collisions),
+        ("lint.check_doc_drift",         check_doc_drift),
+        ("sync.scan_skills",             scan_skills),
+        ("sync.scan_agents",             scan_agents),
+        ("sync.render_registry",         render_registry),
+        ("sync.render_readme",           render_readme),
+        ("sync.render_how_it_works",     render_how_it_works),
+        ("sync.render_index",            render_index),
+        ("sync.build_route_index",       route_index),
+        ("dep.cmd_check",                cmd_check),
+        ("dep.cmd_tree_dedup",           cmd_tree_dedup),
+        ("dep.print_tree",               print_tree),
+        ("dep.impact_index",             impact_index),
+    ]
+
+
+def run_phases(root: Path, repeat: int, budget: float, skip: frozenset = frozenset()) -> tuple[dict, dict]:
+    """全フェーズ (skip を除く) を repeat 回実行し、({phase: 最小秒数 | None}, {phase: 打ち切り理由})"""
+    best: dict[str, float | None] = {}
+    notes: dict[str, str] = {}
+    for _ in range(repeat):
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            for name, fn in phases(root):
+                if name in notes or name in skip:
+                    continue
+                # timeit と同様、計測中は GC を止める (前フェーズの残骸の回収時間を混ぜない)
+                gc.collect()
+                gc.disable()
+                start = time.perf_counter()
+                try:
+                    with _budget(budget):
+                        fn()
+                except PhaseTimeout:
+                    notes[name] = f"timeout > {budget:g}s"
+                except RecursionError:
+                    notes[name] = "RecursionError"
+                finally:
+                    gc.enable()
+                if name in notes:
+                    best[name] = None
+                    continue
+                elapsed = time.perf_counter() - start
+                best[name] = min(elapsed, best.get(name) or elapsed)
+    return best, notes
+
+
+def bench_size(spec: SynthSpec, repeat: int, budget: float, skip: frozenset = frozenset()) -> dict:
+    """spec のファクトリーを一時ディレクトリに生成して計測し、runs[] の 1 要素を返す"""
+    with tempfile.TemporaryDirectory(prefix="factory-bench-") as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        summary = generate_factory(root, spec)
+        generate_s = time.perf_counter() - start
+        print(f"{DIM}   生成 {spec.skills:,} スキル ({generate_s:.1f}s, shape={spec.shape}) — 計測中…{RESET}",
+              file=sys.stderr)
+        timings, notes = run_phases(root, repeat, budget, skip)
+    return {
+        "size":       spec.skills,
+        "spec":       spec.__dict__ | summary,
+        "generate_s": round(generate_s, 4),
+        "phases":     {k: (None if v is None else round(v, 6)) for k, v in timings.items()},
+        "notes":      notes,
+    }
+
+
+def run_meta(repeat: int, budget: float) -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "repeat":    repeat,
+        "budget_s":  budget,
+    }
+
+
+# ============================================================
+# 出力
+# ============================================================
+def print_table(runs: list[dict]) -> None:
+    sizes = [r["size"] for r in runs]
+    names = list(runs[0]["phases"]) if runs else []
+    print()
+    print(f"{BOLD}⏱  フェーズ別所要時間 (ms, shape={runs[0]['spec']['shape'] if runs else '-'}){RESET}")
+    print()
+    print("   " + f"{'phase':<30}" + "".join(f"{n:>12,}" for n in sizes))
+    for name in names:
+        cells = []
+        for r in runs:
+            value = r["phases"].get(name)
+            cells.append(f"{'—' if value is None else format(value * 1000, ',.1f'):>12}")
+        print(f"   {name:<30}" + "".join(cells))
+    for r in runs:
+        for name, reason in r["notes"].items():
+            print(f"{DIM}   [{r['size']:,}] {name}: {reason}{RESET}")
+    print()
+
+
+def _arg_value(args: list[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    return args[idx + 1] if idx + 1 < len(args) else None
+
+
+def _spec_from_args(args: list[str], skills: int) -> SynthSpec:
+    return SynthSpec(
+        skills=skills,
+        shape=_arg_value(args, "--shape") or "random",
+        fanout=int(_arg_value(args, "--fanout") or 2),
+        resource_kb=int(_arg_value(args, "--resource-kb") or 0),
+        seed=int(_arg_value(args, "--seed") or 1),
+    )
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    try:
+        if (shape := _arg_value(args, "--shape")) is not None and shape not in SHAPES:
+            raise ValueError(f"--shape は {'|'.join(SHAPES)}")
+        if "--generate" in args:
+            target = Path(_arg_value(args, "--generate") or "")
+            spec = _spec_from_args(args, int(_arg_value(args, "--skills") or 100))
+            summary = generate_factory(target, spec)
+            print(f"✅ {target}: {summary}")
+            return 0
+        sizes = [int(s) for s in (_arg_value(args, "--sizes") or "").split(",") if s] or DEFAULT_SIZES
+        repeat = max(1, int(_arg_value(args, "--repeat") or 1))
+        budget = float(_arg_value(args, "--budget") or DEFAULT_BUDGET)
+    except ValueError as e:
+        print(f"{RED}引数エラー: {e}{RESET}")
+        return 1
+
+    runs = [bench_size(_spec_from_args(args, size), repeat, budget) for size in sizes]
+    result = {"meta": run_meta(repeat, budget), "runs": runs}
+
+    out = _arg_value(args, "--out")
+    if out:
+        Path(out).write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"{DIM}   → {out}{RESET}", file=sys.stderr)
+    if "--json" in args and not out:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print_table(runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+bench-frontmatter.py — フロントマターパーサーの計測 (旧パーサーとの比較)
+
+合成カタログ (factorylib.synth) または既存ツリーのフロントマターを先に読み込んでおき、
+パースだけの所要時間を旧パーサー (キー行の走査 + 複数行フィールドごとの再走査) と
+現在の 1 パストークナイザー (factorylib.frontmatter) で比べる。
+あわせて、両者の結果が食い違ったファイル数を表示する (移行時の挙動差の確認用)。
+legacy / new の所要時間はどちらもパースのみ (ファイルの読み込みは含まない)。
+
+使い方:
+  python3 scripts/bench-frontmatter.py                     # 1000 / 10000 スキル
+  python3 scripts/bench-frontmatter.py --sizes 20000 --repeat 7
+  python3 scripts/bench-frontmatter.py --root .            # このリポジトリ自身
+  python3 scripts/bench-frontmatter.py --show-diff 5       # 食い違いの例を 5 件表示
+"""
+
+import gc
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from factorylib.frontmatter import FrontmatterError, parse_header, parse_list, read_header, split_frontmatter
+from factorylib.synth import SynthSpec, generate_factory
+
+# ============================================================
+# 設定
+# ============================================================
+DEFAULT_SIZES = [1000, 10000]
+
+BOLD  = "\033[1m"
+DIM   = "\033[2m"
+RED   = "\033[31m"
+RESET = "\033[0m"
+
+
+# ============================================================
+# 旧パーサー (比較用。トークナイザー導入前の factorylib.frontmatter と同じ処理)
+# ============================================================
+def _legacy_collect_multiline(fm_block: str, field_name: str) -> str | None:
+    lines_out = []
+    in_field = False
+    for line in fm_block.splitlines():
+        if line.startswith(f"{field_name}:"):
+            in_field = True
+            val = line.partition(":")[2].strip().strip('"').strip("'").lstrip(">").strip()
+            if val:
+                lines_out.append(val)
+        elif in_field and (line.startswith("  ") or line.startswith("\t")):
+            lines_out.append(line.strip())
+        else:
+            if in_field:
+                in_field = False
+    return " ".join(lines_out) if lines_out else None
+
+
+def legacy_parse_block(fm_block: str) -> dict:
+    result = {}
+    for line in fm_block.splitlines():
+        if ":" not in line:
+            continue
+        key, _, val = line.partition(":")
+        key = key.strip()
+        val = val.strip().strip('"').strip("'")
+        if key and val:
+            result[key] = val
+    for field in ("description", "use-when"):
+        val = _legacy_collect_multiline(fm_block, field)
+        if val:
+            result[field] = val
+    if "tags" in result:
+        raw = result["tags"].strip("[]")
+        result["tags"] = [t.strip() for t in raw.split(",") if t.strip()]
+    else:
+        result["tags"] = []
+    return result
+
+
+def legacy_parse_header(header: bytes) -> dict:
+    if not header:
+        return {}
+    fm_block, _ = split_frontmatter(header.decode("utf-8"))
+    return {} if fm_block is None else legacy_parse_block(fm_block)
+
+
+# ============================================================
+# 計測
+# ============================================================
+def collect_headers(root: Path) -> list[tuple[Path, bytes]]:
+    """plugins/ 配下の metadata.md / SKILL.md / agents/*.md のヘッダーを読み込む"""
+    paths = sorted(root.glob("plugins/*/skills/*/metadata.md"))
+    paths += sorted(root.glob("plugins/*/skills/*/SKILL.md"))
+    paths += sorted(root.glob("plugins/*/agents/*.md"))
+    return [(path, read_header(path)) for path in paths]
+
+
+def time_parser(parse, headers: list[tuple[Path, bytes]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # bench-factory.py と同様、計測中は GC を止める
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        try:
+            for _, header in headers:
+                parse(header)
+        finally:
+            gc.enable()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _comparable(fm: dict) -> dict:
+    """比較用の正規化: ブロックスカラーの末尾改行を除き、requires 等のリストは list に揃える"""
+    out = {}
+    for key, value in fm.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if key == "requires":
+                value = parse_list(value)
+        out[key] = value
+    return out
+
+
+def compare(headers: list[tuple[Path, bytes]]) -> tuple[list[tuple[Path, str]], int, int]:
+    """
+    ([(path, 値の食い違い)], 旧パーサーだけが余分なキーを返したファイル数, 構文エラーのファイル数)。
+    旧パーサーは継続行中の 'Triggers: ...' などもキーとして拾っていたため、それは別に数える
+    """
+    diffs: list[tuple[Path, str]] = []
+    spurious = error_files = 0
+    for path, header in headers:
+        errors: list[FrontmatterError] = []
+        new = _comparable(parse_header(header, errors))
+        old = _comparable(legacy_parse_header(header))
+        if errors:
+            error_files += 1
+            diffs.append((path, f"構文エラー {errors[0]}"))
+            continue
+        spurious += bool(old.keys() - new.keys())
+        for key in sorted(new):
+            if old.get(key) != new[key]:
+                diffs.append((path, f"{key}: {str(old.get(key))[:40]!r} → {str(new[key])[:40]!r}"))
+                break
+    return diffs, spurious, error_files
+
+
+def bench_root(label: str, root: Path, repeat: int, show_diff: int) -> dict:
+    headers = collect_headers(root)
+    total_bytes = sum(len(h) for _, h in headers)
+    legacy = time_parser(legacy_parse_header, headers, repeat)
+    current = time_parser(parse_header, headers, repeat)
+    diffs, spurious, error_files = compare(headers)
+    n = max(1, len(headers))
+    print(f"   {label:<16} {len(headers):>8,} {total_bytes / 1024:>9,.0f} "
+          f"{legacy * 1000:>10.1f} {current * 1000:>10.1f} {legacy / n * 1e6:>8.1f} {current / n * 1e6:>8.1f} "
+          f"{legacy / current if current else 0:>7.2f}x {len(diffs):>6,} {spurious:>9,}")
+    for path, reason in diffs[:show_diff]:
+        rel = path.relative_to(root).as_posix()
+        print(f"{DIM}      {rel}: {reason}{RESET}")
+    if error_files:
+        print(f"{RED}      構文エラー {error_files:,} ファイル (lint-skills.py で位置付きで報告される){RESET}")
+    return {"files": len(headers), "legacy_s": legacy, "current_s": current, "diffs": len(diffs), "spurious": spurious}
+
+
+def _arg_value(args: list[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    return args[idx + 1] if idx + 1 < len(args) else None
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    try:
+        sizes = [int(s) for s in (_arg_value(args, "--sizes") or "").split(",") if s] or DEFAULT_SIZES
+        repeat = max(1, int(_arg_value(args, "--repeat") or 5))
+        show_diff = int(_arg_value(args, "--show-diff") or 0)
+    except ValueError as e:
+        print(f"{RED}引数エラー: {e}{RESET}")
+        return 1
+
+    print()
+    print(f"{BOLD}⏱  フロントマターのパース (読み込み済みヘッダー、{repeat} 回の最小値){RESET}")
+    print()
+    print(f"   {'catalog':<16} {'files':>8} {'KB':>9} {'legacy ms':>10} {'new ms':>10} "
+          f"{'µs/file':>8} {'µs/file':>8} {'speedup':>8} {'diffs':>6} {'spurious':>9}")
+    root_arg = _arg_value(args, "--root")
+    if root_arg:
+        bench_root(Path(root_arg).name or root_arg, Path(root_arg).resolve(), repeat, show_diff)
+    else:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix="factory-fm-") as tmp:
+                generate_factory(Path(tmp), SynthSpec(skills=size))
+                bench_root(f"synth {size:,}", Path(tmp), repeat, show_diff)
+    print(f"{DIM}   diffs は値が食い違ったファイル数 (末尾改行・requires のリスト化は同一とみなす)。"
+          f"spurious は旧パーサーが継続行の 'x: y' を誤ってキーにしたファイル数{RESET}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
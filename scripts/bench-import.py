@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+bench-import.py — スクリプトの import コスト計測 (python -X importtime ベース)
+
+各スクリプトを新しいインタープリターで読み込み (`__main__` ブロックは実行しない)、
+import にかかった時間と、その間に読み込まれたモジュールの内訳を表示する。
+フックやエディタ連携から import しても重い処理が走らないことの確認に使う。
+
+使い方:
+  python3 scripts/bench-import.py                 # 全スクリプト、各 5 回の中央値
+  python3 scripts/bench-import.py --repeat 20
+  python3 scripts/bench-import.py --top 10        # self 時間の大きいモジュールを 10 件表示
+  python3 scripts/bench-import.py --json          # 機械可読な JSON を出力
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# ============================================================
+# 設定
+# ============================================================
+SCRIPTS_DIR = Path(__file__).resolve().parent
+TARGETS = ["lint-skills", "sync-registry", "dep-graph", "watch-factory", "factory"]
+MARK = "--bench-import-start--"
+
+# 子プロセス: factorylib.loader までは計測外、load_script() の間だけを計る
+CHILD = f"""
+import sys, time
+sys.path.insert(0, {str(SCRIPTS_DIR)!r})
+from factorylib.loader import load_script
+sys.stderr.write({MARK!r} + "\\n")
+start = time.perf_counter()
+load_script(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+BOLD  = "\033[1m"
+DIM   = "\033[2m"
+RESET = "\033[0m"
+
+
+def _arg_int(args: list[str], flag: str, default: int) -> int:
+    if flag not in args:
+        return default
+    idx = args.index(flag)
+    value = args[idx + 1] if idx + 1 < len(args) else ""
+    if not value.isdigit():
+        raise SystemExit(f"使い方: bench-import.py {flag} <N>")
+    return int(value)
+
+
+def measure(name: str) -> tuple[float, dict[str, int]]:
+    """1 回計測: (load_script の秒数, {モジュール名: self µs})"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, name],
+        capture_output=True, text=True, check=True,
+    )
+    modules: dict[str, int] = {}
+    started = False
+    for line in proc.stderr.splitlines():
+        if line == MARK:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, module = line[len("import time:"):].split("|", 2)
+        modules[module.strip()] = int(self_us)
+    return float(proc.stdout.strip()), modules
+
+
+def bench(name: str, repeat: int) -> dict:
+    walls, runs = [], []
+    for _ in range(repeat):
+        wall, modules = measure(name)
+        walls.append(wall)
+        runs.append(modules)
+    # モジュールごとの self 時間も中央値で集計
+    names = set().union(*runs)
+    self_us = {m: statistics.median(run.get(m, 0) for run in runs) for m in names}
+    return {
+        "script":    name,
+        "median_ms": round(statistics.median(walls) * 1000, 2),
+        "min_ms":    round(min(walls) * 1000, 2),
+        "modules":   len(names),
+        "top":       sorted(self_us.items(), key=lambda kv: -kv[1]),
+    }
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    repeat = max(1, _arg_int(args, "--repeat", 5))
+    top = _arg_int(args, "--top", 5)
+    results = [bench(name, repeat) for name in TARGETS]
+
+    if "--json" in args:
+        for r in results:
+            r["top"] = [{"module": m, "self_us": us} for m, us in r["top"][:top]]
+        json.dump({"repeat": repeat, "python": sys.version.split()[0], "results": results},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    print()
+    print(f"{BOLD}⏱  import コスト (中央値 / {repeat} 回, __main__ は実行しない){RESET}")
+    print()
+    print(f"   {'script':<16} {'median':>9} {'min':>9} {'modules':>8}")
+    for r in results:
+        print(f"   {r['script']:<16} {r['median_ms']:>7.1f}ms {r['min_ms']:>7.1f}ms {r['modules']:>8}")
+        for module, us in r["top"][:top]:
+            print(f"{DIM}      {module:<40} {us / 1000:>6.2f}ms{RESET}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+bench-route.py — ルーティングの精度とレイテンシの計測 (ラベル付きプロンプトコーパス)
+
+カタログの use-when / description のトリガーから factory.py route と同じ索引
+(factorylib.route) をメモリ上に作り、scripts/route-corpus.json の各プロンプトを引いて
+top-1 の正解率、ラベル別 precision / recall (マクロ平均)、recall@k、MRR、
+取り違えたペア (期待 → 実際) と 1 クエリあたりのレイテンシ分位点を表示する。
+ネットワークも .cache/ も使わないため、同じコミットなら何度実行しても同じ精度になる。
+
+--synth で合成スキル (factorylib.synth) を紛らわしくない「雑音」として索引に足し、
+カタログが大きくなったときに精度とコストがどう変わるかを同じコーパスで比べられる。
+
+使い方:
+  python3 scripts/bench-route.py                          # このリポジトリのカタログのみ
+  python3 scripts/bench-route.py --synth 1000,5000        # 合成スキルを足した規模でも計測
+  python3 scripts/bench-route.py --per-label              # ラベル別の P / R も表示
+  python3 scripts/bench-route.py --json --out route.json  # コミット間の比較用に保存
+  python3 scripts/bench-route.py --compare route.json     # 保存した結果との差分を表示
+
+オプション:
+  --corpus FILE   コーパス (既定 scripts/route-corpus.json)
+  --k N           recall@k の k (既定 3)
+  --repeat N      各クエリを N 回引いた中央値をそのクエリのレイテンシとする (既定 20)
+"""
+
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from factorylib.catalog import load_catalog
+from factorylib.index import build_index
+from factorylib.loader import load_script
+from factorylib.route import build_route_index, route
+from factorylib.synth import SynthSpec, generate_factory
+
+# ============================================================
+# 設定
+# ============================================================
+FACTORY_ROOT   = Path(__file__).resolve().parent.parent
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "route-corpus.json"
+
+BOLD   = "\033[1m"
+DIM    = "\033[2m"
+RED    = "\033[31m"
+GREEN  = "\033[32m"
+RESET  = "\033[0m"
+
+
+# ============================================================
+# 索引
+# ============================================================
+def catalog_assets(root: Path) -> tuple[list[dict], list]:
+    """sync-registry.py と同じ asset dict と PluginInfo 一覧 (registry.json と同じ入力)"""
+    sync = load_script("sync-registry")
+    catalog = load_catalog(root, use_cache=False)
+    return sync.scan_skills(catalog) + sync.scan_agents(catalog), catalog.plugins
+
+
+def synth_assets(size: int) -> tuple[list[dict], list]:
+    with tempfile.TemporaryDirectory(prefix="factory-route-") as tmp:
+        generate_factory(Path(tmp), SynthSpec(skills=size))
+        return catalog_assets(Path(tmp))
+
+
+# ============================================================
+# 計測
+# ============================================================
+def load_corpus(path: Path) -> list[dict]:
+    cases = json.loads(path.read_text(encoding="utf-8"))["cases"]
+    for case in cases:
+        if isinstance(case["expect"], str):
+            case["expect"] = [case["expect"]]
+    return cases
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def evaluate(label: str, assets: list[dict], plugins, cases: list[dict], k: int, repeat: int) -> dict:
+    """cases を引いて精度とレイテンシをまとめた runs[] の 1 要素を返す"""
+    start = time.perf_counter()
+    index = build_route_index(build_index(assets, plugins))
+    build_s = time.perf_counter() - start
+
+    predicted: list[str | None] = []
+    latencies: list[float] = []
+    reciprocal = hits_at_k = 0.0
+    for case in cases:
+        timings = []
+        gc.collect()
+        gc.disable()        # bench-factory.py と同様、計測中は GC を止める
+        try:
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                candidates = route(index, case["prompt"], k)
+                timings.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+        latencies.append(sorted(timings)[len(timings) // 2])
+        names = [c.name for c in candidates]
+        predicted.append(names[0] if names else None)
+        rank = next((r for r, name in enumerate(names, 1) if name in case["expect"]), None)
+        if rank is not None:
+            hits_at_k += 1
+            reciprocal += 1 / rank
+
+    # ラベル別 precision / recall (期待ラベルは各ケースの先頭を正とする)
+    expected = [case["expect"][0] for case in cases]
+    correct = [p in case["expect"] for p, case in zip(predicted, cases)]
+    per_label = {}
+    for name in sorted(set(expected)):
+        tp = sum(1 for e, ok in zip(expected, correct) if e == name and ok)
+        n_pred = sum(1 for p in predicted if p == name)
+        n_true = expected.count(name)
+        per_label[name] = {
+            "precision": round(tp / n_pred, 4) if n_pred else 0.0,
+            "recall":    round(tp / n_true, 4),
+            "support":   n_true,
+        }
+    confusion = Counter((e, p or "—") for e, p, ok in zip(expected, predicted, correct) if not ok)
+    examples = {(e, p or "—"): case["prompt"] for e, p, ok, case in zip(expected, predicted, correct, cases) if not ok}
+
+    n = max(1, len(cases))
+    latencies.sort()
+    return {
+        "label":       label,
+        "assets":      len(assets),
+        "queries":     len(cases),
+        "build_s":     round(build_s, 4),
+        "top1":        round(sum(correct) / n, 4),
+        "precision":   round(sum(v["precision"] for v in per_label.values()) / max(1, len(per_label)), 4),
+        "recall":      round(sum(v["recall"] for v in per_label.values()) / max(1, len(per_label)), 4),
+        "recall_at_k": round(hits_at_k / n, 4),
+        "mrr":         round(reciprocal / n, 4),
+        "latency_us":  {
+            "p50": round(_percentile(latencies, 0.50) * 1e6, 1),
+            "p90": round(_percentile(latencies, 0.90) * 1e6, 1),
+            "p99": round(_percentile(latencies, 0.99) * 1e6, 1),
+            "max": round(latencies[-1] * 1e6, 1) if latencies else 0.0,
+        },
+        "confusion":   [[e, p, count, examples[(e, p)]] for (e, p), count in confusion.most_common()],
+        "per_label":   per_label,
+    }
+
+
+def run_meta(corpus: Path, k: int, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=FACTORY_ROOT,
+                                capture_output=True, text=True, check=False).stdout.strip() or None
+    except FileNotFoundError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit":    commit,
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "corpus":    corpus.name,
+        "k":         k,
+        "repeat":    repeat,
+    }
+
+
+# ============================================================
+# 出力
+# ============================================================
+def print_table(runs: list[dict], k: int) -> None:
+    print()
+    print(f"{BOLD}🎯 ルーティング精度・レイテンシ ({runs[0]['queries'] if runs else 0} プロンプト){RESET}")
+    print()
+    print(f"   {'catalog':<16} {'assets':>7} {'top1':>6} {'P':>6} {'R':>6} {f'R@{k}':>6} {'MRR':>6} "
+          f"{'p50 µs':>8} {'p90 µs':>8} {'p99 µs':>8} {'max µs':>8} {'build ms':>9}")
+    for r in runs:
+        lat = r["latency_us"]
+        print(f"   {r['label']:<16} {r['assets']:>7,} {r['top1']:>6.3f} {r['precision']:>6.3f} {r['recall']:>6.3f} "
+              f"{r['recall_at_k']:>6.3f} {r['mrr']:>6.3f} {lat['p50']:>8.1f} {lat['p90']:>8.1f} {lat['p99']:>8.1f} "
+              f"{lat['max']:>8.1f} {r['build_s'] * 1000:>9.1f}")
+    print(f"{DIM}   P / R はラベル別のマクロ平均。レイテンシは 1 クエリの中央値の分位点 (索引の構築は含まない){RESET}")
+
+
+def print_confusion(run: dict, limit: int = 15) -> None:
+    if not run["confusion"]:
+        print(f"\n   {GREEN}✓{RESET}  [{run['label']}] 取り違えなし")
+        return
+    print()
+    print(f"{BOLD}   [{run['label']}] 取り違え (期待 → 実際){RESET}")
+    for expected, got, count, prompt in run["confusion"][:limit]:
+        print(f"   {RED}✗{RESET}  {expected} → {got}  ×{count}  {DIM}{prompt}{RESET}")
+
+
+def print_per_label(run: dict) -> None:
+    print()
+    print(f"{BOLD}   [{run['label']}] ラベル別{RESET}")
+    print(f"   {'label':<32} {'P':>6} {'R':>6} {'n':>4}")
+    for name, v in run["per_label"].items():
+        print(f"   {name:<32} {v['precision']:>6.3f} {v['recall']:>6.3f} {v['support']:>4}")
+
+
+def print_compare(runs: list[dict], previous: dict) -> None:
+    before = {r["label"]: r for r in previous.get("runs", [])}
+    print()
+    print(f"{BOLD}   比較: {previous.get('meta', {}).get('commit') or '(保存済み)'} → 現在{RESET}")
+    for r in runs:
+        old = before.get(r["label"])
+        if old is None:
+            print(f"{DIM}   {r['label']}: 比較対象なし{RESET}")
+            continue
+        cells = [f"{key} {r[key] - old[key]:+.3f}" for key in ("top1", "precision", "recall", "mrr")]
+        cells += [f"{q} {r['latency_us'][q] - old['latency_us'][q]:+.1f}µs" for q in ("p50", "p99")]
+        print(f"   {r['label']:<16} " + "  ".join(cells))
+
+
+def _arg_value(args: list[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    return args[idx + 1] if idx + 1 < len(args) else None
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    try:
+        corpus = Path(_arg_value(args, "--corpus") or DEFAULT_CORPUS)
+        sizes = [int(s) for s in (_arg_value(args, "--synth") or "").split(",") if s]
+        k = max(1, int(_arg_value(args, "--k") or 3))
+        repeat = max(1, int(_arg_value(args, "--repeat") or 20))
+        cases = load_corpus(corpus)
+    except (ValueError, KeyError, OSError) as e:
+        print(f"{RED}引数エラー: {e}{RESET}")
+        return 1
+
+    assets, plugins = catalog_assets(FACTORY_ROOT)
+    runs = [evaluate("repo", assets, plugins, cases, k, repeat)]
+    for size in sizes:
+        print(f"{DIM}   合成スキル {size:,} 件を追加して計測中…{RESET}", file=sys.stderr)
+        extra, extra_plugins = synth_assets(size)
+        runs.append(evaluate(f"repo +{size:,}", assets + extra, plugins + extra_plugins, cases, k, repeat))
+    result = {"meta": run_meta(corpus, k, repeat), "runs": runs}
+
+    out = _arg_value(args, "--out")
+    if out:
+        Path(out).write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"{DIM}   → {out}{RESET}", file=sys.stderr)
+    if "--json" in args and not out:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    print_table(runs, k)
+    for r in runs:
+        print_confusion(r)
+    if "--per-label" in args:
+        print_per_label(runs[0])
+    compare = _arg_value(args, "--compare")
+    if compare:
+        print_compare(runs, json.loads(Path(compare).read_text(encoding="utf-8")))
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
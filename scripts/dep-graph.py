@@ -9,17 +9,34 @@ requires: フィールドを元に依存ツリーを可視化し、
   python3 scripts/dep-graph.py                          # 全依存ツリー表示
   python3 scripts/dep-graph.py --reverse <skill-name>   # 逆引き: このスキルに依存するもの
   python3 scripts/dep-graph.py --check                  # 問題のある依存のみ表示
+  python3 scripts/dep-graph.py --no-cache               # .cache/ のスナップショットを使わない
+  python3 scripts/dep-graph.py --check --profile        # フェーズ別の時間・読み込み量・メモリ
+                                                        # (--profile-trace FILE で Chrome trace JSON)
+
+大規模カタログ向け (共有サブツリーを 1 回だけ展開し、1 行ずつ出力):
+  python3 scripts/dep-graph.py --dedup                  # 重複展開なしのツリー (→ see X で後方参照)
+  python3 scripts/dep-graph.py --root <skill-name>      # 指定スキルのツリーのみ (--dedup を含む)
+  python3 scripts/dep-graph.py --max-depth <N>          # N 階層より深い部分を省略 (--dedup を含む)
+  python3 scripts/dep-graph.py --reverse <skill> --dedup
+
+影響範囲のバッチ照会 (推移的な逆依存を JSON で出力、.cache/ の閉包インデックスを利用):
+  python3 scripts/dep-graph.py --impact <skill> [<skill> ...]
+  python3 scripts/dep-graph.py --impact-file <path>     # 1 行 1 スキル。'-' で stdin
 """
 
-import re
+import json
 import sys
 from pathlib import Path
 
+from factorylib.catalog import Catalog, load_catalog
+from factorylib.graph import DepGraph
+from factorylib.impact import load_impact_index
+from factorylib.profile import phase, profiled
+
 # ============================================================
 # 設定
 # ============================================================
 FACTORY_ROOT = Path(__file__).parent.parent
-PLUGINS_DIR  = FACTORY_ROOT / "plugins"
 
 # ── ANSI カラー ──────────────────────────────────────────
 GREEN  = "\033[32m"
@@ -32,90 +49,25 @@ DIM    = "\033[2m"
 RESET  = "\033[0m"
 
 MAX_DEPTH_WARN = 3   # これ以上深いチェーンは警告
-
-
-# ============================================================
-# フロントマターパーサー (共通ロジック)
-# ============================================================
-def parse_frontmatter(filepath: Path) -> dict:
-    try:
-        text = filepath.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return {}
-    if not text.startswith("---"):
-        return {}
-    end = text.find("\n---", 3)
-    if end == -1:
-        return {}
-    fm_block = text[3:end].strip()
-    result = {}
-    for line in fm_block.splitlines():
-        if ":" not in line:
-            continue
-        key, _, val = line.partition(":")
-        key = key.strip()
-        val = val.strip()
-        if key and val:
-            result[key] = val
-    return result
+INDENT_CAP     = 24  # --dedup ツリーでインデントを伸ばす最大階層 (以降は [深さ] 表示)
 
 
 # ============================================================
 # 依存グラフの構築
 # ============================================================
-def build_dep_graph() -> tuple[dict[str, list[str]], dict[str, bool]]:
+def build_dep_graph(catalog: Catalog) -> tuple[dict[str, list[str]], dict[str, bool]]:
     """
-    plugins/*/skills/*/metadata.md (fallback: SKILL.md) をスキャンして依存グラフを構築。
+    plugins/*/skills/*/metadata.md (fallback: SKILL.md) のカタログから依存グラフを構築。
     returns:
       deps:       { skill_name: [required_skill, ...] }
       deprecated: { skill_name: True/False }
     """
-    deps: dict[str, list[str]] = {}
-    deprecated: dict[str, bool] = {}
-
-    if not PLUGINS_DIR.exists():
-        return deps, deprecated
-
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-        skills_dir = plugin_dir / "skills"
-        if not skills_dir.exists():
-            continue
-
-        for skill_dir in sorted(skills_dir.iterdir()):
-            if not skill_dir.is_dir():
-                continue
-
-            # metadata.md 優先、なければ SKILL.md にフォールバック
-            meta_md  = skill_dir / "metadata.md"
-            skill_md = skill_dir / "SKILL.md"
-            source = meta_md if meta_md.exists() else (skill_md if skill_md.exists() else None)
-            if source is None:
-                continue
-
-            fm   = parse_frontmatter(source)
-            name = fm.get("name", skill_dir.name)
-            deprecated[name] = (fm.get("status") == "deprecated")
-
-            if "requires" in fm:
-                raw = fm["requires"].strip("[]")
-                deps[name] = [r.strip() for r in raw.split(",") if r.strip()]
-            else:
-                deps[name] = []
-
-    return deps, deprecated
+    return catalog.deps(), catalog.deprecated_map()
 
 
 def build_reverse_graph(deps: dict[str, list[str]]) -> dict[str, list[str]]:
     """逆依存グラフ: { skill: [このスキルを requires している他スキル, ...] }"""
-    rev: dict[str, list[str]] = {k: [] for k in deps}
-    for skill, requires in deps.items():
-        for req in requires:
-            if req not in rev:
-                rev[req] = []
-            rev[req].append(skill)
-    return rev
+    return DepGraph(deps).reverse()
 
 
 # ============================================================
@@ -192,6 +144,70 @@ def print_reverse_tree(
         print_reverse_tree(parent, rev, deprecated, child_prefix, is_last_parent, visited)
 
 
+def iter_tree_lines(
+    roots: list[str],
+    graph: dict[str, list[str]],
+    deprecated: dict[str, bool],
+    prefix: str = "",
+    max_depth: int | None = None,
+):
+    """
+    共有サブツリーを 1 回だけ展開するツリーを 1 行ずつ yield する (明示スタック、再帰なし)。
+    2 回目以降に現れた展開済みノードは「→ see X」、経路上の再訪は circular と表示する。
+    各ノードの展開は 1 回なので出力行数・処理時間は O(V+E)。
+    INDENT_CAP 階層より深い部分はインデントを伸ばさず [深さ] を付けて表示する
+    (深いチェーンで行の長さが深さに比例し、出力量が O(V·depth) になるのを防ぐ)。
+    """
+    expanded: set[str] = set()
+    on_path: set[str] = set()
+    # ("node", name, prefix, is_last, depth) / ("exit", name) の 2 種類
+    stack: list[tuple] = [
+        ("node", r, prefix, i == len(roots) - 1, 0) for i, r in reversed(list(enumerate(roots)))
+    ]
+    while stack:
+        item = stack.pop()
+        if item[0] == "exit":
+            on_path.discard(item[1])
+            continue
+        _, node, node_prefix, is_last, depth = item
+        connector = "└── " if is_last else "├── "
+        dep_marker = f" {YELLOW}[deprecated]{RESET}" if deprecated.get(node) else ""
+        depth_label = f"{DIM}[{depth}]{RESET} " if depth >= INDENT_CAP else ""
+        line = f"{node_prefix}{connector}{depth_label}{CYAN}{node}{RESET}{dep_marker}"
+        children = graph.get(node, [])
+
+        if node in on_path:
+            yield f"{line} {DIM}(circular){RESET}"
+            continue
+        if node in expanded and children:
+            yield f"{line} {DIM}→ see {node}{RESET}"
+            continue
+        if max_depth is not None and depth >= max_depth and children:
+            yield f"{line} {DIM}… (+{len(children)}){RESET}"
+            continue
+        yield line
+
+        expanded.add(node)
+        on_path.add(node)
+        stack.append(("exit", node))
+        if depth + 1 >= INDENT_CAP:
+            child_prefix = node_prefix
+        else:
+            child_prefix = node_prefix + ("    " if is_last else "│   ")
+        for j in range(len(children) - 1, -1, -1):
+            stack.append(("node", children[j], child_prefix, j == len(children) - 1, depth + 1))
+
+
+def _write_lines(lines) -> int:
+    """行ジェネレーターを逐次出力し、行数を返す (全体をメモリに溜めない)"""
+    count = 0
+    write = sys.stdout.write
+    for line in lines:
+        write(line + "\n")
+        count += 1
+    return count
+
+
 # ============================================================
 # メインコマンド
 # ============================================================
@@ -244,10 +260,66 @@ def cmd_tree(deps: dict[str, list[str]], deprecated: dict[str, bool]) -> None:
         print()
 
 
+def cmd_tree_dedup(
+    deps: dict[str, list[str]],
+    deprecated: dict[str, bool],
+    root: str | None = None,
+    max_depth: int | None = None,
+) -> int:
+    """重複展開なしの依存ツリーを表示 (大規模カタログ向け)。終了コードを返す"""
+    print()
+    print(f"{BOLD}{BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{RESET}")
+    print(f"{BOLD}{BLUE}  依存関係ツリー (重複展開なし){RESET}")
+    print(f"{BOLD}{BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{RESET}")
+    print()
+
+    if root is not None:
+        if root not in deps:
+            print(f"  {RED}✗{RESET}  '{root}' は skills/ に存在しません")
+            return 1
+        roots = [root]
+    else:
+        # 誰にも requires されていないスキルから展開し、循環のみで到達できないものを後で補う
+        all_required = {req for reqs in deps.values() for req in reqs}
+        roots = sorted(s for s, reqs in deps.items() if reqs and s not in all_required)
+        reachable: set[str] = set()
+        _mark_reachable(roots, deps, reachable)
+        for skill in sorted(s for s, reqs in deps.items() if reqs):
+            if skill not in reachable:
+                roots.append(skill)
+                _mark_reachable([skill], deps, reachable)
+
+    count = _write_lines(iter_tree_lines(roots, deps, deprecated, max_depth=max_depth))
+    print()
+    print(f"  {DIM}{len(roots)} ルート / {count} 行{RESET}")
+
+    depths = DepGraph(deps).depths()
+    deep_chains = [(s, depths[s]) for s in sorted(deps) if depths[s] >= MAX_DEPTH_WARN]
+    if deep_chains:
+        print()
+        print(f"{YELLOW}{BOLD}⚠  深い依存チェーン (depth ≥ {MAX_DEPTH_WARN}):{RESET}")
+        for skill, depth in deep_chains:
+            print(f"  {skill} — 深さ {depth}")
+    print()
+    return 0
+
+
+def _mark_reachable(roots: list[str], deps: dict[str, list[str]], seen: set[str]) -> None:
+    """roots から requires: を辿って到達できるノードを seen に追加 (既知ノードは再訪しない)"""
+    stack = [r for r in roots if r not in seen]
+    seen.update(stack)
+    while stack:
+        for child in deps.get(stack.pop(), []):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+
+
 def cmd_reverse(
     target: str,
     deps: dict[str, list[str]],
     deprecated: dict[str, bool],
+    dedup: bool = False,
 ) -> None:
     """特定スキルの逆依存を表示 (このスキルを削除したら何が壊れるか)"""
     rev = build_reverse_graph(deps)
@@ -276,17 +348,22 @@ def cmd_reverse(
     else:
         print(f"  {YELLOW}⚠{RESET}  以下のスキルがこのスキルに依存しています:")
         print()
-        for i, parent in enumerate(sorted(parents)):
-            is_last = (i == len(parents) - 1)
-            connector = "└── " if is_last else "├── "
-            child_prefix = "    " if is_last else "│   "
-            dep_marker2 = f" {YELLOW}[deprecated]{RESET}" if deprecated.get(parent) else ""
-            print(f"  {connector}{CYAN}{parent}{RESET}{dep_marker2}")
-            # さらに上位の依存も表示
-            grand_parents = rev.get(parent, [])
-            for j, gp in enumerate(sorted(grand_parents)):
-                gp_last = (j == len(grand_parents) - 1)
-                print_reverse_tree(gp, rev, deprecated, "  " + child_prefix, gp_last, {parent, target})
+        if dedup:
+            # target 自身は経路上にあるものとして扱うため、逆グラフから target を除いておく
+            sorted_rev = {k: sorted(p for p in v if p != target) for k, v in rev.items()}
+            _write_lines(iter_tree_lines(sorted(parents), sorted_rev, deprecated, prefix="  "))
+        else:
+            for i, parent in enumerate(sorted(parents)):
+                is_last = (i == len(parents) - 1)
+                connector = "└── " if is_last else "├── "
+                child_prefix = "    " if is_last else "│   "
+                dep_marker2 = f" {YELLOW}[deprecated]{RESET}" if deprecated.get(parent) else ""
+                print(f"  {connector}{CYAN}{parent}{RESET}{dep_marker2}")
+                # さらに上位の依存も表示
+                grand_parents = rev.get(parent, [])
+                for j, gp in enumerate(sorted(grand_parents)):
+                    gp_last = (j == len(grand_parents) - 1)
+                    print_reverse_tree(gp, rev, deprecated, "  " + child_prefix, gp_last, {parent, target})
 
         print()
         print(f"  {RED}→ '{target}' を削除・変更する場合は上記 {len(parents)} 件への影響を確認してください{RESET}")
@@ -314,17 +391,16 @@ def cmd_check(deps: dict[str, list[str]], deprecated: dict[str, bool]) -> None:
                 print(f"  {YELLOW}⚠{RESET}  [{skill}] requires '{req}' — deprecatedスキルに依存")
                 issues += 1
 
-    # 深いチェーン検出
-    def chain_depth(node: str, visited: set) -> int:
-        if node in visited or node not in deps:
-            return 0
-        children = deps[node]
-        if not children:
-            return 0
-        return 1 + max(chain_depth(c, visited | {node}) for c in children)
+    # 循環参照 (SCC 単位で全メンバーを表示)
+    graph = DepGraph(deps)
+    for members in graph.cycles():
+        print(f"  {RED}✗{RESET}  循環参照: {' ↔ '.join(members)}")
+        issues += 1
 
+    # 深いチェーン検出 (縮約 DAG 上の最長パス、O(V+E))
+    depths = graph.depths()
     for skill in sorted(deps.keys()):
-        d = chain_depth(skill, set())
+        d = depths[skill]
         if d >= MAX_DEPTH_WARN:
             print(f"  {YELLOW}⚠{RESET}  [{skill}] 依存チェーン深さ {d} (推奨: {MAX_DEPTH_WARN} 未満)")
             issues += 1
@@ -338,30 +414,89 @@ def cmd_check(deps: dict[str, list[str]], deprecated: dict[str, bool]) -> None:
     print()
 
 
+def cmd_impact(targets: list[str], deps: dict[str, list[str]], use_cache: bool) -> int:
+    """複数ターゲットの推移的な逆依存をまとめて JSON で出力。未知のターゲットがあれば 1"""
+    index = load_impact_index(FACTORY_ROOT, DepGraph(deps), use_cache=use_cache)
+    report = index.report(targets, deps.keys())
+    json.dump({"targets": report}, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if all(entry["found"] for entry in report.values()) else 1
+
+
+def _impact_targets(args: list[str]) -> list[str] | None:
+    """--impact a b c / --impact-file <path|-> からターゲット一覧を返す"""
+    targets: list[str] = []
+    if "--impact" in args:
+        for arg in args[args.index("--impact") + 1:]:
+            if arg.startswith("--"):
+                break
+            targets.append(arg)
+    path = _arg_value(args, "--impact-file")
+    if path is not None:
+        text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+        targets += [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    return list(dict.fromkeys(targets)) or None
+
+
 # ============================================================
 # エントリポイント
 # ============================================================
-def main() -> int:
-    args = sys.argv[1:]
-    deps, deprecated = build_dep_graph()
+def _arg_value(args: list[str], flag: str) -> str | None:
+    """'--flag value' 形式の値を返す。フラグがない、または値がなければ None"""
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    if idx + 1 >= len(args) or args[idx + 1].startswith("--"):
+        return None
+    return args[idx + 1]
+
+
+@profiled
+def main(argv: list[str] | None = None, catalog: Catalog | None = None) -> int:
+    """argv / catalog を渡すと sys.argv と走査の代わりに使う (factory.py validate 用)"""
+    args = sys.argv[1:] if argv is None else argv
+    if catalog is None:
+        with phase("catalog.load"):
+            catalog = load_catalog(FACTORY_ROOT, use_cache="--no-cache" not in args)
+    with phase("dep.build"):
+        deps, deprecated = build_dep_graph(catalog)
 
     if not deps:
         print(f"{RED}skills/ ディレクトリが見つからないか、スキルが存在しません{RESET}")
         return 1
 
-    if "--reverse" in args:
-        idx = args.index("--reverse")
-        if idx + 1 >= len(args):
-            print(f"{RED}使い方: dep-graph.py --reverse <skill-name>{RESET}")
-            return 1
-        target = args[idx + 1]
-        cmd_reverse(target, deps, deprecated)
-
-    elif "--check" in args:
-        cmd_check(deps, deprecated)
+    root      = _arg_value(args, "--root")
+    max_depth = _arg_value(args, "--max-depth")
+    dedup     = "--dedup" in args or root is not None or max_depth is not None
+    if max_depth is not None and not max_depth.isdigit():
+        print(f"{RED}使い方: dep-graph.py --max-depth <N> (N は 0 以上の整数){RESET}")
+        return 1
 
-    else:
-        cmd_tree(deps, deprecated)
+    mode = next((f[2:] for f in ("--impact", "--impact-file", "--reverse", "--check") if f in args),
+                "tree_dedup" if dedup else "tree")
+    with phase(f"dep.{mode}"):
+        if "--impact" in args or "--impact-file" in args:
+            targets = _impact_targets(args)
+            if targets is None:
+                print(f"{RED}使い方: dep-graph.py --impact <skill> [<skill> ...] | --impact-file <path|->{RESET}")
+                return 1
+            return cmd_impact(targets, deps, use_cache="--no-cache" not in args)
+
+        elif "--reverse" in args:
+            target = _arg_value(args, "--reverse")
+            if target is None:
+                print(f"{RED}使い方: dep-graph.py --reverse <skill-name>{RESET}")
+                return 1
+            cmd_reverse(target, deps, deprecated, dedup)
+
+        elif "--check" in args:
+            cmd_check(deps, deprecated)
+
+        elif dedup:
+            return cmd_tree_dedup(deps, deprecated, root, int(max_depth) if max_depth else None)
+
+        else:
+            cmd_tree(deps, deprecated)
 
     return 0
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+dup-content.py — SKILL.md・resources の重複コンテンツ検出 (共通リソース化で減らせるコンテキスト量の見積もり)
+
+SKILL.md の本文と resources/ / references/ 配下のテキストを見出しごとのセクションに分け、
+同一ファイル・完全一致のセクション・行の大半が共通するセクション (MinHash / LSH) をグループにまとめる。
+グループごとに、最大のセクションを共通リソースとして残したときに他のコピーから消せる
+バイト数と推定トークン数を出す (タスクごとに読み込まれるコンテキストの削減量の目安)。
+検出ロジックは factorylib.duplicates。
+
+使い方:
+  python3 scripts/dup-content.py                      # 削減量の多い順に上位 15 グループ
+  python3 scripts/dup-content.py --top 50             # 表示するグループ数
+  python3 scripts/dup-content.py --threshold 0.6      # 近似重複とみなす行集合の Jaccard 係数 (既定 0.4)
+  python3 scripts/dup-content.py --min-bytes 512      # これより小さいセクションは対象外 (既定 256)
+  python3 scripts/dup-content.py --json               # 全グループを JSON で出力
+  python3 scripts/dup-content.py --root DIR           # 別のファクトリーツリー (合成カタログなど)
+  python3 scripts/dup-content.py --profile            # 走査・検出の時間と読み込み量
+
+レポート専用で、重複があっても終了コードは 0 (lint のようなゲートにはしない。引数エラーのみ 1)。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from factorylib.duplicates import (
+    DEFAULT_THRESHOLD, MIN_CHUNK_BYTES, DuplicateGroup, DuplicateReport, content_files, find_duplicates,
+)
+from factorylib.profile import phase, profiled
+
+# ============================================================
+# 設定
+# ============================================================
+FACTORY_ROOT = Path(__file__).resolve().parent.parent
+MAX_MEMBERS  = 8            # グループごとに表示する場所の数
+
+BOLD   = "\033[1m"
+DIM    = "\033[2m"
+RED    = "\033[31m"
+GREEN  = "\033[32m"
+YELLOW = "\033[33m"
+RESET  = "\033[0m"
+
+
+# ============================================================
+# 出力
+# ============================================================
+def _kb(nbytes: int) -> str:
+    return f"{nbytes / 1024:,.1f} KB"
+
+
+def print_group(rank: int, group: DuplicateGroup) -> None:
+    keep = group.chunks[0]
+    if group.kind == "file":
+        title = f"同一ファイル ×{len(group.chunks)}"
+    else:
+        heading = keep.heading or "(見出しなし)"
+        similarity = "完全一致" if group.similarity == 1.0 else f"★ との類似度 ≥ {group.similarity:.2f}"
+        title = f"{heading}  ×{len(group.chunks)} ({similarity})"
+    print(f"   {YELLOW}#{rank:<3}{RESET} {BOLD}{_kb(group.saved_bytes):>10}{RESET}  "
+          f"~{group.saved_tokens:,} tok  {title}")
+    for i, chunk in enumerate(group.chunks[:MAX_MEMBERS]):
+        mark = "★" if i == 0 else " "
+        print(f"        {mark} {chunk.path}:{chunk.line}  {DIM}({chunk.owner}, {chunk.size:,} B){RESET}")
+    if len(group.chunks) > MAX_MEMBERS:
+        print(f"        {DIM}… (+{len(group.chunks) - MAX_MEMBERS}){RESET}")
+
+
+def print_report(report: DuplicateReport, threshold: float, min_bytes: int, top: int) -> None:
+    print()
+    print(f"{BOLD}🧩 重複コンテンツ (SKILL.md・resources、セクション単位、類似度 {threshold:.2f} 以上の組を連結){RESET}")
+    print(f"{DIM}   {report.files:,} ファイル / {_kb(report.total_bytes)} (~{report.total_tokens:,} tok) / "
+          f"{report.chunks:,} セクション ({min_bytes} B 以上) / LSH 候補 {report.candidates:,} 組{RESET}")
+    print()
+    if not report.groups:
+        print(f"   {GREEN}✓{RESET}  ファイル間で重複するセクションなし")
+        print()
+        return
+    for rank, group in enumerate(report.groups[:top], 1):
+        print_group(rank, group)
+    if len(report.groups) > top:
+        print(f"   {DIM}… 他 {len(report.groups) - top} グループ (--top N / --json で全件){RESET}")
+
+    share = report.saved_bytes / report.total_bytes if report.total_bytes else 0.0
+    print()
+    print(f"{BOLD}   {len(report.groups)} グループ: 共通リソースに切り出すと {_kb(report.saved_bytes)} "
+          f"(~{report.saved_tokens:,} tok、全体の {share:.1%}) を削減できる見込み{RESET}")
+    print(f"{DIM}   ★ = 残す側 (最大のセクション)。削減量は他のコピーのうち ★ にもある行の合計、"
+          f"トークンは ASCII 4 文字 / 非 ASCII 1 文字 ≒ 1 トークンの概算{RESET}")
+    print()
+
+
+def report_json(report: DuplicateReport) -> dict:
+    return {
+        "files":        report.files,
+        "total_bytes":  report.total_bytes,
+        "total_tokens": report.total_tokens,
+        "chunks":       report.chunks,
+        "saved_bytes":  report.saved_bytes,
+        "saved_tokens": report.saved_tokens,
+        "groups": [
+            {
+                "kind":         g.kind,
+                "heading":      g.chunks[0].heading,
+                "similarity":   g.similarity,
+                "saved_bytes":  g.saved_bytes,
+                "saved_tokens": g.saved_tokens,
+                "owners":       g.owners,
+                "chunks":       [{"path": c.path, "line": c.line, "size": c.size} for c in g.chunks],
+            }
+            for g in report.groups
+        ],
+    }
+
+
+# ============================================================
+# メイン
+# ============================================================
+def _arg_value(args: list[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    idx = args.index(flag)
+    return args[idx + 1] if idx + 1 < len(args) else None
+
+
+@profiled
+def main() -> int:
+    args = sys.argv[1:]
+    try:
+        threshold = float(_arg_value(args, "--threshold") or DEFAULT_THRESHOLD)
+        min_bytes = int(_arg_value(args, "--min-bytes") or MIN_CHUNK_BYTES)
+        top = max(1, int(_arg_value(args, "--top") or 15))
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"--threshold は 0 より大きく 1 以下: {threshold}")
+    except ValueError as e:
+        print(f"{RED}引数エラー: {e}{RESET}")
+        return 1
+    root = Path(_arg_value(args, "--root") or FACTORY_ROOT).resolve()
+
+    with phase("dupes.scan"):
+        paths = content_files(root)
+    with phase("dupes.detect"):
+        report = find_duplicates(root, paths, threshold, min_bytes)
+
+    if "--json" in args:
+        print(json.dumps(report_json(report), ensure_ascii=False, indent=2))
+        return 0
+    print_report(report, threshold, min_bytes, top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
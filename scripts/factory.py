@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+factory.py — ファクトリー CLI の単一エントリポイント
+
+lint / sync / dep チェックを 1 プロセス・1 回のカタログ走査で実行する。
+
+使い方:
+  python3 scripts/factory.py validate              # パーサー自己診断 → lint → sync → dep check (make validate)
+  python3 scripts/factory.py validate --strict     # lint の警告もエラー扱い
+  python3 scripts/factory.py validate --no-cache   # .cache/ のスナップショットを使わない
+  python3 scripts/factory.py validate --profile    # lint / sync / check の内訳まで計測 (時間・I/O・正規表現・メモリ)
+  python3 scripts/factory.py validate --profile-trace trace.json   # 上記 + Chrome trace-event JSON
+  python3 scripts/factory.py watch [--interval S]  # watch-factory.py と同じ
+  python3 scripts/factory.py query --tag review --model sonnet     # registry の索引付き照会
+  python3 scripts/factory.py query --requires <skill> --type skill --json
+  python3 scripts/factory.py route "이 코드 리뷰해줘"                # プロンプトから候補スキル/エージェントを順位付け
+  python3 scripts/factory.py route "review this" --limit 3 --json
+
+validate はフェーズごとの所要時間を最後に表示する。終了コードは従来の
+`make validate` (lint && sync && check) と同じく、最初に失敗したフェーズで
+中断してその終了コードを返す。
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from factorylib.loader import load_script
+from factorylib.profile import phase, profiled
+
+# ============================================================
+# 設定
+# ============================================================
+FACTORY_ROOT = Path(__file__).resolve().parent.parent
+PARSER_CHECK_BLOCKS = 1000      # validate の自己診断で生成するフロントマターの境界ケース数
+
+BOLD  = "\033[1m"
+DIM   = "\033[2m"
+RED   = "\033[31m"
+GREEN = "\033[32m"
+RESET = "\033[0m"
+
+
+# ============================================================
+# validate
+# ============================================================
+@profiled
+def cmd_validate(args: list[str]) -> int:
+    from factorylib.catalog import load_catalog
+
+    timings: list[tuple[str, float]] = []
+
+    def timed(name: str, fn):
+        start = time.perf_counter()
+        try:
+            with phase(name):
+                return fn()
+        finally:
+            timings.append((name, time.perf_counter() - start))
+
+    lint, sync, dep = timed("import", lambda: [load_script(n) for n in ("lint-skills", "sync-registry", "dep-graph")])
+    catalog = timed("catalog", lambda: load_catalog(FACTORY_ROOT, use_cache="--no-cache" not in args))
+
+    phases = [
+        ("parser", lambda: check_parser(catalog.root)),
+        ("lint",   lambda: lint.main(catalog)),
+        ("sync",   lambda: sync.main(catalog)),
+        ("check",  lambda: dep.main(["--check"], catalog)),
+    ]
+    code = 0
+    for name, run in phases:
+        code = timed(name, run)
+        if code != 0:
+            print(f"{RED}❌ validate: {name} が失敗 (exit {code}){RESET}")
+            break
+
+    print_timings(timings)
+    if code == 0:
+        print()
+        print("✅  validate complete")
+    return code
+
+
+def check_parser(root: Path) -> int:
+    """
+    フロントマターの高速パスと完全パーサーが同じ結果を返すかを、合成の境界ケースと
+    root の全ヘッダーで確かめる (2 つの文法がずれたら 1)
+    """
+    from factorylib.frontmatter import fast_path_mismatch, read_header, split_frontmatter
+    from factorylib.synth import frontmatter_blocks
+
+    blocks = [(f"synth #{n}", block) for n, block in enumerate(frontmatter_blocks(PARSER_CHECK_BLOCKS))]
+    for pattern in ("plugins/*/skills/*/metadata.md", "plugins/*/skills/*/SKILL.md", "plugins/*/agents/*.md"):
+        for path in sorted(root.glob(pattern)):
+            block, _ = split_frontmatter(read_header(path).decode("utf-8", "replace"))
+            if block is not None:
+                blocks.append((path.relative_to(root).as_posix(), block))
+    mismatches = [(label, block, reason) for label, block in blocks if (reason := fast_path_mismatch(block))]
+
+    print()
+    print(f"{BOLD}🧪 フロントマターパーサーの自己診断 (高速パス ⇔ 完全パーサー){RESET}")
+    if not mismatches:
+        print(f"  {GREEN}✓{RESET}  {len(blocks):,} ブロックで結果が一致")
+        return 0
+    for label, block, reason in mismatches[:10]:
+        print(f"  {RED}✗{RESET}  {label}: {reason}")
+        print(f"{DIM}       {block[:80]!r}{RESET}")
+    print(f"{RED}   {len(mismatches):,} / {len(blocks):,} ブロックで食い違い — frontmatter._parse_simple を修正してください{RESET}")
+    return 1
+
+
+def print_timings(timings: list[tuple[str, float]]) -> None:
+    total = sum(t for _, t in timings)
+    print()
+    print(f"{BOLD}⏱  フェーズ別所要時間{RESET}")
+    for name, seconds in timings:
+        print(f"   {name:<8} {seconds * 1000:8.1f} ms")
+    print(f"{DIM}   {'total':<8} {total * 1000:8.1f} ms{RESET}")
+
+
+# ============================================================
+# watch
+# ============================================================
+def cmd_watch(args: list[str]) -> int:
+    return load_script("watch-factory").main()
+
+
+# ============================================================
+# query
+# ============================================================
+QUERY_FLAGS = {"--model": "model", "--plugin": "plugin", "--type": "asset_type",
+               "--requires": "requires", "--team": "team"}
+
+
+def cmd_query(args: list[str]) -> int:
+    """
+    .cache/registry.db (registry.json から自動で再構築) を照会する。
+    --tag は複数指定でき、すべてのタグを持つ asset に絞る。--json で asset dict の配列を出力
+    """
+    from factorylib.index import open_index, query
+
+    tags: list[str] = []
+    filters: dict[str, str] = {}
+    rest = iter(args)
+    for arg in rest:
+        if arg == "--json":
+            continue
+        value = next(rest, None)
+        if value is None or (arg != "--tag" and arg not in QUERY_FLAGS):
+            print(f"{RED}引数エラー: {arg}{RESET}")
+            print(f"使い方: factory.py query [--tag T ...] [{' '.join(f'{f} X' for f in QUERY_FLAGS)}] [--json]")
+            return 1
+        if arg == "--tag":
+            tags.append(value)
+        else:
+            filters[QUERY_FLAGS[arg]] = value
+
+    try:
+        conn = open_index(FACTORY_ROOT)
+    except FileNotFoundError as e:
+        print(f"{RED}❌ {e}{RESET}")
+        return 1
+    try:
+        assets = query(conn, tags=tags, **filters)
+    finally:
+        conn.close()
+
+    if "--json" in args:
+        print(json.dumps(assets, ensure_ascii=False, indent=2))
+        return 0
+    for a in assets:
+        print(f"{a['name']:<32} {a['type']:<6} {a['plugin']:<10} {a['model']:<7} {DIM}{', '.join(a['tags'])}{RESET}")
+    print(f"{DIM}{len(assets)} 件{RESET}")
+    return 0
+
+
+# ============================================================
+# route
+# ============================================================
+def cmd_route(args: list[str]) -> int:
+    """
+    .cache/route-index.json (registry.json から自動で再構築) でプロンプトの候補を引く。
+    索引の読み込みと検索の所要時間は分けて表示する (検索はプロンプトのトークン分の postings だけを触る)
+    """
+    from factorylib.route import load_route_index, route
+
+    words, limit = [], 5
+    rest = iter(args)
+    for arg in rest:
+        if arg == "--limit":
+            try:
+                limit = max(1, int(next(rest, "")))
+            except ValueError:
+                print(f"{RED}引数エラー: --limit には整数を指定{RESET}")
+                return 1
+        elif arg != "--json":
+            words.append(arg)
+    if not words:
+        print('使い方: factory.py route "<prompt>" [--limit N] [--json]')
+        return 1
+
+    start = time.perf_counter()
+    try:
+        index = load_route_index(FACTORY_ROOT)
+    except FileNotFoundError as e:
+        print(f"{RED}❌ {e}{RESET}")
+        return 1
+    loaded = time.perf_counter()
+    candidates = route(index, " ".join(words), limit)
+    done = time.perf_counter()
+
+    if "--json" in args:
+        print(json.dumps([vars(c) for c in candidates], ensure_ascii=False, indent=2))
+        return 0
+    for rank, c in enumerate(candidates, 1):
+        phrases = ", ".join(f'"{p}"' for p in c.phrases)
+        print(f"{rank:>2}. {c.name:<32} {c.type:<6} {c.plugin:<10} {c.score:>7.3f}  {DIM}{phrases}{RESET}")
+    if not candidates:
+        print("候補なし")
+    print(f"{DIM}検索 {(done - loaded) * 1e6:.0f} µs (索引の読み込み {(loaded - start) * 1000:.1f} ms){RESET}")
+    return 0
+
+
+COMMANDS = {
+    "validate": cmd_validate,
+    "watch":    cmd_watch,
+    "query":    cmd_query,
+    "route":    cmd_route,
+}
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    if not args or args[0] not in COMMANDS:
+        print(f"使い方: factory.py {{{'|'.join(COMMANDS)}}} [options]")
+        return 1
+    return COMMANDS[args[0]](args[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# ファクトリー共通ライブラリ — scripts/*.py が共有するカタログ・パーサー群
+"""
+factorylib — lint-skills.py / sync-registry.py / dep-graph.py の共通ライブラリ
+
+scripts/ 直下のスクリプトから import して使う:
+  from factorylib.catalog import load_catalog
+"""
@@ -0,0 +1,101 @@
+# カタログスナップショットキャッシュ — path/mtime/size/hash で変更ファイルのみ再パース
+"""
+factorylib.cache — .cache/catalog-snapshot.json への解析結果の永続化
+
+各エントリは FACTORY_ROOT からの相対パスをキーに
+{mtime_ns, size, sha256, data} を保持する。
+
+  - mtime_ns と size が一致 → ファイルを開かずに data を再利用
+  - 不一致だが sha256 が一致 (touch / checkout のみ) → data を再利用
+    (sha256 は read() が返したバイト列に対して取る。フロントマターはヘッダー部分のみ)
+  - それ以外 → パーサーを呼んで再解析
+
+パーサー (frontmatter.py) のソースが変わった場合はスナップショット全体を破棄する。
+hashlib は import コストが大きいため、キャッシュを実際に使うときに読み込む。
+"""
+
+import json
+import os
+from pathlib import Path
+from collections.abc import Callable
+
+from factorylib.profile import count_read
+
+CACHE_DIRNAME   = ".cache"
+SNAPSHOT_NAME   = "catalog-snapshot.json"
+SNAPSHOT_FORMAT = 4     # 2: フロントマターの data が {"fm", "body_offset"} になった / 3: "error" / 4: "warnings" を追加
+
+
+def _parser_fingerprint() -> str:
+    """パーサー実装のハッシュ。実装変更時に古いスナップショットを無効化する"""
+    import hashlib
+
+    from factorylib import frontmatter
+    src = Path(frontmatter.__file__).read_bytes()
+    return hashlib.sha256(src).hexdigest()[:16]
+
+
+class SnapshotCache:
+    """ファイル単位の解析結果キャッシュ"""
+
+    def __init__(self, root: Path, path: Path | None = None):
+        self.root = root
+        self.path = path or root / CACHE_DIRNAME / SNAPSHOT_NAME
+        self.fingerprint = _parser_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self._old: dict[str, dict] = {}
+        self._new: dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            raw = self.path.read_bytes()
+            count_read(len(raw))
+            snapshot = json.loads(raw)
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return
+        if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("parser") != self.fingerprint:
+            return
+        self._old = snapshot.get("entries", {})
+
+    def lookup(
+        self, path: Path, parse: Callable[[bytes], object], read: Callable[[Path], bytes] = Path.read_bytes,
+    ) -> object:
+        """path の解析結果を返す。変更がなければキャッシュから、あれば parse(read(path)) で再解析"""
+        key = path.relative_to(self.root).as_posix()
+        st = path.stat()
+        entry = self._old.get(key)
+
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self._new[key] = entry
+            self.hits += 1
+            return entry["data"]
+
+        import hashlib
+
+        raw = read(path)
+        count_read(len(raw))
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry["sha256"] == digest:
+            data = entry["data"]
+            self.hits += 1
+        else:
+            data = parse(raw)
+            self.misses += 1
+
+        self._new[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "data": data}
+        self._dirty = True
+        return data
+
+    def save(self) -> None:
+        """変更があった場合のみスナップショットを書き出す (削除ファイルのエントリは除去)"""
+        if not self._dirty and self._new.keys() == self._old.keys():
+            return
+        snapshot = {"format": SNAPSHOT_FORMAT, "parser": self.fingerprint, "entries": self._new}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._old, self._dirty = dict(self._new), False
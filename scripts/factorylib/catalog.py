@@ -0,0 +1,333 @@
+# カタログスキャナー — plugins/ を 1 回だけ走査してスキル・エージェント・plugin.json を保持
+"""
+factorylib.catalog — ファクトリー全体のインメモリカタログ
+
+plugins/*/skills/*, plugins/*/agents/*.md, plugins/*/plugin.json を
+1 回の走査でまとめて読み込み、各フロントマターも 1 回だけパースする。
+lint / sync / dep-graph はこの Catalog を受け取って処理する。
+
+  catalog = load_catalog(FACTORY_ROOT)
+  for skill in catalog.skills: ...
+
+use_cache=True (既定) の場合、解析結果は .cache/catalog-snapshot.json に保存され、
+次回以降は変更されたファイルのみ再パースする (factorylib.cache 参照)。
+
+フロントマターはヘッダー部分だけを読み (frontmatter.read_header)、本文の開始オフセットを
+一緒に記録する。本文 (.body) は初回アクセス時にそのオフセットから先だけを読む。
+フロントマターの構文エラーで読み込みは止めず、fm_error に記録する (報告は lint-skills.py、
+sync-registry.py は警告のみ)。fm には不正な行を除いた残りのキーが入る。
+互換のため受け付けた書き方 (値の中の ': ' など) は fm_warnings に記録する。
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from collections.abc import Iterable
+
+from factorylib.cache import SnapshotCache
+from factorylib.frontmatter import FrontmatterError, FrontmatterWarning, parse_header, parse_list, read_body, read_header
+from factorylib.profile import count_read
+
+
+# ============================================================
+# エントリ型
+# ============================================================
+@dataclass
+class PluginInfo:
+    """plugins/<name>/ 1 件分"""
+    name: str
+    path: Path
+    manifest: dict | None = None        # plugin.json の内容 (なければ None)
+    manifest_error: str | None = None   # plugin.json が不正な JSON の場合のエラー
+
+    @property
+    def has_manifest(self) -> bool:
+        return (self.path / "plugin.json").exists()
+
+    @property
+    def teams(self) -> dict[str, list[str]]:
+        if not self.manifest:
+            return {}
+        return self.manifest.get("teams", {})
+
+
+@dataclass
+class SkillInfo:
+    """plugins/<plugin>/skills/<dir>/ 1 件分"""
+    dir_name: str
+    plugin: str
+    path: Path
+    fm: dict = field(default_factory=dict)
+    fm_source: Path | None = None       # metadata.md 優先、なければ SKILL.md
+    body_offset: int | None = None      # SKILL.md の本文開始位置 (fm_source が SKILL.md の場合のみ既知)
+    fm_error: FrontmatterError | None = None    # fm_source の最初の構文エラー (fm は不正なキーを除いた結果)
+    fm_warnings: list[FrontmatterWarning] = field(default_factory=list)
+    _body: str | None = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.fm.get("name") or self.dir_name
+
+    @property
+    def skill_md(self) -> Path:
+        return self.path / "SKILL.md"
+
+    @property
+    def has_skill_md(self) -> bool:
+        return self.skill_md.exists()
+
+    @property
+    def source_name(self) -> str:
+        return self.fm_source.name if self.fm_source else ""
+
+    @property
+    def requires(self) -> list[str]:
+        return parse_list(self.fm["requires"]) if "requires" in self.fm else []
+
+    @property
+    def deprecated(self) -> bool:
+        return self.fm.get("status") == "deprecated"
+
+    @property
+    def body(self) -> str:
+        """SKILL.md の本文 (初回アクセス時に 1 回だけ読む)"""
+        if self._body is None:
+            self._body = _read_body(self.skill_md, self.body_offset)
+        return self._body
+
+
+@dataclass
+class AgentInfo:
+    """plugins/<plugin>/agents/<stem>.md 1 件分"""
+    stem: str
+    plugin: str
+    path: Path
+    fm: dict = field(default_factory=dict)
+    body_offset: int | None = None
+    fm_error: FrontmatterError | None = None
+    fm_warnings: list[FrontmatterWarning] = field(default_factory=list)
+    _body: str | None = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.fm.get("name") or self.stem
+
+    @property
+    def deprecated(self) -> bool:
+        return self.fm.get("status") == "deprecated"
+
+    @property
+    def body(self) -> str:
+        """エージェント本文 (初回アクセス時に 1 回だけ読む)"""
+        if self._body is None:
+            self._body = _read_body(self.path, self.body_offset)
+        return self._body
+
+
+@dataclass
+class Catalog:
+    """1 回の走査結果。各スクリプトはこれを共有する"""
+    root: Path
+    plugins: list[PluginInfo] = field(default_factory=list)
+    skills: list[SkillInfo] = field(default_factory=list)
+    agents: list[AgentInfo] = field(default_factory=list)
+
+    def rel(self, path: Path) -> str:
+        """FACTORY_ROOT からの相対パス (POSIX 形式)"""
+        return path.relative_to(self.root).as_posix()
+
+    @property
+    def indexed_skills(self) -> list[SkillInfo]:
+        """metadata.md または SKILL.md を持つスキル (registry / 依存グラフ対象)"""
+        return [s for s in self.skills if s.fm_source is not None]
+
+    def skill_dir_names(self) -> set[str]:
+        return {s.dir_name for s in self.skills}
+
+    def agent_stems(self) -> set[str]:
+        return {a.stem for a in self.agents}
+
+    def deps(self) -> dict[str, list[str]]:
+        """requires: から依存グラフ { skill_name: [required_skill, ...] } を返す"""
+        return {s.name: s.requires for s in self.indexed_skills}
+
+    def deprecated_map(self) -> dict[str, bool]:
+        return {s.name: s.deprecated for s in self.indexed_skills}
+
+    def teams(self) -> dict[str, list[str]]:
+        """全 plugin.json の teams: を集約"""
+        team_members: dict[str, list[str]] = {}
+        for plugin in self.plugins:
+            for team_name, members in plugin.teams.items():
+                team_members.setdefault(team_name, []).extend(members)
+        return team_members
+
+    def refresh(self, paths: Iterable[Path]) -> "CatalogDelta":
+        """
+        変更されたファイルに対応するエントリだけを再読み込みする (watch モード用)。
+        追加・削除も反映し、並び順は load_catalog() と同じに保つ。
+        """
+        delta = CatalogDelta()
+        plugins_dir = self.root / "plugins"
+        known_plugins = {p.path for p in self.plugins}
+
+        for path in paths:
+            try:
+                parts = path.relative_to(plugins_dir).parts
+            except ValueError:
+                continue
+            if not parts:
+                continue
+            plugin_dir = plugins_dir / parts[0]
+            if plugin_dir not in known_plugins and not plugin_dir.is_dir():
+                continue    # plugins/ 直下のファイル (.DS_Store など)
+            if plugin_dir not in known_plugins or not plugin_dir.is_dir() or parts[1:] == ("plugin.json",):
+                delta.plugins.add(plugin_dir)
+            if len(parts) >= 3 and parts[1] == "skills":
+                delta.skills.add(plugin_dir / "skills" / parts[2])
+            elif len(parts) == 3 and parts[1] == "agents" and path.suffix == ".md":
+                delta.agents.add(path)
+
+        for plugin_dir in delta.plugins:
+            self.plugins = [p for p in self.plugins if p.path != plugin_dir]
+            if plugin_dir.is_dir():
+                self.plugins.append(_load_plugin(plugin_dir, None))
+                continue
+            # プラグインごと削除された場合は配下のエントリも除去
+            delta.skills.update(s.path for s in self.skills if s.plugin == plugin_dir.name)
+            delta.agents.update(a.path for a in self.agents if a.plugin == plugin_dir.name)
+
+        for skill_dir in delta.skills:
+            self.skills = [s for s in self.skills if s.path != skill_dir]
+            if skill_dir.is_dir():
+                self.skills.append(_load_skill(skill_dir, skill_dir.parent.parent.name, None))
+
+        for agent_md in delta.agents:
+            self.agents = [a for a in self.agents if a.path != agent_md]
+            if agent_md.is_file():
+                self.agents.append(_load_agent(agent_md, agent_md.parent.parent.name, None))
+
+        self.plugins.sort(key=lambda p: p.name)
+        self.skills.sort(key=lambda s: (s.plugin, s.dir_name))
+        self.agents.sort(key=lambda a: (a.plugin, a.stem))
+        return delta
+
+
+@dataclass
+class CatalogDelta:
+    """Catalog.refresh() で追加・変更・削除されたエントリのパス"""
+    plugins: set[Path] = field(default_factory=set)   # plugins/<name>
+    skills: set[Path] = field(default_factory=set)    # plugins/<plugin>/skills/<dir>
+    agents: set[Path] = field(default_factory=set)    # plugins/<plugin>/agents/<stem>.md
+
+    def __bool__(self) -> bool:
+        return bool(self.plugins or self.skills or self.agents)
+
+
+# ============================================================
+# 読み込み
+# ============================================================
+def _read_body(path: Path, offset: int | None) -> str:
+    body = read_body(path, offset)
+    count_read(len(body))       # 本文の文字数で近似 (ヘッダーは読み飛ばし分を含めない)
+    return body
+
+
+def _parse_header_bytes(header: bytes) -> dict:
+    errors: list[FrontmatterError] = []
+    warnings: list[FrontmatterWarning] = []
+    fm = parse_header(header, errors, warnings)
+    # キャッシュ (JSON) に載せるため、エラー・警告は args のまま持つ
+    return {"fm": fm, "body_offset": len(header), "error": list(errors[0].args) if errors else None,
+            "warnings": [list(w.args) for w in warnings]}
+
+
+def _fm_error(parsed: dict) -> FrontmatterError | None:
+    return FrontmatterError(*parsed["error"]) if parsed["error"] else None
+
+
+def _fm_warnings(parsed: dict) -> list[FrontmatterWarning]:
+    return [FrontmatterWarning(*args) for args in parsed["warnings"]]
+
+
+def _parse_manifest_bytes(raw: bytes) -> dict:
+    try:
+        return {"manifest": json.loads(raw.decode("utf-8")), "error": None}
+    except json.JSONDecodeError as e:
+        return {"manifest": None, "error": str(e)}
+
+
+def _lookup(path: Path, parse, cache: SnapshotCache | None, read=Path.read_bytes):
+    """キャッシュがあれば経由し、なければ直接 read して parse する"""
+    if cache is not None:
+        return cache.lookup(path, parse, read)
+    raw = read(path)
+    count_read(len(raw))
+    return parse(raw)
+
+
+def _load_plugin(plugin_dir: Path, cache: SnapshotCache | None) -> PluginInfo:
+    plugin = PluginInfo(name=plugin_dir.name, path=plugin_dir)
+    pjson = plugin_dir / "plugin.json"
+    if not pjson.exists():
+        return plugin
+    parsed = _lookup(pjson, _parse_manifest_bytes, cache)
+    plugin.manifest, plugin.manifest_error = parsed["manifest"], parsed["error"]
+    return plugin
+
+
+def _load_skill(skill_dir: Path, plugin_name: str, cache: SnapshotCache | None) -> SkillInfo:
+    skill = SkillInfo(dir_name=skill_dir.name, plugin=plugin_name, path=skill_dir)
+    meta_md = skill_dir / "metadata.md"
+    skill_md = skill_dir / "SKILL.md"
+
+    if meta_md.exists():
+        skill.fm_source = meta_md
+    elif skill_md.exists():
+        skill.fm_source = skill_md
+    else:
+        return skill
+    parsed = _lookup(skill.fm_source, _parse_header_bytes, cache, read_header)
+    skill.fm = parsed["fm"]
+    skill.fm_error = _fm_error(parsed)
+    skill.fm_warnings = _fm_warnings(parsed)
+    if skill.fm_source == skill_md:
+        skill.body_offset = parsed["body_offset"]
+    return skill
+
+
+def _load_agent(agent_md: Path, plugin_name: str, cache: SnapshotCache | None) -> AgentInfo:
+    parsed = _lookup(agent_md, _parse_header_bytes, cache, read_header)
+    return AgentInfo(stem=agent_md.stem, plugin=plugin_name, path=agent_md,
+                     fm=parsed["fm"], body_offset=parsed["body_offset"], fm_error=_fm_error(parsed),
+                     fm_warnings=_fm_warnings(parsed))
+
+
+def load_catalog(root: Path, use_cache: bool = True) -> Catalog:
+    """root/plugins/ を 1 回走査して Catalog を構築する"""
+    catalog = Catalog(root=root)
+    plugins_dir = root / "plugins"
+    if not plugins_dir.exists():
+        return catalog
+
+    cache = SnapshotCache(root) if use_cache else None
+
+    for plugin_dir in sorted(plugins_dir.iterdir()):
+        if not plugin_dir.is_dir():
+            continue
+        catalog.plugins.append(_load_plugin(plugin_dir, cache))
+
+        skills_dir = plugin_dir / "skills"
+        if skills_dir.exists():
+            for skill_dir in sorted(skills_dir.iterdir()):
+                if skill_dir.is_dir():
+                    catalog.skills.append(_load_skill(skill_dir, plugin_dir.name, cache))
+
+        agents_dir = plugin_dir / "agents"
+        if agents_dir.exists():
+            for agent_md in sorted(agents_dir.glob("*.md")):
+                catalog.agents.append(_load_agent(agent_md, plugin_dir.name, cache))
+
+    if cache is not None:
+        cache.save()
+    return catalog
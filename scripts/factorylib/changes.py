@@ -0,0 +1,160 @@
+# git 差分スコープ — 変更ファイルを lint 対象 (変更スキル + 逆依存 + チーム + 関連グローバルチェック) に写像
+"""
+factorylib.changes — --since <ref> / --staged による差分 lint の対象決定
+
+  changes = git_changes(FACTORY_ROOT, since="origin/main")   # または staged=True
+  scope   = lint_scope(catalog, changes)
+  if scope.full: ...                   # lint 自体・設定の変更 → 全件チェック
+  scope.skills / scope.agents          # 再チェックするスキルディレクトリ / エージェント .md
+  scope.graph / scope.teams / scope.paths
+
+写像のルール (watch-factory.py の増分更新と同じ考え方):
+  plugins/<p>/skills/<d>/**     → スキル d + requires: で (推移的に) d に依存するスキル
+  plugins/<p>/agents/<a>.md     → エージェント a
+  plugins/<p>/plugin.json       → プラグイン p の teams チェック
+  スキルの追加・削除            → 全エージェント (参照の解決結果が変わる) + 該当スキルを含むチームのプラグイン
+  プラグインの追加・削除        → 全エージェント (プラグイン名プレフィックスが変わる)
+  Doc Drift 対象のドキュメント  → そのファイルだけ走査 (scope.paths と対象 glob の積)
+  scripts/ 配下                 → 全件チェック (ルール自体が変わったため)
+
+lint は作業ツリーの内容を読むため、--staged では lint 対象に未ステージの変更があると
+コミットされる内容と結果が食い違う。その場合は unstaged_conflicts() で検出してエラーにする。
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from factorylib.catalog import Catalog
+from factorylib.graph import DepGraph
+
+# これらの変更はチェック内容そのものを変えるため差分モードを使わない
+FULL_RUN_PREFIXES = ("scripts/",)
+
+
+@dataclass(frozen=True)
+class Change:
+    status: str     # git の A / M / D (名前変更は --no-renames で D + A に分解)
+    path: str       # FACTORY_ROOT からの相対パス (POSIX)
+
+
+@dataclass
+class LintScope:
+    full: bool = False
+    skills: set[Path] = field(default_factory=set)      # plugins/<p>/skills/<d>
+    skill_names: set[str] = field(default_factory=set)  # 変更スキル + 逆依存の名前 (深さ警告の絞り込み用)
+    agents: set[Path] = field(default_factory=set)
+    all_agents: bool = False
+    graph: bool = False                                 # 循環・深さチェックを再実行
+    teams: set[str] = field(default_factory=set)        # teams チェック対象のプラグイン名
+    paths: set[Path] = field(default_factory=set)       # 変更ファイル (Doc Drift はこのうち対象のものだけ走査)
+
+
+# ============================================================
+# git
+# ============================================================
+def _git(root: Path, *args: str) -> str:
+    try:
+        proc = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=False)
+    except FileNotFoundError as e:
+        raise ValueError("git コマンドが見つからない") from e
+    if proc.returncode != 0:
+        raise ValueError(f"git {' '.join(args)} が失敗: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+def _parse_name_status(out: str) -> list[Change]:
+    fields = out.split("\0")
+    return [Change(fields[i][0], fields[i + 1]) for i in range(0, len(fields) - 1, 2)]
+
+
+def git_changes(root: Path, since: str | None = None, staged: bool = False) -> list[Change]:
+    """
+    staged=True → インデックスの変更 (pre-commit 用)。
+    since=<ref> → ref から作業ツリーまでの変更 + 未追跡ファイル (PR 用)。
+    パスは root からの相対 (root 外の変更は含まない)。失敗時は ValueError
+    """
+    base = ["diff", "--name-status", "--no-renames", "--relative", "-z"]
+    if staged:
+        out = _git(root, *base, "--cached")
+    elif since:
+        out = _git(root, *base, since, "--")
+    else:
+        raise ValueError("--since <ref> か --staged のどちらかが必要")
+
+    changes = _parse_name_status(out)
+    if since and not staged:
+        untracked = _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+        changes += [Change("A", p) for p in untracked.split("\0") if p]
+    return changes
+
+
+def unstaged_conflicts(root: Path, staged: list[Change], scope: "LintScope") -> list[str]:
+    """
+    --staged 用: 作業ツリーとインデックスで内容が異なる (未ステージの変更がある) ファイルのうち、
+    ステージ済みのもの、または scope の lint 対象に含まれるもの (root からの相対パス、ソート済み)
+    """
+    staged_paths = {c.path for c in staged}
+    conflicts = []
+    for change in _parse_name_status(_git(root, "diff", "--name-status", "--no-renames", "--relative", "-z")):
+        path = root / change.path
+        if (change.path in staged_paths or path in scope.paths or path in scope.agents
+                or any(skill in path.parents for skill in scope.skills)):
+            conflicts.append(change.path)
+    return sorted(conflicts)
+
+
+# ============================================================
+# 影響範囲
+# ============================================================
+def lint_scope(catalog: Catalog, changes: list[Change]) -> LintScope:
+    """変更一覧を再チェック対象に写像する"""
+    root = catalog.root
+    scope = LintScope()
+    touched_names: set[str] = set()
+    names_changed = False
+
+    for change in changes:
+        if change.path.startswith(FULL_RUN_PREFIXES):
+            scope.full = True
+            return scope
+        parts = change.path.split("/")
+        path = root / change.path
+        scope.paths.add(path)
+        if parts[0] != "plugins" or len(parts) < 3:
+            continue
+
+        plugin = parts[1]
+        if not (root / "plugins" / plugin).is_dir():
+            names_changed = True        # プラグインの削除 (追加は配下のスキル・エージェントの A で検出)
+        if parts[2] == "plugin.json":
+            scope.teams.add(plugin)
+        elif parts[2] == "skills" and len(parts) >= 4:
+            scope.skills.add(root / "plugins" / plugin / "skills" / parts[3])
+            touched_names.add(parts[3])
+            if change.status in ("A", "D") and parts[-1] in ("SKILL.md", "metadata.md"):
+                names_changed = True
+        elif parts[2] == "agents" and len(parts) == 4 and parts[3].endswith(".md"):
+            scope.agents.add(path)
+            if change.status in ("A", "D"):
+                names_changed = True
+
+    # 変更スキルの frontmatter 名も加えて、requires: の逆依存を閉包まで広げる
+    touched_names |= {s.name for s in catalog.skills if s.path in scope.skills}
+    if touched_names:
+        scope.graph = True
+        dependents = DepGraph(catalog.deps()).dependents_of(touched_names)
+        for skill in catalog.skills:
+            if skill.name in dependents or skill.dir_name in dependents:
+                scope.skills.add(skill.path)
+        scope.skill_names = touched_names | dependents
+
+        # 変更スキルをメンバーに持つチームのプラグイン
+        for plugin in catalog.plugins:
+            if any(touched_names.intersection(members) for members in plugin.teams.values()):
+                scope.teams.add(plugin.name)
+
+    if names_changed:
+        scope.all_agents = True
+        scope.teams.update(p.name for p in catalog.plugins)
+    return scope
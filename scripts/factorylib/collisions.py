@@ -0,0 +1,152 @@
+# トリガー衝突検出 — MinHash / LSH でトリガーフレーズが重なるスキル対を近似線形時間で列挙
+"""
+factorylib.collisions — use-when / description のトリガーが似すぎているスキル・エージェントの組を探す
+
+  collisions = find_collisions([(name, text), ...], threshold=0.3)
+  for c in collisions: c.a, c.b, c.similarity, c.shared
+
+手順:
+  1. 各アセットの引用トリガーフレーズを factorylib.triggers でトークン化し、
+     トークンと隣接 2 トークンの組をシングルにする (CJK は文字 bigram がトークン)
+  2. 文書の多くに現れるシングル (大規模カタログの定型句) は除く
+  3. シングル集合の MinHash 署名 (NUM_PERM 個) を作り、BANDS 個のバンドに分けてバケットに入れる
+  4. 同じバケットに入った組だけを候補とし、実際の Jaccard 係数が threshold 以上のものを返す
+アセットが EXACT_MAX 件以下なら 3〜4 を飛ばして全組の Jaccard を直接計算する (署名を作るより速く、見落としもない)。
+それより多い場合は全組 (O(n²)) の比較はしない。バンドあたり ROWS = NUM_PERM / BANDS 行で、
+一致確率は 1 - (1 - J^ROWS)^BANDS (既定の 128 / 64 なら J = 0.3 で 99.7%、J = 0.2 で 93%)。
+NUM_PERM 個のハッシュ関数は SHAKE-128 の出力を 32 bit ずつ区切ったもので、シングルごとに
+1 回だけ計算する。署名は各シングルのハッシュ列の要素ごとの最小値 (zip + min) で、
+Python のループを回るのはシングル数だけ。実行ごと・プロセスごとに結果は変わらない。
+"""
+
+import itertools
+import struct
+from collections import Counter
+from dataclasses import dataclass, field
+
+from factorylib.triggers import extract_triggers, tokenize
+
+NUM_PERM = 128
+BANDS    = 64
+
+# 文書の COMMON_DF 以上に現れ、かつ MIN_COMMON_DF 件以上あるシングルは比較に使わない
+COMMON_DF     = 0.3
+MIN_COMMON_DF = 64
+
+# これ以下の件数なら MinHash / LSH を使わず全組を比較する (hashlib の読み込みと署名の計算を省く)
+EXACT_MAX = 300
+
+# 衝突の報告に添える「共通のフレーズ」: そのシングルのうち相手側にもある割合がこれ以上
+SHARED_OVERLAP = 0.5
+
+
+@dataclass(frozen=True)
+class Collision:
+    a: str
+    b: str
+    similarity: float                                   # シングル集合の Jaccard 係数
+    shared: list[str] = field(default_factory=list)     # シングルの半分以上が相手側にもあるトリガーフレーズ (重複なし・ソート済み)
+
+
+# ============================================================
+# シングル
+# ============================================================
+def trigger_shingles(text: str) -> tuple[list[str], list[set[str]]]:
+    """(トリガーフレーズ, フレーズごとのシングル集合)"""
+    phrases = extract_triggers(text)
+    shingles = []
+    for phrase in phrases:
+        tokens = tokenize(phrase)
+        shingles.append(set(tokens) | {f"{x} {y}" for x, y in zip(tokens, tokens[1:])})
+    return phrases, shingles
+
+
+def _overlap(shingles: set[str], other: set[str]) -> float:
+    return len(shingles & other) / len(shingles) if shingles else 0.0
+
+
+# ============================================================
+# MinHash / LSH
+# ============================================================
+class MinHasher:
+    """
+    シングル集合 → NUM_PERM 個の最小ハッシュ値。シングルのハッシュ列はキャッシュして使い回す
+    (max_cache を超えたらキャッシュを捨てる。シングルの種類が多い入力でメモリを抑えるため)
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1, max_cache: int | None = None):
+        import hashlib     # import コストが大きいため、実際に使うときに読み込む
+
+        self._shake = hashlib.shake_128
+        self._salt = seed.to_bytes(4, "little")
+        self._format = f"<{num_perm}I"
+        self._size = 4 * num_perm
+        self._cache: dict[str, tuple[int, ...]] = {}
+        self._max_cache = max_cache
+
+    def hashes(self, shingle: str) -> tuple[int, ...]:
+        values = self._cache.get(shingle)
+        if values is None:
+            if self._max_cache is not None and len(self._cache) >= self._max_cache:
+                self._cache.clear()
+            digest = self._shake(self._salt + shingle.encode("utf-8")).digest(self._size)
+            values = self._cache[shingle] = struct.unpack(self._format, digest)
+        return values
+
+    def signature(self, shingles: set[str]) -> tuple[int, ...]:
+        return tuple(map(min, zip(*map(self.hashes, shingles))))
+
+
+def lsh_candidates(signatures: list[tuple[int, ...]], bands: int = BANDS) -> set[tuple[int, int]]:
+    """いずれかのバンドで署名が一致した (i, j) (i < j) の組"""
+    rows = len(signatures[0]) // bands if signatures else 0
+    candidates: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        lo = band * rows
+        for i, sig in enumerate(signatures):
+            buckets.setdefault(sig[lo:lo + rows], []).append(i)
+        for members in buckets.values():
+            if len(members) > 1:
+                candidates.update(itertools.combinations(members, 2))
+    return candidates
+
+
+# ============================================================
+# 検出
+# ============================================================
+def find_collisions(
+    items: list[tuple[str, str]], threshold: float, num_perm: int = NUM_PERM, bands: int = BANDS,
+) -> list[Collision]:
+    """items = [(name, use-when / description)]。類似度の高い順 (同率は名前順) に返す"""
+    parsed = [trigger_shingles(text) for _, text in items]
+    sets = [set().union(*per_phrase) for _, per_phrase in parsed]
+
+    df = Counter(s for shingles in sets for s in shingles)
+    common = {s for s, count in df.items() if count >= MIN_COMMON_DF and count > COMMON_DF * len(items)}
+    if common:
+        sets = [shingles - common for shingles in sets]
+
+    indexed = [i for i, shingles in enumerate(sets) if shingles]
+    if len(indexed) <= EXACT_MAX:
+        candidates = itertools.combinations(range(len(indexed)), 2)
+    else:
+        hasher = MinHasher(num_perm)
+        candidates = lsh_candidates([hasher.signature(sets[i]) for i in indexed], bands)
+
+    collisions = []
+    for x, y in candidates:
+        i, j = indexed[x], indexed[y]
+        similarity = len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+        if similarity < threshold:
+            continue
+        shared = sorted({
+            phrase
+            for (phrases, per_phrase), other in ((parsed[i], sets[j]), (parsed[j], sets[i]))
+            for phrase, shingles in zip(phrases, per_phrase)
+            if _overlap(shingles - common, other) >= SHARED_OVERLAP
+        })
+        a, b = sorted((items[i][0], items[j][0]))
+        collisions.append(Collision(a, b, round(similarity, 3), shared))
+    collisions.sort(key=lambda c: (-c.similarity, c.a, c.b))
+    return collisions
@@ -0,0 +1,183 @@
+# ドキュメント drift スキャナー — 禁止パターンを 1 つの正規表現に結合し、各ファイルを 1 回だけ走査
+"""
+factorylib.drift — ドキュメント内の deprecated キーワード検出
+
+全ルールを 1 つの結合パターンにコンパイルし、ファイル全体を 1 回だけ走査する。
+ヒットした行だけを切り出して allowlist とルール順の判定を行い、
+行番号もヒット時にのみ差分で数える (従来どおり 1 行につき 1 件のみ報告)。
+
+  matcher = DriftMatcher(rules)
+  files   = collect_targets(FACTORY_ROOT, targets)
+  for findings in scan_files(files, matcher, jobs): ...
+
+ルール・対象は JSON 設定ファイルからも読み込める (load_drift_config):
+
+  {
+    "rules":   [{"pattern": "skill-router", "message": "...", "severity": "error", "id": "drift/skill-router"}],
+    "targets": [{"glob": "_docs/*.md", "allow": ["Doc Drift"]}]
+  }
+
+pattern は結合パターンの 1 選択肢になるため、番号付き後方参照 (\\1 など) は使えない。
+先頭のインラインフラグ ((?i) など) はそのルールだけに効くスコープ付きフラグに書き換えて結合する。
+^ / $ は (ルール単体で行を判定するときと同じく) 各行の先頭・末尾に一致する。
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from factorylib.findings import ERROR, WARNING, Finding
+from factorylib.parallel import map_ordered
+from factorylib.profile import count_read, count_regex
+
+
+@dataclass(frozen=True)
+class DriftRule:
+    pattern: str
+    message: str
+    is_error: bool      # True → ERROR (--strict 不要でも失敗)、False → WARNING
+    rule_id: str = "drift/keyword"   # NDJSON / SARIF 出力のルール ID
+
+
+@dataclass(frozen=True)
+class DriftTarget:
+    glob: str
+    allowlist: tuple[str, ...] = ()   # この部分文字列を含む行はスキップ
+
+
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _alternative(pattern: str) -> str:
+    """結合パターンの 1 選択肢にする。先頭のグローバルフラグは (?i:...) のようなスコープ付きに書き換える"""
+    flags = ""
+    while m := _GLOBAL_FLAGS.match(pattern):
+        flags += m.group(1)
+        pattern = pattern[m.end():]
+    if not flags:
+        return f"(?:{pattern})"
+    tail = "\n" if "x" in flags else ""     # verbose の行末コメントが閉じ括弧を飲み込まないように
+    return f"(?{flags}:{pattern}{tail})"
+
+
+class DriftMatcher:
+    """
+    ルール一覧を結合パターンにコンパイルしたもの (pickle 可能)。
+    結合できないルール (名前付きグループの重複など) は re.error を送出する
+    """
+
+    def __init__(self, rules: list[DriftRule]):
+        self.rules = list(rules)
+        self.compiled = [re.compile(r.pattern) for r in self.rules]
+        self.combined = (re.compile("|".join(_alternative(r.pattern) for r in self.rules), re.MULTILINE)
+                         if self.rules else None)
+
+    def scan(self, text: str, location: str, allowlist: tuple[str, ...] = ()) -> list[Finding]:
+        """text 全体を結合パターンで走査し、ヒット行ごとに最初に一致したルールを 1 件返す"""
+        findings: list[Finding] = []
+        if self.combined is None:
+            return findings
+
+        lineno, counted = 1, 0      # 行番号はヒット位置まで差分で進める
+        pos = 0
+        while True:
+            m = self.combined.search(text, pos)
+            count_regex()
+            if m is None:
+                break
+            start = text.rfind("\n", 0, m.start()) + 1
+            end = text.find("\n", m.start())
+            if end == -1:
+                end = len(text)
+            line = text[start:end]
+
+            if not any(skip in line for skip in allowlist):
+                # 従来どおりルール定義順で判定 (結合パターンが行をまたいだ誤ヒットもここで落ちる)
+                for rule, regex in zip(self.rules, self.compiled):
+                    count_regex()
+                    if regex.search(line):
+                        lineno += text.count("\n", counted, start)
+                        counted = start
+                        severity = ERROR if rule.is_error else WARNING
+                        findings.append(Finding(severity, f"[{location}:{lineno}] {rule.message}",
+                                                rule.rule_id, location, lineno))
+                        break
+            pos = end + 1
+        return findings
+
+
+# ============================================================
+# 設定ファイル
+# ============================================================
+def load_drift_config(path: Path) -> tuple[list[DriftRule] | None, list[DriftTarget] | None]:
+    """JSON 設定から (rules, targets) を読む。キーがなければ None (既定値を使う)"""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path}: drift 設定を読み込めない — {e}") from e
+
+    rules = targets = None
+    try:
+        if "rules" in data:
+            rules = [
+                DriftRule(r["pattern"], r["message"], r.get("severity", "error") == "error",
+                          r.get("id", "drift/keyword"))
+                for r in data["rules"]
+            ]
+        if "targets" in data:
+            targets = [DriftTarget(t["glob"], tuple(t.get("allow", []))) for t in data["targets"]]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"{path}: drift 設定の形式が不正 — {e!r}") from e
+
+    for rule in rules or []:
+        try:
+            re.compile(rule.pattern)
+        except re.error as e:
+            raise ValueError(f"{path}: 不正な pattern '{rule.pattern}' — {e}") from e
+    if rules:
+        try:
+            DriftMatcher(rules)
+        except re.error as e:
+            raise ValueError(f"{path}: rules の pattern を 1 つに結合できない — {e}") from e
+    return rules, targets
+
+
+# ============================================================
+# 走査
+# ============================================================
+def collect_targets(root: Path, targets: list[DriftTarget]) -> list[tuple[Path, str, tuple[str, ...]]]:
+    """対象ファイルを 1 回だけ列挙する (複数の glob に一致したファイルは最初の対象のみ)"""
+    seen: set[Path] = set()
+    files = []
+    for target in targets:
+        for path in sorted(root.glob(target.glob)):
+            if path in seen or not path.is_file():
+                continue
+            seen.add(path)
+            files.append((path, path.relative_to(root).as_posix(), target.allowlist))
+    return files
+
+
+_WORKER_MATCHER: DriftMatcher | None = None
+
+
+def _init_worker(matcher: DriftMatcher) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = matcher
+
+
+def _scan_task(item: tuple[Path, str, tuple[str, ...]]) -> list[Finding]:
+    path, rel, allowlist = item
+    try:
+        raw = path.read_bytes()
+        text = raw.decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    count_read(len(raw))
+    return _WORKER_MATCHER.scan(text, rel, allowlist)
+
+
+def scan_files(files: list, matcher: DriftMatcher, jobs: int = 1):
+    """collect_targets() の各ファイルの指摘一覧を入力順に yield する"""
+    return map_ordered(_scan_task, files, jobs, _init_worker, (matcher,))
@@ -0,0 +1,311 @@
+# 重複コンテンツ検出 — SKILL.md / resources をセクション単位のチャンクに分け、完全一致と近似重複 (MinHash / LSH) を束ねる
+"""
+factorylib.duplicates — スキル本文・リソース間でコピペされたセクションを探し、共通化で減らせる量を見積もる
+
+  paths = content_files(FACTORY_ROOT)      # SKILL.md と resources/ / references/ 配下のテキスト
+  report = find_duplicates(FACTORY_ROOT, paths, threshold=0.4)
+  for g in report.groups: g.kind, g.chunks, g.similarity, g.saved_bytes, g.saved_tokens
+
+手順:
+  1. ファイル全体のハッシュで同一ファイルを束ね、チャンク化は各組の 1 ファイルだけ行う
+  2. Markdown を見出し (# 〜 ###、コードフェンス内は除く) ごとのセクションに切り、
+     MIN_CHUNK_BYTES 未満のセクションは捨てる。SKILL.md のフロントマターは対象外
+  3. 空白を詰めた行をシングルにし、セクションの正規化テキストのハッシュで完全一致を束ねる
+  4. 完全一致の代表だけを MinHash 署名にして LSH (factorylib.collisions) にかけ、候補の組だけ
+     行集合の Jaccard 係数を確かめる。threshold 以上の組を union-find でグループにまとめる
+  5. グループの最大のチャンクを共通リソースとして残したとき、他のコピーから消える行
+     (代表にもある行) のバイト数と推定トークン数を「削減できる量」とする
+全組 (O(n²)) の比較はせず、ファイルは 1 回ずつしか読まない。多数のチャンクに現れる行
+(コードフェンスの定型行など) は候補の生成にだけ使わない (類似度の計算には含める)。
+"""
+
+import os
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from factorylib.collisions import MinHasher, lsh_candidates
+from factorylib.profile import count_read
+
+TEXT_SUFFIXES   = (".md", ".markdown", ".txt")
+RESOURCE_DIRS   = ("resources", "references")
+MIN_CHUNK_BYTES = 256
+MIN_CHUNK_LINES = 3         # シングルになる行 (_SIGNIFICANT) の最小数
+
+# テンプレートの定型部分 (try / catch・reply の骨組み) は API 呼び出しが違うだけでセクションの
+# 4〜5 割を占めるため、既定の閾値は低めにする
+DEFAULT_THRESHOLD = 0.4
+
+# 署名は 64 個のハッシュを 2 行 × 32 バンドに分ける (J = 0.4 で 99.6%、J = 0.3 で 95% が候補になる)
+NUM_PERM  = 64
+BANDS     = 32
+MAX_CACHE = 200_000         # MinHasher が保持する行ハッシュの上限
+
+# チャンクの COMMON_DF 以上に現れ、かつ MIN_COMMON_DF 件以上ある行は候補の生成に使わない
+COMMON_DF     = 0.3
+MIN_COMMON_DF = 64
+
+# 英数字・かな・漢字などを 3 文字以上含む行だけをシングルにする (``` / } / --- などの記号行は除く)
+_SIGNIFICANT = re.compile(r"[^\W_](?:.*?[^\W_]){2}")
+
+# 推定トークン数: ASCII は 4 文字で 1 トークン、それ以外 (かな・漢字・ハングル) は 1 文字 1 トークン
+ASCII_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class Chunk:
+    path: str                   # root からの相対パス
+    line: int                   # セクション先頭 (見出し) の行番号
+    heading: str                # 見出しの表記 (見出しのない先頭部分は "")
+    size: int                   # セクションのバイト数
+    digest: bytes               # 正規化テキストのハッシュ (完全一致の判定用)
+    lines: dict[str, tuple[int, int]] = field(default_factory=dict)   # 正規化した行 → (出現数, 生のバイト数)
+
+    @property
+    def owner(self) -> str:
+        return owner_of(self.path)
+
+
+@dataclass
+class DuplicateGroup:
+    kind: str                   # "file" (同一ファイル) / "chunk" (セクション)
+    chunks: list[Chunk]         # 先頭が共通化して残す側 (代表)
+    similarity: float           # 代表との Jaccard 係数の最小値 (完全一致だけなら 1.0)
+    saved_bytes: int
+    saved_tokens: int
+
+    @property
+    def owners(self) -> list[str]:
+        return sorted({c.owner for c in self.chunks})
+
+
+@dataclass
+class DuplicateReport:
+    files: int
+    total_bytes: int
+    total_tokens: int
+    chunks: int
+    candidates: int             # LSH で検証した組の数
+    groups: list[DuplicateGroup]
+
+    @property
+    def saved_bytes(self) -> int:
+        return sum(g.saved_bytes for g in self.groups)
+
+    @property
+    def saved_tokens(self) -> int:
+        return sum(g.saved_tokens for g in self.groups)
+
+
+# ============================================================
+# 走査対象
+# ============================================================
+def _walk_text(directory: Path) -> list[Path]:
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        found.extend(Path(dirpath) / name for name in filenames if name.endswith(TEXT_SUFFIXES))
+    return found
+
+
+def content_files(root: Path) -> list[Path]:
+    """plugins/*/skills/*/SKILL.md と、スキル・プラグイン直下の resources/ / references/ 配下のテキスト"""
+    paths: list[Path] = []
+    for plugin_dir in sorted((root / "plugins").glob("*/")):
+        for base in [plugin_dir, *sorted((plugin_dir / "skills").glob("*/"))]:
+            if (base / "SKILL.md").is_file():
+                paths.append(base / "SKILL.md")
+            for name in RESOURCE_DIRS:
+                if (base / name).is_dir():
+                    paths.extend(sorted(_walk_text(base / name)))
+    return paths
+
+
+def owner_of(rel: str) -> str:
+    """plugins/<p>/skills/<s>/… → <s>、plugins/<p>/resources/… → <p>/resources"""
+    parts = rel.split("/")
+    if len(parts) > 3 and parts[0] == "plugins" and parts[2] == "skills":
+        return parts[3]
+    if len(parts) > 2 and parts[0] == "plugins":
+        return f"{parts[1]}/{parts[2]}"
+    return parts[0]
+
+
+# ============================================================
+# チャンク化
+# ============================================================
+def estimate_tokens(text: str) -> float:
+    """ASCII_CHARS_PER_TOKEN 文字 ≒ 1 トークン (ASCII)、非 ASCII は 1 文字 ≒ 1 トークンの概算"""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars / ASCII_CHARS_PER_TOKEN + (len(text) - ascii_chars)
+
+
+def _body_start(lines: list[str]) -> int:
+    """フロントマター (--- で囲まれた先頭ブロック) の次の行番号 (0 始まり)。なければ 0"""
+    if not lines or lines[0].rstrip() != "---":
+        return 0
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == "---":
+            return i + 1
+    return 0
+
+
+def _make_chunk(
+    rel: str, start: int, heading: str, raw_lines: list[str], min_bytes: int, digest: Callable[[bytes], bytes],
+) -> Chunk | None:
+    sizes = [len(raw.encode("utf-8")) for raw in raw_lines]
+    size = sum(sizes)
+    if size < min_bytes:
+        return None
+    normalized: list[str] = []
+    lines: dict[str, tuple[int, int]] = {}
+    for raw, nbytes in zip(raw_lines, sizes):
+        norm = " ".join(raw.split())
+        if not norm:
+            continue
+        normalized.append(norm)
+        if _SIGNIFICANT.search(norm):
+            count, total = lines.get(norm, (0, 0))
+            lines[norm] = (count + 1, total + nbytes)
+    if sum(count for count, _ in lines.values()) < MIN_CHUNK_LINES:
+        return None
+    return Chunk(rel, start + 1, heading, size, digest("\n".join(normalized).encode("utf-8")), lines)
+
+
+def split_chunks(
+    rel: str, text: str, digest: Callable[[bytes], bytes], min_bytes: int = MIN_CHUNK_BYTES,
+) -> list[Chunk]:
+    """見出し (# 〜 ###) ごとのセクション。コードフェンス内の '#' は見出しとみなさない。digest は正規化した本文のハッシュ"""
+    lines = text.splitlines(keepends=True)
+    chunks: list[Chunk] = []
+    start, heading, fence = _body_start(lines), "", ""
+    section_start = start
+    for i in range(start, len(lines)):
+        stripped = lines[i].lstrip()
+        if stripped.startswith(("```", "~~~")):
+            marker = stripped[:3]
+            fence = "" if fence == marker else (fence or marker)
+            continue
+        if fence or not stripped.startswith("#"):
+            continue
+        level = len(stripped) - len(stripped.lstrip("#"))
+        if level <= 3 and stripped[level:level + 1] in (" ", "\t"):
+            if i > section_start:
+                chunk = _make_chunk(rel, section_start, heading, lines[section_start:i], min_bytes, digest)
+                if chunk is not None:
+                    chunks.append(chunk)
+            section_start, heading = i, stripped.strip()
+    chunk = _make_chunk(rel, section_start, heading, lines[section_start:], min_bytes, digest)
+    if chunk is not None:
+        chunks.append(chunk)
+    return chunks
+
+
+# ============================================================
+# グループ化
+# ============================================================
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def _jaccard(a: frozenset | dict, b: frozenset | dict) -> float:
+    inter = len(a & b) if isinstance(a, frozenset) else len(a.keys() & b.keys())
+    return inter / (len(a) + len(b) - inter)
+
+
+def _chunk_group(chunks: list[Chunk]) -> DuplicateGroup:
+    """最大のチャンクを代表とし、他のチャンクのうち代表にもある行を削減できる量とする"""
+    chunks = sorted(chunks, key=lambda c: (-c.size, c.path, c.line))
+    keep = chunks[0]
+    saved_bytes, saved_tokens, similarity = 0, 0.0, 1.0
+    for chunk in chunks[1:]:
+        if chunk.digest != keep.digest:
+            similarity = min(similarity, _jaccard(chunk.lines, keep.lines))
+        for norm, (count, nbytes) in chunk.lines.items():
+            if norm in keep.lines:
+                saved_bytes += nbytes
+                saved_tokens += estimate_tokens(norm) * count
+    return DuplicateGroup("chunk", chunks, round(similarity, 3), saved_bytes, round(saved_tokens))
+
+
+def find_duplicates(
+    root: Path, paths: list[Path], threshold: float, min_bytes: int = MIN_CHUNK_BYTES,
+) -> DuplicateReport:
+    """paths の同一ファイルと、threshold 以上似ているセクションのグループ (削減できる量の多い順)"""
+    import hashlib     # import コストが大きいため、実際に使うときに読み込む
+
+    def digest(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    # ── 1. 同一ファイル ──
+    by_digest: dict[bytes, list[tuple[str, bytes]]] = {}
+    total_bytes = 0
+    for path in paths:
+        raw = path.read_bytes()
+        count_read(len(raw))
+        total_bytes += len(raw)
+        by_digest.setdefault(digest(raw), []).append(
+            (path.relative_to(root).as_posix(), raw))
+
+    groups: list[DuplicateGroup] = []
+    chunks: list[Chunk] = []
+    total_tokens = 0.0
+    for copies in by_digest.values():
+        rel, raw = min(copies)
+        text = raw.decode("utf-8", errors="replace")
+        tokens = estimate_tokens(text)
+        total_tokens += tokens * len(copies)
+        chunks.extend(split_chunks(rel, text, digest, min_bytes))
+        if len(copies) > 1:
+            members = [Chunk(r, 1, "", len(raw), b"") for r, _ in sorted(copies)]
+            groups.append(DuplicateGroup("file", members, 1.0, len(raw) * (len(copies) - 1),
+                                         round(tokens * (len(copies) - 1))))
+
+    # ── 2. 完全一致のセクション ──
+    exact: dict[bytes, list[Chunk]] = {}
+    for chunk in chunks:
+        exact.setdefault(chunk.digest, []).append(chunk)
+    reps = [members[0] for members in exact.values()]
+
+    # ── 3. 近似重複 (MinHash / LSH → Jaccard の検証) ──
+    df = Counter(norm for chunk in reps for norm in chunk.lines)
+    common = {norm for norm, count in df.items() if count >= MIN_COMMON_DF and count > COMMON_DF * len(reps)}
+    hasher = MinHasher(NUM_PERM, max_cache=MAX_CACHE)
+    indexed, signatures = [], []
+    for i, chunk in enumerate(reps):
+        shingles = chunk.lines.keys() - common
+        if shingles:
+            indexed.append(i)
+            signatures.append(hasher.signature(shingles))
+
+    uf = _UnionFind(len(reps))
+    keys = [frozenset(chunk.lines) for chunk in reps]
+    candidates = lsh_candidates(signatures, BANDS)
+    for x, y in candidates:
+        i, j = indexed[x], indexed[y]
+        if uf.find(i) != uf.find(j) and _jaccard(keys[i], keys[j]) >= threshold:
+            uf.union(i, j)
+
+    components: dict[int, list[Chunk]] = {}
+    for i, chunk in enumerate(reps):
+        components.setdefault(uf.find(i), []).extend(exact[chunk.digest])
+    for members in components.values():
+        if len({c.path for c in members}) > 1:
+            groups.append(_chunk_group(members))
+
+    groups.sort(key=lambda g: (-g.saved_bytes, g.chunks[0].path, g.chunks[0].line))
+    return DuplicateReport(len(paths), total_bytes, round(total_tokens), len(chunks), len(candidates), groups)
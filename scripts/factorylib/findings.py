@@ -0,0 +1,104 @@
+# lint 検出結果モデル — チェック関数が返す構造化された指摘 (エラー / 警告) と機械可読出力
+"""
+factorylib.findings — lint の指摘 1 件を表す Finding と NDJSON / SARIF ライター
+
+チェック関数は print せずに Finding のリストを返し、
+表示・集計は呼び出し側 (lint-skills.py の main) がまとめて行う。
+プロセスプールのワーカーから返せるよう pickle 可能な値のみを持つ。
+
+  writer = open_writer("ndjson", sys.stdout)   # "ndjson" | "sarif"
+  writer.write(finding)                         # 1 件ずつ即座に書き出す (全件をメモリに溜めない)
+  writer.close()
+
+SARIF も結果を 1 件ずつ書き出し、tool.driver.rules (出現したルール ID) は
+results の後ろに置く (JSON のキー順は意味を持たないため SARIF として有効)。
+"""
+
+import json
+from dataclasses import dataclass
+from io import TextIOBase
+
+ERROR   = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class Finding:
+    severity: str               # ERROR | WARNING
+    message: str
+    rule: str = ""              # ルール ID (例: skill/name-mismatch)
+    path: str = ""              # FACTORY_ROOT からの相対パス (不明なら空)
+    line: int | None = None     # 1 始まりの行番号 (不明なら None)
+
+    def to_dict(self) -> dict:
+        return {"rule": self.rule, "severity": self.severity, "file": self.path,
+                "line": self.line, "message": self.message}
+
+
+def count(findings: list[Finding]) -> tuple[int, int]:
+    """(errors, warnings) を返す"""
+    errors = sum(1 for f in findings if f.severity == ERROR)
+    return errors, len(findings) - errors
+
+
+# ============================================================
+# 機械可読出力
+# ============================================================
+class NdjsonWriter:
+    """1 行 1 指摘の JSON (Newline Delimited JSON)"""
+
+    def __init__(self, stream: TextIOBase):
+        self.stream = stream
+
+    def write(self, finding: Finding) -> None:
+        self.stream.write(json.dumps(finding.to_dict(), ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class SarifWriter:
+    """SARIF 2.1.0 (runs[0].results を逐次書き出す)"""
+
+    SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+    def __init__(self, stream: TextIOBase, tool: str = "lint-skills"):
+        self.stream = stream
+        self.tool = tool
+        self.rules: dict[str, None] = {}     # 出現順のルール ID
+        self.first = True
+        stream.write(f'{{"$schema":"{self.SCHEMA}","version":"2.1.0","runs":[{{"results":[\n')
+
+    def write(self, finding: Finding) -> None:
+        rule = finding.rule or "lint"
+        self.rules[rule] = None
+        result = {
+            "ruleId":  rule,
+            "level":   "error" if finding.severity == ERROR else "warning",
+            "message": {"text": finding.message},
+        }
+        if finding.path:
+            location: dict = {"artifactLocation": {"uri": finding.path, "uriBaseId": "%SRCROOT%"}}
+            if finding.line is not None:
+                location["region"] = {"startLine": finding.line}
+            result["locations"] = [{"physicalLocation": location}]
+        self.stream.write(("" if self.first else ",\n") + json.dumps(result, ensure_ascii=False))
+        self.stream.flush()
+        self.first = False
+
+    def close(self) -> None:
+        driver = {"name": self.tool, "rules": [{"id": rule} for rule in self.rules]}
+        self.stream.write(f"\n],{json.dumps({'tool': {'driver': driver}})[1:-1]}}}]}}\n")
+        self.stream.flush()
+
+
+FORMATS = ("text", "ndjson", "sarif")
+
+
+def open_writer(fmt: str, stream: TextIOBase) -> NdjsonWriter | SarifWriter:
+    if fmt == "ndjson":
+        return NdjsonWriter(stream)
+    if fmt == "sarif":
+        return SarifWriter(stream)
+    raise ValueError(f"未対応の出力形式: {fmt} ({' | '.join(FORMATS[1:])})")
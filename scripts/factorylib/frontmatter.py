@@ -0,0 +1,628 @@
+# フロントマターパーサー — metadata.md / SKILL.md / agent の YAML ヘッダーを解析
+"""
+factorylib.frontmatter — YAML フロントマター (---..---) パーサー
+
+3 スクリプトで重複していた parse_frontmatter / read_body を統合したもの。
+パースは YAML のサブセット (_parse_into 参照) を 1 パスで読むトークナイザーで行い、
+クォート (エスケープ含む)・ブロックスカラー・フロー / ブロックのリストを YAML の規則どおりに解釈する。
+構文エラーは FrontmatterError (行・桁付き) として報告する。
+旧パーサーが受け付けていた「プレーンな値の中の ': '」だけは互換のため値全体を文字列として読み、
+FrontmatterWarning として報告する (lint では警告)。
+
+ファイルからの読み込みはヘッダーだけを行単位で読み、閉じ --- で止める (read_header)。
+ヘッダーのバイト長がそのまま本文の開始オフセットになるので、本文が必要なときは
+read_body(path, offset) でそこから先だけを読む。SKILL.md がどれだけ大きくても
+フロントマターの解析で本文を読むことはない。
+"""
+
+import re
+from pathlib import Path
+
+# 閉じ --- がこのバイト数以内に見つからなければフロントマターなしとして扱う
+FRONTMATTER_MAX_BYTES = 64 * 1024
+
+
+# ============================================================
+# テキスト分割
+# ============================================================
+def split_frontmatter(text: str) -> tuple[str | None, str]:
+    """(フロントマターブロック, 本文) を返す。フロントマターがなければ (None, text)"""
+    if not text.startswith("---"):
+        return None, text
+
+    end = text.find("\n---", 3)
+    if end == -1:
+        return None, text
+
+    return text[3:end].strip(), text[end + 4:].strip()
+
+
+# ============================================================
+# パース (1 パスのトークナイザー)
+# ============================================================
+class FrontmatterError(ValueError):
+    """フロントマターの構文エラー。line / column は 1 始まり (ファイル先頭の --- が 1 行目)"""
+
+    def __init__(self, message: str, line: int, column: int = 1):
+        super().__init__(message, line, column)     # args をそのまま渡す (pickle / キャッシュから復元可能)
+        self.message = message
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        return f"{self.line}:{self.column}: {self.message}"
+
+
+class FrontmatterWarning(FrontmatterError):
+    """YAML としては不正だが互換のため読み込んだ書き方。送出はせず warnings に積む"""
+
+
+# ダブルクォート文字列中で処理が必要な文字
+_DQ_SPECIAL = re.compile(r'["\\]')
+# ブロックスカラーのヘッダー: | または > + チョンピング (-/+) とインデント指示子 (順不同)
+_BLOCK_HEADER = re.compile(r"([|>])(?:([+-])([1-9])?|([1-9])([+-])?)?[ \t]*(?:#.*)?$")
+# ダブルクォートのエスケープ
+_ESCAPES = {"0": "\0", "a": "\a", "b": "\b", "t": "\t", "\t": "\t", "n": "\n", "v": "\v", "f": "\f",
+            "r": "\r", "e": "\x1b", " ": " ", '"': '"', "/": "/", "\\": "\\", "N": "\x85",
+            "_": "\xa0", "L": "\u2028", "P": "\u2029"}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+# プレーンスカラーの先頭に置けない (クォートが必要な) 文字
+_RESERVED_START = frozenset("@`&*!%{")
+_RESERVED_KEY_START = frozenset("-?[]{},\"'&*!|>%@`")
+# 1 行のプレーンスカラーで詳しく調べる必要がある先頭文字 (それ以外で ':' と '#' を含まなければそのまま値)
+_SPECIAL_HEAD = frozenset("\"'[-?") | _RESERVED_START
+# _parse_simple が扱う行: key: プレーン (':' '#' なし) / '…' / "…" (エスケープなし) / [a, b] / > / |
+_SIMPLE_LINE = re.compile(
+    r"([A-Za-z0-9_][\w.-]*): +"
+    r"([^\s\"'\[\]{}|>#&*!%@`?-](?:[^:#\t]*[^:#\s])?|'[^'\t]*'|\"[^\"\\\t]*\"|\[[^\[\]{}\"'#:\t]*\]|[|>]) *"
+)
+# これらを含むフローシーケンスは split で済ませず 1 文字ずつ読む
+_FLOW_SPECIAL = re.compile(r"[\"'\[\]{}#]")
+
+
+def _indent(line: str, lineno: int) -> int:
+    """先頭スペース数。インデントにタブがあればエラー"""
+    width = len(line) - len(line.lstrip(" "))
+    if line[width:width + 1] == "\t" and line.strip():
+        raise FrontmatterError("インデントにタブは使えない", lineno, width + 1)
+    return width
+
+
+def _is_blank(line: str) -> bool:
+    return not line.strip()
+
+
+def _is_comment(line: str) -> bool:
+    return line.lstrip(" ").startswith("#")
+
+
+def _comment_start(text: str) -> int:
+    """プレーンスカラー中のコメント開始位置 (行頭か空白直後の #)。なければ len(text)"""
+    i = text.find("#")
+    while i > 0 and text[i - 1] not in " \t":
+        i = text.find("#", i + 1)
+    return len(text) if i == -1 else i
+
+
+def _key_sep(line: str) -> int:
+    """'key:' のコロン位置 (後ろが空白か行末のもの)。なければ -1"""
+    i = line.find(":")
+    while i != -1 and i + 1 < len(line) and line[i + 1] not in " \t":
+        i = line.find(":", i + 1)
+    return i
+
+
+def _plain(text: str, lineno: int, col: int, warnings: list | None = None) -> str:
+    """
+    1 行分のプレーンスカラー (コメント除去済み)。': ' を含むものは warnings を渡していれば
+    値全体を文字列とみなして FrontmatterWarning を積み、渡していなければマッピングとみなしエラー
+    """
+    sep = _key_sep(text) if ":" in text else -1
+    if sep != -1:
+        if warnings is None:
+            raise FrontmatterError("値の中に ': ' がある — クォートで囲む必要がある", lineno, col + sep)
+        warnings.append(FrontmatterWarning(
+            "値の中に ': ' がある — 値全体を文字列として読んだ (YAML では構文エラーになるため、クォートで囲む)",
+            lineno, col + sep,
+        ))
+    if text[:1] in _RESERVED_START or text[:2] in ("- ", "? "):
+        raise FrontmatterError(f"'{text[:1]}' で始まる値は未対応 — クォートで囲む必要がある", lineno, col)
+    return text.strip()
+
+
+def _quoted(text: str, start: int, lineno: int, col0: int) -> tuple[str, int]:
+    """text[start] のクォートから閉じクォートまでを読み、(値, 閉じクォートの次の位置) を返す"""
+    quote = text[start]
+    out: list[str] = []
+    i = start + 1
+    while True:
+        if quote == "'":
+            end = text.find("'", i)
+        else:
+            m = _DQ_SPECIAL.search(text, i)
+            end = m.start() if m else -1
+        if end == -1:
+            raise FrontmatterError(f"閉じ {quote} がない (複数行のクォート文字列は未対応)", lineno, col0 + start)
+        out.append(text[i:end])
+        i = end + 1
+        if text[end] == "\\":
+            code = text[i:i + 1]
+            if code in _ESCAPES:
+                out.append(_ESCAPES[code])
+                i += 1
+                continue
+            width = _HEX_ESCAPES.get(code, 0)
+            digits = text[i + 1:i + 1 + width]
+            if width == 0 or len(digits) != width or not all(c in "0123456789abcdefABCDEF" for c in digits):
+                raise FrontmatterError(f"不正なエスケープ '\\{code}{digits}'", lineno, col0 + end)
+            out.append(chr(int(digits, 16)))
+            i += 1 + width
+        elif quote == "'" and text[i:i + 1] == "'":     # '' → '
+            out.append("'")
+            i += 1
+        else:
+            return "".join(out), i
+
+
+def _expect_end(text: str, pos: int, lineno: int, col0: int) -> None:
+    """pos 以降が空白かコメントだけであることを確認する"""
+    rest = text[pos:].lstrip(" \t")
+    if rest and not rest.startswith("#"):
+        raise FrontmatterError(f"値の後ろに余分な文字 '{rest[:10]}'", lineno, col0 + len(text) - len(rest))
+
+
+def _flow_list(text: str, lineno: int, col0: int) -> list[str]:
+    """[a, "b", 'c'] を 1 行で読む (text[0] == "[")"""
+    # 高速パス: クォート・ネスト・コメントのない [a, b, c] は split で済ませる
+    end = text.rfind("]")
+    inner = text[1:end]
+    if end != -1 and not text[end + 1:].strip() and ":" not in inner and not _FLOW_SPECIAL.search(inner):
+        items = [item.strip() for item in inner.split(",")]
+        if items[-1] == "":             # 末尾のカンマ ([a, b,]) と空リスト ([]) は YAML でも有効
+            items.pop()
+        for item in items:
+            if not item or item[0] in _SPECIAL_HEAD:
+                break
+        else:
+            return items
+    items = []
+    i = 1
+    expect_item = True
+    while True:
+        while i < len(text) and text[i] in " \t":
+            i += 1
+        if i >= len(text):
+            raise FrontmatterError("閉じ ']' がない (複数行のフローシーケンスは未対応)", lineno, col0)
+        ch = text[i]
+        if ch == "]":
+            _expect_end(text, i + 1, lineno, col0)
+            return items
+        if ch == ",":
+            if expect_item:
+                raise FrontmatterError("リストの要素が空", lineno, col0 + i)
+            expect_item = True
+            i += 1
+            continue
+        if not expect_item:
+            raise FrontmatterError("リストの要素の間に ',' がない", lineno, col0 + i)
+        if ch in "\"'":
+            value, i = _quoted(text, i, lineno, col0)
+        elif ch in "[{":
+            raise FrontmatterError("ネストしたリスト・マッピングは未対応", lineno, col0 + i)
+        else:
+            end = i
+            while end < len(text) and text[end] not in ",]" and not (text[end] == "#" and text[end - 1] in " \t"):
+                end += 1
+            value = _plain(text[i:end].rstrip(), lineno, col0 + i)
+            i = end
+        items.append(value)
+        expect_item = False
+
+
+def _scalar(text: str, lineno: int, col0: int, warnings: list | None = None) -> str | list[str]:
+    """1 行に収まる値 (クォート / フローシーケンス / プレーン)。text は左端の空白を除いたもの (warnings は _plain 参照)"""
+    if text[:1] in ("\"", "'"):
+        value, end = _quoted(text, 0, lineno, col0)
+        _expect_end(text, end, lineno, col0)
+        return value
+    if text[:1] == "[":
+        return _flow_list(text, lineno, col0)
+    return _plain(text[:_comment_start(text)].rstrip(), lineno, col0, warnings)
+
+
+def _fold(lines: list[str]) -> str:
+    """折り畳み (>): 通常行どうしの改行は空白、空行は改行、字下げの深い行の前後は改行のまま"""
+    out = prev = lines[0]
+    empties = 0
+    for line in lines[1:]:
+        if not line:
+            empties += 1
+            continue
+        if prev[:1] in (" ", "\t") or line[:1] in (" ", "\t"):
+            out += "\n" * (empties + 1)
+        else:
+            out += " " if empties == 0 else "\n" * empties
+        out += line
+        prev = line
+        empties = 0
+    return out
+
+
+def _block_scalar(lines: list[str], i: int, base: int, header: str, col0: int) -> tuple[str, int]:
+    """
+    | / > ブロックスカラー (lines[i] から)。チョンピング (既定 clip / - strip / + keep) と
+    インデント指示子に対応。(値, 次に読む行) を返す。base は lines[0] の行番号
+    """
+    if len(header) == 1:                # 指示子なし (> / |) が大半
+        style, chomp, indent = header, "", None
+    else:
+        m = _BLOCK_HEADER.match(header)
+        if not m:
+            raise FrontmatterError(f"ブロックスカラーのヘッダーが不正: '{header}'", base + i - 1, col0)
+        style = m.group(1)
+        chomp = m.group(2) or m.group(5) or ""
+        explicit = m.group(3) or m.group(4)
+        indent = int(explicit) if explicit else None
+
+    content: list[str] = []
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.lstrip(" ")
+        if not stripped or stripped.isspace():
+            content.append(line[indent:] if indent is not None else "")
+            i += 1
+            continue
+        width = len(line) - len(stripped)
+        if stripped[0] == "\t":
+            raise FrontmatterError("インデントにタブは使えない", base + i, width + 1)
+        if indent is None:
+            if width == 0:
+                break
+            indent = width
+        if width < indent:
+            if width > 0:
+                raise FrontmatterError(f"ブロックスカラーのインデントが不足 ({width} < {indent})", base + i, 1)
+            break
+        content.append(line[indent:])
+        i += 1
+
+    end = len(content)
+    while end and _is_blank(content[end - 1]):
+        end -= 1
+    body, trailing = content[:end], len(content) - end
+    if not body:
+        return ("\n" * trailing if chomp == "+" else ""), i
+    text = _fold(body) if style == ">" else "\n".join(body)
+    if chomp != "-":
+        text += "\n" * (trailing + 1 if chomp == "+" else 1)
+    return text, i
+
+
+def _plain_continuation(
+    lines: list[str], i: int, base: int, first: str, warnings: list | None = None,
+) -> tuple[str, int]:
+    """インデントされた lines[i] 以降に続くプレーンスカラー (改行は空白、空行は改行に折り畳む)"""
+    out = first
+    empties = 0
+    while i < len(lines):
+        line = lines[i]
+        if _is_blank(line):
+            empties += 1
+            i += 1
+            continue
+        width = _indent(line, base + i)
+        if width == 0:
+            break
+        text = line[width:]
+        part = _plain(text[:_comment_start(text)].rstrip(), base + i, width + 1, warnings)
+        if out:
+            out += " " if empties == 0 else "\n" * empties
+        out += part
+        empties = 0
+        i += 1
+    return out, i
+
+
+def _block_list(lines: list[str], i: int, base: int) -> tuple[list[str], int]:
+    """lines[i] 以降の '- item' の並び (要素は 1 行のスカラーのみ)"""
+    items: list[str] = []
+    indent = None
+    while i < len(lines):
+        line = lines[i]
+        if _is_blank(line) or _is_comment(line):
+            i += 1
+            continue
+        lineno = base + i
+        width = _indent(line, lineno)
+        stripped = line[width:]
+        if indent is None:
+            indent = width
+        if width != indent or not (stripped == "-" or stripped.startswith("- ")):
+            if width > indent:
+                raise FrontmatterError("リスト要素の継続行・ネストは未対応", lineno, width + 1)
+            break
+        item = stripped[1:].lstrip(" ")
+        col = width + 1 + len(stripped) - len(item)
+        if not item or item.startswith("#"):
+            raise FrontmatterError("リストの要素が空", lineno, width + 1)
+        value = _scalar(item, lineno, col)
+        if isinstance(value, list):
+            raise FrontmatterError("ネストしたリストは未対応", lineno, col)
+        items.append(value)
+        i += 1
+    return items, i
+
+
+def _resync(lines: list[str], i: int) -> int:
+    """構文エラーのあったエントリ (lines[i]) の続き (インデント行・空行) を飛ばし、次のトップレベル行の位置を返す"""
+    i += 1
+    while i < len(lines) and (lines[i][:1] in (" ", "\t") or _is_blank(lines[i])):
+        i += 1
+    return i
+
+
+def _parse_entry(
+    lines: list[str], i: int, first_line: int, seen: dict[str, int], warnings: list,
+) -> tuple[str | None, object, int]:
+    """
+    lines[i] から始まる 1 エントリを読み、(キー, 値, 次に読む行) を返す。空行・コメント行はキー None。
+    キー行とその継続行のプレーンな値にある ': ' は warnings に積んで受け付ける (リストの要素はエラー)
+    """
+    n = len(lines)
+    line = lines[i]
+    lineno = first_line + i
+    i += 1
+    if line[:1] in ("", " ", "\t", "#"):
+        if _is_blank(line) or _is_comment(line):
+            return None, None, i
+        width = _indent(line, lineno)
+        raise FrontmatterError("キーに属さないインデントされた行 (ネストしたマッピングは未対応)", lineno, width + 1)
+    sep = line.find(": ")
+    if sep == -1 or "\t" in line or line.find(":") < sep:
+        sep = _key_sep(line)
+    if sep == -1:
+        raise FrontmatterError("'key: value' 形式ではない", lineno, 1)
+    key = line[:sep].rstrip()
+    if not key or key[0] in _RESERVED_KEY_START:
+        raise FrontmatterError(f"キーが不正: '{key}'", lineno, 1)
+    if key in seen:
+        raise FrontmatterError(f"キー '{key}' が重複 ({seen[key]} 行目で定義済み)", lineno, 1)
+    seen[key] = lineno
+
+    text = line[sep + 1:].lstrip(" \t")
+    head = text[:1]
+    if head in ("|", ">"):
+        value, i = _block_scalar(lines, i, first_line, text, len(line) - len(text) + 1)
+    elif head and head != "#":
+        if head in _SPECIAL_HEAD or "#" in text or ":" in text:
+            value = _scalar(text, lineno, len(line) - len(text) + 1, warnings)
+        else:
+            value = text.rstrip()
+        # 次行がインデントされていればプレーンスカラーの続き
+        if i < n and lines[i][:1] in (" ", "\t") and head not in ("\"", "'", "["):
+            value, i = _plain_continuation(lines, i, first_line, value, warnings)
+    else:
+        # 値が次の行から始まる: ブロックシーケンスか、インデントされたプレーンスカラー
+        while i < n and (_is_blank(lines[i]) or _is_comment(lines[i])):
+            i += 1
+        nxt = lines[i] if i < n else ""
+        stripped = nxt.lstrip(" ")
+        if stripped == "-" or stripped.startswith("- "):
+            value, i = _block_list(lines, i, first_line)
+        elif nxt and _indent(nxt, first_line + i):
+            value, i = _plain_continuation(lines, i, first_line, "", warnings)
+            value = value or None
+        else:
+            value = None
+    return key, value, i
+
+
+def _parse_into(
+    result: dict, fm_block: str, first_line: int, errors: list | None = None, warnings: list | None = None,
+) -> None:
+    """
+    フロントマターブロックを先頭から 1 回だけ走査し、キーと値を順に result へ入れる。
+    値は str / list[str]。値が空 (None / "") のキーは入れない。
+    構文エラーは FrontmatterError (行・桁付き)。errors を渡していればそこに追加し、
+    そのエントリ (キー行と続きのインデント行) だけを捨てて次のキーから読み続ける。
+    渡していなければ最初のエラーを送出する (result にはその手前までが入っている)。
+    プレーンな値の中の ': ' はエラーにせず、warnings を渡していればそこに FrontmatterWarning を追加する。
+
+    対応する YAML のサブセット (トップレベルの単純なマッピング):
+      key: plain text            key: "double \"quoted\""      key: 'single ''quoted'''
+      key: [a, "b", c]           key: >  (folded) / |  (literal)  チョンピング -/+、インデント指示子 1-9
+      key:                       key: 次の行に続く
+        - a                        プレーンスカラー (改行は空白に折り畳む)
+        - b
+      # コメント行・行末コメント
+    ネストしたマッピング・アンカー・タグ・フローマッピング・重複キーはエラー。
+    """
+    lines = fm_block.split("\n")
+    seen: dict[str, int] = {}
+    if warnings is None:
+        warnings = []
+    i = 0
+    while i < len(lines):
+        start = i
+        try:
+            key, value, i = _parse_entry(lines, i, first_line, seen, warnings)
+        except FrontmatterError as e:
+            if errors is None:
+                raise
+            errors.append(e)
+            i = _resync(lines, start)
+            continue
+        if value:
+            result[key] = value
+
+
+def _parse_simple(fm_block: str) -> dict | None:
+    """
+    高速パス: 空行以外の全行が 'key: 値' (プレーン・エスケープのないクォート・単純な [a, b]) か、
+    字下げの揃った > / | ブロックの中身であるもの (metadata.md / SKILL.md の大半) を行ごとの
+    正規表現 1 回で読む。コメント・継続行・エスケープ・エラーになりうる値などを含めば
+    None を返して _parse_into に任せる。結果は _parse_into と同じ
+    """
+    result: dict = {}
+    seen: set[str] = set()
+    lines = fm_block.split("\n")
+    n = len(lines)
+    i = 0
+    while i < n:
+        line = lines[i]
+        i += 1
+        if not line:
+            continue
+        m = _SIMPLE_LINE.fullmatch(line)
+        if m is None:
+            return None
+        key, value = m.groups()
+        if key in seen:
+            return None
+        seen.add(key)
+        head = value[:1]
+        if head == "[":
+            value = [item.strip() for item in value[1:-1].split(",")] if value != "[]" else []
+            for item in value:
+                if not item or item[0] in _SPECIAL_HEAD:
+                    return None
+        elif head == "'" or head == "\"":
+            value = value[1:-1]
+        elif head == "|" or head == ">":
+            start = i
+            while i < n and lines[i][:1] == " ":
+                i += 1
+            body = lines[start:i]
+            if not body:
+                return None
+            indent = len(body[0]) - len(body[0].lstrip(" "))
+            for line in body:
+                if line[indent:indent + 1] in (" ", "\t", "") or line[:indent].strip():
+                    return None
+            value = (" " if head == ">" else "\n").join([line[indent:] for line in body]) + "\n"
+        elif i < n and lines[i][:1] == " ":
+            return None                 # プレーンスカラーの継続行
+        if value:
+            result[key] = value
+    return result
+
+
+def fast_path_mismatch(fm_block: str) -> str | None:
+    """
+    _parse_simple と _parse_into の結果の食い違い (2 つの文法がずれていないかの自己診断用)。
+    高速パスが読まないブロック、または結果が一致すれば None
+    """
+    fast = _parse_simple(fm_block)
+    if fast is None:
+        return None
+    full: dict = {}
+    problems: list[FrontmatterError] = []
+    _parse_into(full, fm_block, 1, problems, problems)
+    if problems:
+        return f"高速パスは受け付けたが完全パーサーでは {problems[0]}"
+    for key in sorted(fast.keys() | full.keys()):
+        if fast.get(key) != full.get(key):
+            return f"{key}: 高速パス {fast.get(key)!r} / 完全パーサー {full.get(key)!r}"
+    return None
+
+
+def parse_frontmatter_block(
+    fm_block: str, first_line: int = 1, errors: list | None = None, warnings: list | None = None,
+) -> dict:
+    """
+    フロントマターブロック (--- を除いた中身) をパースして dict を返す (構文は _parse_into 参照)。
+    値が空のキーは含めない。tags は常に list (未指定なら [])。
+
+    構文エラー時、errors (list) を渡していればそこに FrontmatterError を追加し、
+    エラーのあったキーだけを除いた結果を返す。渡していなければ FrontmatterError を送出する。
+    互換のため受け付けた書き方は warnings (list) に FrontmatterWarning として追加する。
+    """
+    result = _parse_simple(fm_block)
+    if result is None:
+        result = {}
+        _parse_into(result, fm_block, first_line, errors, warnings)
+
+    tags = result.get("tags", [])
+    result["tags"] = parse_list(tags) if isinstance(tags, str) else tags
+    return result
+
+
+def parse_list(raw: str | list[str]) -> list[str]:
+    """YAML inline array [a, b] (パース済みの list を含む) または カンマ区切り 両対応"""
+    if isinstance(raw, list):
+        return raw
+    raw = raw.strip("[]")
+    return [r.strip() for r in raw.split(",") if r.strip()]
+
+
+# ============================================================
+# ファイル API (ヘッダーのみの有界読み込み)
+# ============================================================
+def _scan_header(f, max_bytes: int) -> bytes:
+    """
+    f の先頭から閉じ --- までを読む (split_frontmatter と同じく、2 行目以降で
+    --- から始まる最初の行が閉じ)。フロントマターがない・閉じが max_bytes 以内に
+    ない場合は b""。閉じ行は先頭 3 バイトまでを含むため、返り値の長さ = 本文の開始位置
+    """
+    first = f.readline(max_bytes)
+    if not first.startswith(b"---"):
+        return b""
+    parts, size = [first], len(first)
+    while size < max_bytes:
+        line = f.readline(max_bytes - size)
+        if not line:
+            return b""
+        if line.startswith(b"---"):
+            parts.append(line[:3])
+            return b"".join(parts)
+        parts.append(line)
+        size += len(line)
+    return b""
+
+
+def _decode(raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    # read_text() と同じ改行の正規化 (\r\n, \r → \n)
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+def read_header(filepath: Path, max_bytes: int = FRONTMATTER_MAX_BYTES) -> bytes:
+    """フロントマター部分 (開き --- から閉じ --- まで) のバイト列だけを読む。なければ b"""""
+    with open(filepath, "rb") as f:
+        return _scan_header(f, max_bytes)
+
+
+def parse_header(header: bytes, errors: list | None = None, warnings: list | None = None) -> dict:
+    """read_header() の結果をパースする (行番号はファイル先頭の --- を 1 行目として数える)"""
+    if not header:
+        return {}
+    text = _decode(header)
+    return parse_frontmatter_block(text[text.index("\n") + 1:-3], first_line=2, errors=errors, warnings=warnings)
+
+
+def parse_frontmatter(filepath: Path) -> dict:
+    """YAML フロントマター (---..---) をパースして dict を返す (本文は読まない)"""
+    try:
+        return parse_header(read_header(filepath))
+    except FileNotFoundError:
+        return {}
+
+
+def read_body(filepath: Path, offset: int | None = None) -> str:
+    """
+    フロントマターを除いた本文を返す。
+    offset (= len(read_header(...))) が分かっていればそこへ seek して本文だけを読む。
+    None ならヘッダーを同じファイルハンドルで読み飛ばしてから続きを読む (ファイルは 1 回だけ開く)。
+    """
+    try:
+        with open(filepath, "rb") as f:
+            if offset is None:
+                offset = len(_scan_header(f, FRONTMATTER_MAX_BYTES))
+            f.seek(offset)
+            raw = f.read()
+    except FileNotFoundError:
+        return ""
+
+    # split_frontmatter と同じく、フロントマターがあれば前後の空白を除き、なければ全文そのまま
+    text = _decode(raw)
+    return text.strip() if offset else text
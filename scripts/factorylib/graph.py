@@ -0,0 +1,161 @@
+# 依存グラフエンジン — SCC 分解・縮約 DAG・最長依存チェーン深さを O(V+E) で計算
+"""
+factorylib.graph — requires: グラフの解析
+
+  graph = DepGraph(catalog.deps())
+  graph.cycles()   # 循環参照ごとのメンバー集合 (SCC) 一覧
+  graph.depths()   # { skill: 依存チェーン深さ }
+
+SCC は Tarjan 法 (反復版、再帰上限なし) で求める。Tarjan は SCC を
+逆トポロジカル順 (依存先が先) に出力するため、その順に 1 回ずつ
+深さを確定させれば縮約 DAG 上の最長パスがメモ化付きで得られる。
+
+深さの定義は従来の depth() と同じ:
+  - requires: のないスキル、存在しないスキルへの参照先 → 0
+  - それ以外 → 1 + max(依存先の深さ)
+循環に含まれるスキルは 1 つの SCC (縮約ノード) として扱い、
+SCC 内部の辺は深さに数えない。
+"""
+
+
+class DepGraph:
+    """{ skill: [required_skill, ...] } から構築する有向グラフ"""
+
+    def __init__(self, deps: dict[str, list[str]]):
+        self.deps = deps
+        # requires: 先にしか現れないノード (存在しないスキル) も葉として含める
+        self.nodes: list[str] = list(deps)
+        seen = set(deps)
+        for reqs in deps.values():
+            for req in reqs:
+                if req not in seen:
+                    seen.add(req)
+                    self.nodes.append(req)
+        self._sccs: list[list[str]] | None = None
+        self._scc_of: dict[str, int] = {}
+        self._depths: dict[str, int] | None = None
+
+    # ── SCC (Tarjan) ────────────────────────────────────
+    def sccs(self) -> list[list[str]]:
+        """強連結成分の一覧 (逆トポロジカル順)"""
+        if self._sccs is None:
+            self._sccs = self._tarjan()
+            self._scc_of = {n: i for i, comp in enumerate(self._sccs) for n in comp}
+        return self._sccs
+
+    def _tarjan(self) -> list[list[str]]:
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        result: list[list[str]] = []
+
+        for root in self.nodes:
+            if root in index:
+                continue
+            # (node, 次に見る子のインデックス) の明示スタックで DFS
+            work = [(root, 0)]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, i = work[-1]
+                children = self.deps.get(node, [])
+                if i < len(children):
+                    work[-1] = (node, i + 1)
+                    child = children[i]
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, 0))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    comp = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        comp.append(member)
+                        if member == node:
+                            break
+                    result.append(comp)
+        return result
+
+    def cycles(self) -> list[list[str]]:
+        """循環参照ごとのメンバー一覧 (ソート済み)。自己参照も 1 件の循環とする"""
+        found = []
+        for comp in self.sccs():
+            if len(comp) > 1 or comp[0] in self.deps.get(comp[0], []):
+                found.append(sorted(comp))
+        return sorted(found)
+
+    # ── 縮約 DAG と深さ ─────────────────────────────────
+    def condensation(self) -> dict[int, set[int]]:
+        """{ SCC 番号: {依存先 SCC 番号, ...} } (SCC 内部の辺は除く)"""
+        self.sccs()
+        dag: dict[int, set[int]] = {i: set() for i in range(len(self._sccs))}
+        for node, reqs in self.deps.items():
+            src = self._scc_of[node]
+            for req in reqs:
+                dst = self._scc_of[req]
+                if dst != src:
+                    dag[src].add(dst)
+        return dag
+
+    def depths(self) -> dict[str, int]:
+        """全ノードの依存チェーン深さ (縮約 DAG 上の最長パス、メモ化)"""
+        if self._depths is None:
+            dag = self.condensation()
+            scc_depth: list[int] = []
+            # 逆トポロジカル順なので依存先 SCC の深さは常に確定済み
+            for i in range(len(self._sccs)):
+                scc_depth.append(max((1 + scc_depth[j] for j in dag[i]), default=0))
+            self._depths = {n: scc_depth[self._scc_of[n]] for n in self.nodes}
+        return self._depths
+
+    def dependents_bits(self) -> list[int]:
+        """
+        推移的な逆依存 (このノードを直接・間接に requires している全ノード) を
+        self.nodes のインデックス上のビットセット (int) で返す。
+
+        Tarjan の出力順を逆にたどる (requires する側が先) ことで、各 SCC は
+        親 SCC の結果を OR するだけで確定する。計算量は O((V+E) · V/64)。
+        """
+        self.sccs()
+        pos = {n: i for i, n in enumerate(self.nodes)}
+        rev = self.reverse()
+        scc_bits = [0] * len(self._sccs)
+        for c in range(len(self._sccs) - 1, -1, -1):
+            comp = self._sccs[c]
+            bits = 0
+            for member in comp:
+                for parent in rev[member]:
+                    bits |= (1 << pos[parent]) | scc_bits[self._scc_of[parent]]
+            scc_bits[c] = bits
+        return [scc_bits[self._scc_of[n]] for n in self.nodes]
+
+    def dependents_of(self, names) -> set[str]:
+        """names を直接・間接に requires している全ノード (names 自身は除く)。少数の照会向け BFS"""
+        rev = self.reverse()
+        found: set[str] = set()
+        queue = [n for n in names if n in rev]
+        while queue:
+            for parent in rev[queue.pop()]:
+                if parent not in found:
+                    found.add(parent)
+                    queue.append(parent)
+        return found - set(names)
+
+    def reverse(self) -> dict[str, list[str]]:
+        """逆依存グラフ: { skill: [このスキルを requires している他スキル, ...] }"""
+        rev: dict[str, list[str]] = {n: [] for n in self.nodes}
+        for skill, reqs in self.deps.items():
+            for req in reqs:
+                rev[req].append(skill)
+        return rev
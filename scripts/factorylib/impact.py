@@ -0,0 +1,99 @@
+# 影響範囲インデックス — requires: の推移的逆依存をビットセットでキャッシュし一括照会
+"""
+factorylib.impact — 「X を変更したら何が壊れるか」のバッチ照会
+
+DepGraph.dependents_bits() で求めた推移閉包を .cache/impact-index.json に保存する。
+キャッシュキーは依存グラフ自体のハッシュなので、requires: が変わらない限り
+カタログのスナップショットが更新されても再計算しない。
+
+  index = load_impact_index(FACTORY_ROOT, DepGraph(deps))
+  index.dependents("devops-code-review")   # → ["devops-...", ...]
+"""
+
+import json
+import os
+from collections.abc import Collection
+from pathlib import Path
+
+from factorylib.cache import CACHE_DIRNAME
+from factorylib.graph import DepGraph
+
+INDEX_NAME   = "impact-index.json"
+INDEX_FORMAT = 1
+
+
+def graph_fingerprint(deps: dict[str, list[str]]) -> str:
+    """依存グラフの内容ハッシュ (キー順・requires 順に依存しない)"""
+    import hashlib
+
+    canonical = json.dumps({k: sorted(v) for k, v in sorted(deps.items())}, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class ImpactIndex:
+    """ノード一覧と、各ノードの推移的逆依存ビットセット"""
+
+    def __init__(self, nodes: list[str], bits: list[int], direct: dict[str, list[str]]):
+        self.nodes = nodes
+        self.bits = dict(zip(nodes, bits))
+        self.direct = direct
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bits
+
+    def dependents(self, name: str) -> list[str]:
+        """name を直接・間接に requires している全スキル (name 自身を除く、ソート済み)"""
+        bits = self.bits.get(name, 0)
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.nodes[low.bit_length() - 1])
+            bits ^= low
+        return sorted(n for n in found if n != name)
+
+    def report(self, targets: list[str], skills: Collection[str]) -> dict:
+        """
+        JSON 出力用の { target: {found, direct, transitive, count} }。
+        found は skills (カタログのスキル名) にあるかどうか。requires: の参照先にしか出てこない
+        名前 (typo など) もグラフのノードにはなるため、ノードかどうかでは判定しない
+        """
+        result = {}
+        for target in targets:
+            transitive = self.dependents(target) if target in self else []
+            result[target] = {
+                "found":      target in skills,
+                "direct":     sorted(self.direct.get(target, [])),
+                "transitive": transitive,
+                "count":      len(transitive),
+            }
+        return result
+
+
+def load_impact_index(root: Path, graph: DepGraph, use_cache: bool = True) -> ImpactIndex:
+    """キャッシュが依存グラフと一致すれば再利用し、なければ計算して保存する"""
+    path = root / CACHE_DIRNAME / INDEX_NAME
+    fingerprint = graph_fingerprint(graph.deps)
+    direct = graph.reverse()
+
+    if use_cache:
+        try:
+            cached = json.loads(path.read_text(encoding="utf-8"))
+            if cached.get("format") == INDEX_FORMAT and cached.get("graph") == fingerprint:
+                bits = [int(b, 16) for b in cached["bits"]]
+                return ImpactIndex(cached["nodes"], bits, direct)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+            pass
+
+    index = ImpactIndex(graph.nodes, graph.dependents_bits(), direct)
+    if use_cache:
+        payload = {
+            "format": INDEX_FORMAT,
+            "graph":  fingerprint,
+            "nodes":  index.nodes,
+            "bits":   [format(index.bits[n], "x") for n in index.nodes],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    return index
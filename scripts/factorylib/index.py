@@ -0,0 +1,257 @@
+# レジストリインデックス — registry.json (コンパクト JSON) と .cache/registry.db (SQLite) の生成・照会
+"""
+factorylib.index — registry.md と同じ asset から機械可読なインデックスを作る
+
+sync-registry.py が registry.md と一緒に registry.json を生成し (コミット対象・--check 対象)、
+フックやエージェントは registry.json から作った SQLite で索引付きの照会を行う。
+
+  index = build_index(assets, catalog.plugins)
+  text  = render_index(index)                          # registry.json の内容
+  conn  = open_index(FACTORY_ROOT)                     # 必要なら .cache/registry.db を再構築
+  rows  = query(conn, tags=["review"], model="sonnet")
+
+SQLite のスキーマ (.cache/registry.db、registry.json の sha256 が変わったときだけ作り直す):
+  assets(id, name, type, plugin, category, model, version, description, file_path)
+  tags(tag, asset_id, position)           主キー (tag, asset_id)  — タグ → asset の索引
+  requires(asset_id, required)            required に索引          — 逆依存の照会用
+  teams(team, plugin, position, member)   member に索引            — 所属チームの照会用
+  meta(key, value)                        source_sha256 / format
+assets には (type, name) の一意索引と (model, type)・plugin の索引を張る。
+sqlite3 / hashlib は import コストが大きいため、DB を実際に使うときに読み込む。
+"""
+
+import json
+import os
+from pathlib import Path
+
+from factorylib.cache import CACHE_DIRNAME
+from factorylib.frontmatter import parse_list
+from factorylib.profile import count_read
+
+INDEX_NAME   = "registry.json"
+DB_NAME      = "registry.db"
+INDEX_FORMAT = 1
+
+# registry.json に載せる asset のキー (順序もこのとおり)
+ASSET_KEYS = ("name", "type", "plugin", "category", "model", "version", "description", "file_path", "tags", "requires")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE assets (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    plugin      TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    version     TEXT NOT NULL,
+    description TEXT NOT NULL,
+    file_path   TEXT NOT NULL,
+    UNIQUE (type, name)
+);
+CREATE INDEX assets_model  ON assets (model, type);
+CREATE INDEX assets_plugin ON assets (plugin);
+CREATE TABLE tags (
+    tag      TEXT NOT NULL,
+    asset_id INTEGER NOT NULL REFERENCES assets (id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (tag, asset_id)
+) WITHOUT ROWID;
+CREATE TABLE requires (
+    asset_id INTEGER NOT NULL REFERENCES assets (id),
+    required TEXT NOT NULL,
+    PRIMARY KEY (asset_id, required)
+) WITHOUT ROWID;
+CREATE INDEX requires_required ON requires (required);
+CREATE TABLE teams (
+    team     TEXT NOT NULL,
+    plugin   TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    member   TEXT NOT NULL,
+    PRIMARY KEY (team, plugin, position)
+) WITHOUT ROWID;
+CREATE INDEX teams_member ON teams (member);
+"""
+
+
+# ============================================================
+# registry.json
+# ============================================================
+def build_index(assets: list[dict], plugins) -> dict:
+    """
+    sync-registry.py の asset dict と PluginInfo 一覧からインデックスを作る。
+    実行日などは含めず、入力が同じなら常に同じ内容になる (--check で差分を検出するため)
+    """
+    entries = []
+    for a in assets:
+        entry = {key: a.get(key, "") for key in ASSET_KEYS}
+        entry["tags"] = list(a.get("tags") or [])
+        entry["requires"] = parse_list(a.get("requires") or "")
+        entries.append(entry)
+    teams = [
+        {"team": team, "plugin": plugin.name, "members": list(members)}
+        for plugin in plugins
+        for team, members in sorted(plugin.teams.items())
+    ]
+    return {"format": INDEX_FORMAT, "assets": entries, "teams": teams}
+
+
+def render_index(index: dict) -> str:
+    """区切りの空白を省いたコンパクト JSON。git の差分が読めるよう asset / team は 1 行 1 件"""
+    def dump(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def rows(items: list) -> str:
+        return "[\n" + ",\n".join(dump(item) for item in items) + "\n]" if items else "[]"
+
+    return (f'{{"format":{index["format"]},\n"assets":{rows(index["assets"])},\n'
+            f'"teams":{rows(index["teams"])}}}\n')
+
+
+# ============================================================
+# SQLite
+# ============================================================
+def db_path(root: Path) -> Path:
+    return root / CACHE_DIRNAME / DB_NAME
+
+
+def read_source(root: Path) -> tuple[bytes, str] | None:
+    """(registry.json の内容, その sha256)。なければ None (派生する索引の鮮度確認に使う)"""
+    import hashlib
+
+    source = root / INDEX_NAME
+    if not source.exists():
+        return None
+    raw = source.read_bytes()
+    count_read(len(raw))
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def _stored_digest(path: Path) -> str | None:
+    import sqlite3
+
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source_sha256'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return None     # 壊れている・スキーマが古い → 作り直す
+    return row[0] if row else None
+
+
+def write_db(index: dict, path: Path, source_digest: str) -> None:
+    """index から DB を一時ファイルに作り、完成後に置き換える (照会中のプロセスは旧 DB を読み続ける)"""
+    import sqlite3
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [("format", str(INDEX_FORMAT)), ("source_sha256", source_digest)])
+        for asset_id, a in enumerate(index["assets"], 1):
+            conn.execute(
+                "INSERT OR IGNORE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (asset_id, a["name"], a["type"], a["plugin"], a["category"], a["model"],
+                 a["version"], a["description"], a["file_path"]),
+            )
+            conn.executemany("INSERT OR IGNORE INTO tags VALUES (?, ?, ?)",
+                             [(tag, asset_id, pos) for pos, tag in enumerate(a["tags"])])
+            conn.executemany("INSERT OR IGNORE INTO requires VALUES (?, ?)",
+                             [(asset_id, req) for req in a["requires"]])
+        conn.executemany(
+            "INSERT OR IGNORE INTO teams VALUES (?, ?, ?, ?)",
+            [(t["team"], t["plugin"], pos, member)
+             for t in index["teams"] for pos, member in enumerate(t["members"])],
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+def ensure_db(root: Path, check: bool = False) -> bool | None:
+    """
+    root/registry.json から .cache/registry.db を作り直す (内容が同じなら何もしない)。
+    再構築したら True、最新なら False、registry.json がなければ None。check=True なら判定のみ
+    """
+    source = read_source(root)
+    if source is None:
+        return None
+    raw, digest = source
+    path = db_path(root)
+    if _stored_digest(path) == digest:
+        return False
+    if not check:
+        write_db(json.loads(raw), path, digest)
+    return True
+
+
+def open_index(root: Path):
+    """照会用の接続 (読み取り専用)。DB が古ければ先に registry.json から作り直す。なければ FileNotFoundError"""
+    import sqlite3
+
+    if ensure_db(root) is None:
+        raise FileNotFoundError(f"{INDEX_NAME} がない — 'make sync' で生成してください")
+    conn = sqlite3.connect(f"file:{db_path(root)}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+# ============================================================
+# 照会
+# ============================================================
+def query(
+    conn,
+    tags: list[str] | None = None,
+    model: str | None = None,
+    plugin: str | None = None,
+    asset_type: str | None = None,
+    requires: str | None = None,
+    team: str | None = None,
+) -> list[dict]:
+    """
+    条件をすべて満たす asset を registry.json の並び順で返す (tags は全タグを含むもの)。
+    各条件は索引で引く: タグは tags の主キー、model は assets_model、requires / team は各索引
+    """
+    joins, where, params = [], [], []
+    for i, tag in enumerate(tags or []):
+        joins.append(f"JOIN tags t{i} ON t{i}.asset_id = a.id AND t{i}.tag = ?")
+        params.append(tag)
+    if requires:
+        joins.append("JOIN requires r ON r.asset_id = a.id AND r.required = ?")
+        params.append(requires)
+    for column, value in (("model", model), ("type", asset_type), ("plugin", plugin)):
+        if value:
+            where.append(f"a.{column} = ?")
+            params.append(value)
+    if team:
+        where.append("a.name IN (SELECT member FROM teams WHERE team = ?)")
+        params.append(team)
+
+    sql = "SELECT a.* FROM assets a " + " ".join(joins)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    rows = [dict(row) for row in conn.execute(sql + " ORDER BY a.id", params)]
+    if not rows:
+        return []
+
+    # タグ・requires は一致した asset の分だけまとめて引く
+    by_id = {row["id"]: {**row, "tags": [], "requires": []} for row in rows}
+    marks = ",".join("?" * len(by_id))
+    for asset_id, tag in conn.execute(
+        f"SELECT asset_id, tag FROM tags WHERE asset_id IN ({marks}) ORDER BY asset_id, position", list(by_id)
+    ):
+        by_id[asset_id]["tags"].append(tag)
+    for asset_id, required in conn.execute(
+        f"SELECT asset_id, required FROM requires WHERE asset_id IN ({marks})", list(by_id)
+    ):
+        by_id[asset_id]["requires"].append(required)
+    return [{key: entry[key] for key in ASSET_KEYS} for entry in by_id.values()]
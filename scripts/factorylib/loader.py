@@ -0,0 +1,28 @@
+# スクリプトローダー — ハイフン付きの scripts/*.py を同一プロセス内でモジュールとして読み込む
+"""
+factorylib.loader — lint-skills.py / sync-registry.py / dep-graph.py の関数を再利用する
+
+  lint = load_script("lint-skills")     # sys.modules["lint_skills"] として 1 回だけ実行
+  lint.check_skill(skill, names)
+
+読み込まれたスクリプトの `if __name__ == "__main__":` ブロックは実行されない。
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_script(name: str) -> ModuleType:
+    """scripts/<name>.py を読み込んで返す (2 回目以降はキャッシュ済みモジュール)"""
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,103 @@
+# マーカーブロックエンジン — 生成ドキュメントを 1 回だけ分割し、全 SYNC ブロックを一括置換
+"""
+factorylib.markers — <!-- SYNC:NAME_START --> ~ <!-- SYNC:NAME_END --> ブロックの置換
+
+ドキュメントを 1 回の走査で「静的セグメント」と「SYNC ブロック」に分割し、
+レンダリング済みのブロックを 1 パスで差し込む。
+
+  doc  = parse_markers(text)
+  old  = doc.block("STATISTICS")                # 既存ブロックの中身
+  text = doc.render({"STATISTICS": stats, ...})  # 全ブロックを一括置換
+
+マーカーの不整合 (閉じ忘れ・重複・入れ子・対応しない END・
+レンダリング対象のマーカー欠落) は MarkerError にまとめて報告する。
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from factorylib.profile import count_regex
+
+MARKER_RE = re.compile(r"<!-- SYNC:([A-Z][A-Z0-9_]*?)_(START|END) -->")
+
+
+class MarkerError(Exception):
+    """SYNC マーカーの不整合。problems に行番号付きの問題一覧を持つ"""
+
+    def __init__(self, problems: list[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+@dataclass
+class MarkerDocument:
+    """静的セグメント (str) とブロック名 (_BlockRef) の列"""
+    segments: list = field(default_factory=list)
+    blocks: dict[str, str] = field(default_factory=dict)
+
+    def block(self, name: str) -> str | None:
+        """ブロックの中身 (マーカー直後・直前の改行を除く)。なければ None"""
+        if name not in self.blocks:
+            return None
+        content = self.blocks[name]
+        return content[1:-1] if content.startswith("\n") and content.endswith("\n") else content.strip("\n")
+
+    def render(self, rendered: dict[str, str]) -> str:
+        """rendered の各ブロックを差し込んだテキストを返す。未指定ブロックは元の内容のまま"""
+        missing = sorted(set(rendered) - set(self.blocks))
+        if missing:
+            raise MarkerError([f"<!-- SYNC:{name}_START/END --> マーカーがない" for name in missing])
+
+        parts = []
+        for seg in self.segments:
+            if isinstance(seg, _BlockRef):
+                parts.append(f"\n{rendered[seg.name]}\n" if seg.name in rendered else self.blocks[seg.name])
+            else:
+                parts.append(seg)
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class _BlockRef:
+    name: str
+
+
+def parse_markers(text: str) -> MarkerDocument:
+    """text を 1 回走査して MarkerDocument を返す。不整合があれば MarkerError"""
+    doc = MarkerDocument()
+    problems: list[str] = []
+    pos = 0                          # 次の静的セグメントの開始位置
+    open_name, open_line, content_start = None, 0, 0
+    line, line_pos = 1, 0            # 行番号をマーカー位置まで差分で進める
+
+    count_regex()                    # finditer の最後の (一致しない) 探索
+    for m in MARKER_RE.finditer(text):
+        count_regex()
+        line += text.count("\n", line_pos, m.start())
+        line_pos = m.start()
+        name, kind = m.group(1), m.group(2)
+
+        if kind == "START":
+            if open_name is not None:
+                problems.append(f"{line} 行: SYNC:{name}_START — {open_line} 行の SYNC:{open_name} が閉じられていない")
+                continue
+            open_name, open_line, content_start = name, line, m.end()
+            continue
+
+        if open_name != name:
+            problems.append(f"{line} 行: SYNC:{name}_END に対応する START がない")
+            continue
+        if name in doc.blocks:
+            problems.append(f"{line} 行: SYNC:{name} ブロックが重複している")
+        doc.segments.append(text[pos:content_start])
+        doc.segments.append(_BlockRef(name))
+        doc.blocks[name] = text[content_start:m.start()]
+        pos, open_name = m.start(), None
+
+    if open_name is not None:
+        problems.append(f"{open_line} 行: SYNC:{open_name}_START が閉じられていない")
+    if problems:
+        raise MarkerError(problems)
+
+    doc.segments.append(text[pos:])
+    return doc
@@ -0,0 +1,58 @@
+# 並列実行ヘルパー — チェック処理をプロセスプールに分散し、入力順のまま結果を返す
+"""
+factorylib.parallel — --jobs N によるプロセス並列
+
+  for result in map_ordered(fn, items, jobs, initializer, initargs): ...
+
+jobs <= 1 の場合は同一プロセスで逐次実行する (従来と同じ挙動)。
+fn / initializer はモジュールのトップレベル関数であること (pickle のため)。
+multiprocessing / concurrent.futures は重いので、実際に並列実行するときだけ import する。
+"""
+
+import os
+from collections.abc import Callable, Iterator
+
+
+def parse_jobs(argv: list[str]) -> int:
+    """--jobs N / -j N を解釈する。0 は CPU 数、未指定は 1 (逐次)"""
+    for flag in ("--jobs", "-j"):
+        if flag in argv:
+            idx = argv.index(flag)
+            value = argv[idx + 1] if idx + 1 < len(argv) else ""
+            if not value.isdigit():
+                raise SystemExit(f"使い方: {flag} <N> (N は 0 以上の整数、0 = CPU 数)")
+            return int(value) or (os.cpu_count() or 1)
+    return 1
+
+
+def _mp_context():
+    import multiprocessing
+
+    # fork が使える環境ではワーカー起動時のモジュール再 import を避ける
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def map_ordered(
+    fn: Callable,
+    items: list,
+    jobs: int,
+    initializer: Callable | None = None,
+    initargs: tuple = (),
+) -> Iterator:
+    """items に fn を適用した結果を入力順に yield する"""
+    if jobs <= 1 or len(items) < 2:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(fn, items)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(items))
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=_mp_context(), initializer=initializer, initargs=initargs,
+    ) as pool:
+        yield from pool.map(fn, items, chunksize=chunksize)
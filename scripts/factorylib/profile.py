@@ -0,0 +1,202 @@
+# フェーズ別プロファイラー — --profile 指定時に時間・読み込み量・正規表現評価数・ピークメモリを記録
+"""
+factorylib.profile — --profile / --profile-trace FILE によるフェーズ別計測
+
+  @profiled                        # main を包む: --profile なら集計表を表示
+  def main(): ...
+
+  with phase("lint.skills"):       # 計測単位 (入れ子可、無効時はほぼコストなし)
+      ...
+  count_read(len(raw))             # ファイルを読んだ箇所で呼ぶ
+  count_regex(n)                   # 正規表現を評価した箇所で呼ぶ
+
+記録する値 (フェーズごと):
+  wall    — perf_counter による経過時間
+  files / bytes — count_read() の呼び出し数と合計バイト数
+  regex   — count_regex() で報告された評価回数
+  peak    — tracemalloc による Python ヒープのピーク (計測中は処理が遅くなる)
+
+集計表とトレースの案内は stderr に出す (--format ndjson / sarif の stdout に混ざらない)。
+--profile-trace FILE は Chrome trace-event 形式 (chrome://tracing / Perfetto で開ける) も書き出す。
+factory.py validate から呼ばれた lint / sync / dep-graph は外側のセッションに合流し、
+そのフェーズは validate の各フェーズの子として記録される。
+カウンターは同一プロセス内のみ (--jobs N のワーカーでの読み込み・評価は数えない)。
+"""
+
+import functools
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+# 常に加算する (int の加算だけなので無効時も実質ゼロコスト)。フェーズは開始・終了時の差分を取る
+_FILES = 0
+_BYTES = 0
+_REGEX = 0
+
+BOLD  = "\033[1m"
+DIM   = "\033[2m"
+RESET = "\033[0m"
+
+
+def count_read(nbytes: int) -> None:
+    global _FILES, _BYTES
+    _FILES += 1
+    _BYTES += nbytes
+
+
+def count_regex(n: int = 1) -> None:
+    global _REGEX
+    _REGEX += n
+
+
+@dataclass
+class PhaseRecord:
+    name: str
+    depth: int
+    start: float            # セッション開始からの秒数
+    wall: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    regex: int = 0
+    peak: int = 0           # bytes (tracemalloc)
+
+
+class Session:
+    """1 回の実行分のフェーズ記録"""
+
+    def __init__(self):
+        import time
+        import tracemalloc
+
+        self._clock = time.perf_counter
+        self._tracemalloc = tracemalloc
+        self.origin = self._clock()
+        self.records: list[PhaseRecord] = []
+        self._open: list[PhaseRecord] = []
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def close(self) -> None:
+        if self._started_tracing:
+            self._tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str):
+        tm = self._tracemalloc
+        # 親フェーズのピークをここまでの値で確定してから、子の計測用にリセットする
+        peak_before = tm.get_traced_memory()[1]
+        for parent in self._open:
+            parent.peak = max(parent.peak, peak_before)
+        tm.reset_peak()
+
+        record = PhaseRecord(name, len(self._open), self._clock() - self.origin)
+        counters = (_FILES, _BYTES, _REGEX)
+        self.records.append(record)
+        self._open.append(record)
+        try:
+            yield record
+        finally:
+            record.wall = self._clock() - self.origin - record.start
+            record.files, record.bytes, record.regex = (
+                now - before for now, before in zip((_FILES, _BYTES, _REGEX), counters)
+            )
+            record.peak = max(record.peak, tm.get_traced_memory()[1])
+            self._open.pop()
+            for parent in self._open:
+                parent.peak = max(parent.peak, record.peak)
+            tm.reset_peak()
+
+    # ── 出力 ──────────────────────────────────────────────
+    def print_summary(self) -> None:
+        out = sys.stderr
+        top_total = sum(r.wall for r in self.records if r.depth == 0) or 1e-9
+        print(file=out)
+        print(f"{BOLD}⏱  プロファイル (フェーズ別){RESET}", file=out)
+        print(file=out)
+        print(f"   {'phase':<34} {'wall ms':>9} {'%':>6} {'files':>7} {'read KB':>9} {'regex':>9} {'peak MB':>8}",
+              file=out)
+        for r in self.records:
+            name = "  " * r.depth + r.name
+            print(
+                f"   {name:<34} {r.wall * 1000:>9.1f} {r.wall / top_total:>6.1%} {r.files:>7,} "
+                f"{r.bytes / 1024:>9,.1f} {r.regex:>9,} {r.peak / 1024 / 1024:>8.1f}",
+                file=out,
+            )
+        print(f"{DIM}   % はトップレベルフェーズ合計に対する割合。files / regex は同一プロセス内のみ{RESET}",
+              file=out)
+        print(file=out)
+
+    def trace_events(self) -> dict:
+        """Chrome trace-event 形式 (Complete イベント 'X')"""
+        import os
+
+        pid = os.getpid()
+        events = [
+            {
+                "name": r.name,
+                "cat":  r.name.split(".", 1)[0],
+                "ph":   "X",
+                "ts":   round(r.start * 1e6, 1),
+                "dur":  round(r.wall * 1e6, 1),
+                "pid":  pid,
+                "tid":  0,
+                "args": {"files": r.files, "bytes": r.bytes, "regex": r.regex, "peak_bytes": r.peak},
+            }
+            for r in self.records
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str) -> None:
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace_events(), f, ensure_ascii=False)
+        print(f"{DIM}   トレースを書き出し: {path} (chrome://tracing / ui.perfetto.dev で開く){RESET}",
+              file=sys.stderr)
+
+
+_SESSION: Session | None = None
+
+
+@contextmanager
+def _noop():
+    yield None
+
+
+def phase(name: str):
+    """プロファイル中なら name のフェーズを記録するコンテキストマネージャー"""
+    if _SESSION is None:
+        return _noop()
+    return _SESSION.phase(name)
+
+
+def _trace_path(argv: list[str]) -> str | None:
+    if "--profile-trace" not in argv:
+        return None
+    idx = argv.index("--profile-trace")
+    if idx + 1 >= len(argv):
+        raise SystemExit("使い方: --profile-trace <FILE>")
+    return argv[idx + 1]
+
+
+def profiled(main):
+    """sys.argv に --profile / --profile-trace があれば main 全体をセッションとして計測する"""
+    @functools.wraps(main)
+    def wrapper(*args, **kwargs):
+        global _SESSION
+        argv = sys.argv
+        if _SESSION is not None or ("--profile" not in argv and "--profile-trace" not in argv):
+            return main(*args, **kwargs)
+
+        trace_path = _trace_path(argv)
+        _SESSION = session = Session()
+        try:
+            return main(*args, **kwargs)
+        finally:
+            _SESSION = None
+            session.close()
+            session.print_summary()
+            if trace_path:
+                session.write_trace(trace_path)
+    return wrapper
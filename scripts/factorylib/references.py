@@ -0,0 +1,68 @@
+# スキル・エージェント参照リゾルバー — 本文中の `plugin-xxx` 参照を 1 回の走査で抽出・照合
+"""
+factorylib.references — バッククォートで囲まれたスキル/エージェント参照の解決
+
+プレフィックスは実在する plugins/ のディレクトリ名から生成するため、
+新しいプラグイン (vertx-, pm- など) の参照も自動的に検証対象になる。
+
+  resolver = ReferenceResolver.from_catalog(catalog)   # 1 回の lint で 1 回だけ構築
+  resolver.unresolved(agent.body, exclude=agent.stem)  # 存在しない参照の一覧
+
+本文はバッククォート位置を順にたどる 1 パスで走査し、各トークンの先頭を
+プラグイン名のトライで照合する (従来の `((?:devops|figma|project)-[a-z\\-]+)` 相当)。
+"""
+
+from collections.abc import Iterable
+
+_END = ""   # トライの終端キー (プラグイン名の直後に '-' が来れば参照候補)
+
+
+class ReferenceResolver:
+    """プラグイン名トライ + 既知名インデックス"""
+
+    def __init__(self, prefixes: Iterable[str], known_names: Iterable[str]):
+        self.trie: dict = {}
+        for prefix in prefixes:
+            node = self.trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+        self.known = frozenset(known_names)
+
+    @classmethod
+    def from_catalog(cls, catalog) -> "ReferenceResolver":
+        known = catalog.skill_dir_names() | catalog.agent_stems()
+        return cls((p.name for p in catalog.plugins), known)
+
+    def _is_reference(self, token: str) -> bool:
+        """token が '<plugin>-[a-z-]+' 形式か (トライで先頭のプラグイン名を照合)"""
+        node = self.trie
+        for i, ch in enumerate(token):
+            if _END in node and ch == "-":
+                rest = token[i + 1:]
+                if rest and all("a" <= c <= "z" or c == "-" for c in rest):
+                    return True
+            node = node.get(ch)
+            if node is None:
+                return False
+        return False
+
+    def references(self, body: str) -> list[str]:
+        """本文中のバッククォート参照を出現順 (重複なし) で返す"""
+        found: dict[str, None] = {}
+        i = body.find("`")
+        while i != -1:
+            j = body.find("`", i + 1)
+            if j == -1:
+                break
+            token = body[i + 1:j]
+            if self._is_reference(token):
+                found[token] = None
+                i = body.find("`", j + 1)   # 閉じバッククォートは次の開始に使わない
+            else:
+                i = j
+        return list(found)
+
+    def unresolved(self, body: str, exclude: str = "") -> list[str]:
+        """plugins/ のスキルにもエージェントにも存在しない参照 (exclude 自身は除く)"""
+        return [ref for ref in self.references(body) if ref != exclude and ref not in self.known]
@@ -0,0 +1,198 @@
+# ルーティング索引 — トリガーフレーズ・説明文の転置インデックスとプロンプトからの候補スキル検索
+"""
+factorylib.route — registry.json から作る転置インデックスで「このプロンプトはどのスキル/エージェントか」を引く
+
+  index = load_route_index(FACTORY_ROOT)      # .cache/route-index.json (古ければ registry.json から再構築)
+  for c in route(index, "이 코드 리뷰해줘", limit=5):
+      c.name, c.type, c.score, c.phrases
+
+索引の中身 (トークン化は factorylib.triggers):
+  postings        token → [[doc, weight], ...]    トリガー・名前・説明文のトークン
+  phrase_postings token → [phrase, ...]           トリガーフレーズを構成するトークン
+  phrases         [[doc, 表記, トークン数, bonus], ...]
+weight は BM25 の idf × フィールドの重み (トリガー > 名前 > 説明文) を文書長で正規化した値で、
+構築時に計算済み。検索はプロンプトのトークンごとに postings を足し合わせ、
+フレーズの全トークンがプロンプトに揃ったものには bonus を加えるだけなので、
+触るのはプロンプトに含まれるトークンの postings のみ (カタログ全体は走査しない)。
+大規模カタログで全体の多くに現れるトークン (synthetic / task など) は postings ごと落とす。
+
+ファイルは 1 行目がメタ情報 (registry.json の sha256 と構築側ソースのハッシュ)、2 行目が本体の JSON。
+鮮度の確認は 1 行目だけを読んで行う。トークン化・重み付けの実装が変わった場合も作り直す。
+"""
+
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from factorylib.cache import CACHE_DIRNAME
+from factorylib.index import INDEX_NAME, read_source
+from factorylib.profile import count_read
+from factorylib.triggers import extract_triggers, strip_triggers, tokenize
+
+ROUTE_INDEX_NAME   = "route-index.json"
+ROUTE_INDEX_FORMAT = 1
+
+# フィールドの重み (同じトークンが複数のフィールドにあれば大きい方)
+TRIGGER_WEIGHT     = 2.0
+NAME_WEIGHT        = 1.5
+DESCRIPTION_WEIGHT = 1.0
+PHRASE_BONUS       = 1.0    # フレーズが丸ごと一致したとき、そのトークンの idf 合計に掛ける係数
+LENGTH_NORM        = 0.5    # BM25 の b 相当 (0 で文書長を無視)
+
+# 文書の MAX_DF 以上に現れ、かつ MIN_PRUNE_DF 件以上あるトークンは索引に入れない
+MAX_DF       = 0.3
+MIN_PRUNE_DF = 64
+
+
+@dataclass
+class Candidate:
+    name: str
+    type: str
+    plugin: str
+    score: float
+    phrases: list[str] = field(default_factory=list)   # 丸ごと一致したトリガーフレーズ
+
+
+# ============================================================
+# 構築
+# ============================================================
+def _doc_fields(asset: dict) -> tuple[list[tuple[str, list[str]]], dict[str, float]]:
+    """([(トリガーフレーズ, そのトークン)], {token: フィールドの重み})"""
+    description = asset.get("description") or ""
+    phrases = [(phrase, tokenize(phrase)) for phrase in extract_triggers(description)]
+    weights: dict[str, float] = {}
+    for tokens, weight in (
+        (tokenize(strip_triggers(description)), DESCRIPTION_WEIGHT),
+        (tokenize(asset["name"].replace("-", " ")), NAME_WEIGHT),
+        ([t for _, tokens in phrases for t in tokens], TRIGGER_WEIGHT),
+    ):
+        for token in tokens:
+            weights[token] = max(weights.get(token, 0.0), weight)
+    return phrases, weights
+
+
+def build_route_index(index: dict) -> dict:
+    """registry.json の内容 (factorylib.index.build_index の結果) から転置インデックスを作る"""
+    docs, fields = [], []
+    for a in index["assets"]:
+        docs.append([a["name"], a["type"], a["plugin"]])
+        fields.append(_doc_fields(a))
+
+    n = len(docs)
+    df = Counter(token for _, weights in fields for token in weights)
+    pruned = {t for t, count in df.items() if count >= MIN_PRUNE_DF and count > MAX_DF * n}
+    idf = {t: math.log(1 + (n - count + 0.5) / (count + 0.5)) for t, count in df.items() if t not in pruned}
+    avg_len = sum(len(w) for _, w in fields) / n if n else 1.0
+
+    postings: dict[str, list] = {}
+    phrases: list[list] = []
+    phrase_postings: dict[str, list[int]] = {}
+    for doc, (doc_phrases, weights) in enumerate(fields):
+        norm = (1 - LENGTH_NORM) + LENGTH_NORM * len(weights) / (avg_len or 1.0)
+        for token, weight in weights.items():
+            if token in idf:
+                postings.setdefault(token, []).append([doc, round(idf[token] * weight / norm, 4)])
+        for phrase, phrase_tokens in doc_phrases:
+            tokens = sorted({t for t in phrase_tokens if t in idf})
+            if not tokens:
+                continue
+            for token in tokens:
+                phrase_postings.setdefault(token, []).append(len(phrases))
+            bonus = round(PHRASE_BONUS * sum(idf[t] for t in tokens), 4)
+            phrases.append([doc, phrase, len(tokens), bonus])
+
+    return {"docs": docs, "postings": postings, "phrase_postings": phrase_postings, "phrases": phrases}
+
+
+# ============================================================
+# 保存・読み込み
+# ============================================================
+def route_index_path(root: Path) -> Path:
+    return root / CACHE_DIRNAME / ROUTE_INDEX_NAME
+
+
+def _builder_fingerprint() -> str:
+    """索引を作る実装 (このモジュールと factorylib.triggers) のハッシュ"""
+    import hashlib
+
+    from factorylib import triggers
+    src = Path(__file__).read_bytes() + Path(triggers.__file__).read_bytes()
+    return hashlib.sha256(src).hexdigest()[:16]
+
+
+def _stored_digest(path: Path) -> str | None:
+    try:
+        with path.open("rb") as f:
+            meta = json.loads(f.readline())
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if meta.get("format") != ROUTE_INDEX_FORMAT or meta.get("builder") != _builder_fingerprint():
+        return None
+    return meta.get("source_sha256")
+
+
+def write_route_index(route_index: dict, path: Path, source_digest: str) -> None:
+    meta = {"format": ROUTE_INDEX_FORMAT, "source_sha256": source_digest, "builder": _builder_fingerprint()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta) + "\n" + json.dumps(route_index, ensure_ascii=False, separators=(",", ":")),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def ensure_route_index(root: Path, check: bool = False) -> bool | None:
+    """
+    root/registry.json から .cache/route-index.json を作り直す (registry.json が同じなら何もしない)。
+    再構築したら True、最新なら False、registry.json がなければ None。check=True なら判定のみ
+    """
+    source = read_source(root)
+    if source is None:
+        return None
+    raw, digest = source
+    path = route_index_path(root)
+    if _stored_digest(path) == digest:
+        return False
+    if not check:
+        write_route_index(build_route_index(json.loads(raw)), path, digest)
+    return True
+
+
+def load_route_index(root: Path) -> dict:
+    """検索用の索引。古ければ先に再構築する。registry.json がなければ FileNotFoundError"""
+    if ensure_route_index(root) is None:
+        raise FileNotFoundError(f"{INDEX_NAME} がない — 'make sync' で生成してください")
+    raw = route_index_path(root).read_bytes()
+    count_read(len(raw))
+    return json.loads(raw.partition(b"\n")[2])
+
+
+# ============================================================
+# 検索
+# ============================================================
+def route(route_index: dict, prompt: str, limit: int = 5) -> list[Candidate]:
+    """prompt に対する候補をスコアの高い順に最大 limit 件 (スコア 0 は含めない)"""
+    postings, phrase_postings, phrases = route_index["postings"], route_index["phrase_postings"], route_index["phrases"]
+    scores: dict[int, float] = {}
+    hits: dict[int, int] = {}
+    for token in set(tokenize(prompt)):
+        for doc, weight in postings.get(token, ()):
+            scores[doc] = scores.get(doc, 0.0) + weight
+        for pid in phrase_postings.get(token, ()):
+            hits[pid] = hits.get(pid, 0) + 1
+
+    matched: dict[int, list[str]] = {}
+    for pid, count in hits.items():
+        doc, phrase, size, bonus = phrases[pid]
+        if count == size:
+            scores[doc] += bonus
+            matched.setdefault(doc, []).append(phrase)
+
+    docs = route_index["docs"]
+    return [
+        Candidate(*docs[doc], score=round(score, 3), phrases=matched.get(doc, []))
+        for doc, score in heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    ]
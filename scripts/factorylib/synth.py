@@ -0,0 +1,266 @@
+# 合成ファクトリー生成 — ベンチマーク用に任意規模の plugins/ ツリーと生成ドキュメントを作る
+"""
+factorylib.synth — 大規模カタログのベンチマーク用ジェネレーター
+
+  spec = SynthSpec(skills=1000, shape="diamond", fanout=2)
+  generate_factory(Path("/tmp/factory-1k"), spec)
+
+生成物 (実リポジトリと同じ構造):
+  plugins/p000/plugin.json             teams: 付き
+  plugins/p000/skills/<skill>/metadata.md, SKILL.md (+ references/guide.md)
+  plugins/p000/agents/<agent>.md       本文でスキルをバッククォート参照
+  README.md / registry.md / _docs/how-it-works.md   SYNC マーカー付き
+  CLAUDE.md / categories/<plugin>/conventions.md   Doc Drift の走査対象
+
+requires: の形 (shape):
+  random  — 各スキルが直前 window 件から fanout 件をランダムに requires (局所的な DAG)
+  diamond — a→(b, c)→d のダイヤモンドを縦に連結 (素朴なツリー展開が指数的になる形)
+  chain   — i が i-1 を requires する 1 本の深いチェーン (再帰の深さが N になる形)
+  mixed   — 上の 3 つを 1/3 ずつ
+同じ spec と seed からは常に同じツリーが生成される。
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+SHAPES = ("random", "diamond", "chain", "mixed")
+
+
+@dataclass(frozen=True)
+class SynthSpec:
+    skills: int = 100
+    plugins: int = 0            # 0 → skills // 50 (最低 1)
+    agents: int = -1            # -1 → skills // 10 (最低 1)
+    shape: str = "random"
+    fanout: int = 2             # random 形の requires 数
+    window: int = 50            # random 形で requires 先を選ぶ範囲
+    resource_kb: int = 0        # > 0 なら resource_every 件ごとに references/guide.md を付ける
+    resource_every: int = 10
+    seed: int = 1
+
+    @property
+    def plugin_count(self) -> int:
+        return self.plugins or max(1, self.skills // 50)
+
+    @property
+    def agent_count(self) -> int:
+        return self.agents if self.agents >= 0 else max(1, self.skills // 10)
+
+
+def skill_name(i: int) -> str:
+    return f"synth-skill-{i:05d}"
+
+
+# ============================================================
+# requires: グラフ
+# ============================================================
+def _random_requires(indices: range, spec: SynthSpec, rng: random.Random) -> dict[int, list[int]]:
+    deps = {}
+    for i in indices:
+        pool = range(max(indices.start, i - spec.window), i)
+        deps[i] = sorted(rng.sample(pool, min(spec.fanout, len(pool))))
+    return deps
+
+
+def _diamond_requires(indices: range) -> dict[int, list[int]]:
+    # 4 件 1 組: top → (left, right) → bottom → 次の組の top
+    deps = {}
+    for i in indices:
+        offset = (i - indices.start) % 4
+        if offset == 0:
+            deps[i] = [i + 1, i + 2] if i + 2 < indices.stop else []
+        elif offset in (1, 2):
+            deps[i] = [i + (3 - offset)] if i + (3 - offset) < indices.stop else []
+        else:
+            deps[i] = [i + 1] if i + 1 < indices.stop else []
+    return deps
+
+
+def _chain_requires(indices: range) -> dict[int, list[int]]:
+    return {i: ([i - 1] if i > indices.start else []) for i in indices}
+
+
+def build_requires(spec: SynthSpec) -> dict[int, list[int]]:
+    """{ スキル番号: [requires 先の番号, ...] }"""
+    if spec.shape not in SHAPES:
+        raise ValueError(f"shape は {', '.join(SHAPES)} のいずれか: {spec.shape}")
+    rng = random.Random(spec.seed)
+    n = spec.skills
+    if spec.shape == "random":
+        return _random_requires(range(n), spec, rng)
+    if spec.shape == "diamond":
+        return _diamond_requires(range(n))
+    if spec.shape == "chain":
+        return _chain_requires(range(n))
+    third = n // 3
+    deps = _random_requires(range(0, third), spec, rng)
+    deps.update(_diamond_requires(range(third, 2 * third)))
+    deps.update(_chain_requires(range(2 * third, n)))
+    return deps
+
+
+# ============================================================
+# ファイル生成
+# ============================================================
+_TAGS = ["review", "code", "quality", "design", "tokens", "api", "docs", "test", "infra", "ui"]
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _skill_files(i: int, plugin: str, requires: list[int], spec: SynthSpec) -> dict[str, str]:
+    name = skill_name(i)
+    tags = ", ".join(_TAGS[(i + k) % len(_TAGS)] for k in range(3))
+    req_line = f"requires: [{', '.join(skill_name(r) for r in requires)}]\n" if requires else ""
+    use_when = (
+        f"Use when the user asks for synthetic task {i} in {plugin}. "
+        f'Triggers: "task {i}", "synth {plugin} {i % 97}", "합성 작업 {i}"'
+    )
+    metadata = (
+        f"---\nname: {name}\ncategory: {plugin}\ntags: [{tags}]\nmodel: sonnet\n"
+        f"version: v1.0\nuse-when: >\n  {use_when}\n{req_line}---\n"
+    )
+    refs = "".join(f"- `{skill_name(r)}` の結果を使う\n" for r in requires)
+    body = (
+        f"---\nname: {name}\ndescription: '{use_when}'\n{req_line}---\n\n"
+        f"# {name}\n\n## Step 1 — 入力確認\n\nRead: project-context/input.md\n\n"
+        f"## Step 2 — 実行\n\n{refs}\n### 1. 出力\n\n"
+        + ("Synthetic filler line for body parsing and regex scanning.\n" * 20)
+    )
+    files = {"metadata.md": metadata, "SKILL.md": body}
+    if spec.resource_kb > 0 and i % spec.resource_every == 0:
+        line = "Large reference material line used to exercise resource handling.\n"
+        files["references/guide.md"] = line * max(1, spec.resource_kb * 1024 // len(line))
+    return files
+
+
+def _agent_text(j: int, plugin: str, skill_ids: list[int]) -> str:
+    calls = "".join(f"{k + 1}. `{skill_name(s)}` を呼び出す\n" for k, s in enumerate(skill_ids))
+    return (
+        f"---\nname: {plugin}-agent-{j:04d}\n"
+        f"description: Synthetic orchestrator {j} for {plugin}. Use for pipeline runs.\n"
+        f"tools: Read, Grep, Glob\nmodel: sonnet\n---\n\n# Agent {j}\n\n## 手順\n\n{calls}"
+    )
+
+
+_README = """# Synthetic Factory
+
+## Teams
+
+<!-- SYNC:TEAMS_TABLE_START -->
+<!-- SYNC:TEAMS_TABLE_END -->
+
+## Current Skills & Agents
+
+<!-- SYNC:CURRENT_ASSETS_START -->
+<!-- SYNC:CURRENT_ASSETS_END -->
+"""
+
+_REGISTRY = """# Registry
+
+<!-- SYNC:REGISTRY_TABLE_START -->
+<!-- SYNC:REGISTRY_TABLE_END -->
+
+## Statistics
+
+<!-- SYNC:STATISTICS_START -->
+<!-- SYNC:STATISTICS_END -->
+"""
+
+_HOW_IT_WORKS = """# How it works
+
+<!-- SYNC:AGENT_SUMMARY_START -->
+<!-- SYNC:AGENT_SUMMARY_END -->
+
+<!-- SYNC:SKILL_SUMMARY_START -->
+<!-- SYNC:SKILL_SUMMARY_END -->
+
+<!-- SYNC:TEAM_COUNT_START -->
+<!-- SYNC:TEAM_COUNT_END -->
+
+<!-- SYNC:TEAM_TABLE_START -->
+<!-- SYNC:TEAM_TABLE_END -->
+"""
+
+
+def generate_factory(root: Path, spec: SynthSpec) -> dict:
+    """root に合成ファクトリーを生成し、生成件数のサマリーを返す"""
+    requires = build_requires(spec)
+    plugins = [f"p{k:03d}" for k in range(spec.plugin_count)]
+    per_plugin = -(-spec.skills // len(plugins))
+    plugin_of = {i: plugins[min(i // per_plugin, len(plugins) - 1)] for i in range(spec.skills)}
+    rng = random.Random(spec.seed + 1)
+
+    for i in range(spec.skills):
+        skill_dir = root / "plugins" / plugin_of[i] / "skills" / skill_name(i)
+        for rel, text in _skill_files(i, plugin_of[i], requires[i], spec).items():
+            _write(skill_dir / rel, text)
+
+    for j in range(spec.agent_count):
+        plugin = plugins[j % len(plugins)]
+        calls = sorted(rng.sample(range(spec.skills), min(5, spec.skills)))
+        _write(root / "plugins" / plugin / "agents" / f"{plugin}-agent-{j:04d}.md", _agent_text(j, plugin, calls))
+
+    for k, plugin in enumerate(plugins):
+        members = [skill_name(i) for i in range(spec.skills) if plugin_of[i] == plugin][:8]
+        manifest = {"name": plugin, "version": "1.0.0", "teams": {f"team-{k % 5}": members}}
+        _write(root / "plugins" / plugin / "plugin.json", json.dumps(manifest, indent=2) + "\n")
+        _write(root / "categories" / plugin / "conventions.md",
+               "".join(f"- rule {n}: follow plugins/*/skills/*/ layout\n" for n in range(50)))
+
+    _write(root / "README.md", _README)
+    _write(root / "registry.md", _REGISTRY)
+    _write(root / "_docs" / "how-it-works.md", _HOW_IT_WORKS)
+    _write(root / "CLAUDE.md", "# Synthetic CLAUDE.md\n\nRoute directly via plugins/*/agents/.\n")
+
+    return {
+        "skills":  spec.skills,
+        "plugins": len(plugins),
+        "agents":  spec.agent_count,
+        "edges":   sum(len(r) for r in requires.values()),
+    }
+
+
+# ============================================================
+# フロントマターの境界ケース
+# ============================================================
+# 高速パス (frontmatter._parse_simple) がそのまま読める値と、受け付けるかどうかの境目にある値・行
+_FM_KEYS = ["name", "tags", "a.b", "x_1", "use-when", "description", "k", "9k", "_u"]
+_FM_SIMPLE = ["plain text", "v1.0", "http://x", "x?", "a, b", "漢字 テスト", "'q'", "'it''s'", '"d"', "'a\"b'",
+              "[a, b]", "[ a ]", "[]", "[a,b, c]", ">", "|", "a-b", "x  "]
+_FM_EDGE = [
+    "a: b", "a:b", "x # c", "x#y", '"e\\n"', "[a, 'b']", "[a,,b]", "[a, -b]", "[a, b,]", "[a]]", "- x", "@x",
+    "  spaced  ", "", ">-", "|+", ">2", "[a, b] x", "'a' b", '"a" # c', "a\tb", "?x", "-x", "%x", "{a}", "a ]",
+    "'", '"', "a\\b", '"a\'b"', "a !x", "a&b", "a*b", "x,", "~",
+]
+_FM_BODY = ["  line one", "  line two: x", "  three # x", "  'q'", "  - item", ""]
+_FM_EDGE_LINES = ["    deeper", "  # hash", "\tTab", " one", "   ", "  \t", "  x\ty", "# c", "key", "-", " x: y"]
+_FM_SEPS = [" ", " ", " ", " ", "  ", "", "\t"]
+
+
+def frontmatter_blocks(count: int, seed: int = 0) -> list[str]:
+    """
+    フロントマターパーサーの自己診断用に、高速パスの境界を突くブロックを count 件生成する。
+    大半は高速パスで読める 'key: 値' とブロックスカラーで、境界の値・継続行・不正な行を混ぜる
+    (同じ seed なら同じ結果)
+    """
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(count):
+        lines = []
+        for _ in range(rng.randint(1, 5)):
+            r = rng.random()
+            if r < 0.9:
+                value = rng.choice(_FM_SIMPLE if rng.random() < 0.8 else _FM_EDGE)
+                sep = " " if rng.random() < 0.9 else rng.choice(_FM_SEPS)
+                lines.append(f"{rng.choice(_FM_KEYS)}:{sep}{value}")
+                if value in (">", "|"):
+                    lines += rng.choices(_FM_BODY, k=rng.randint(0, 3))
+            else:
+                lines.append(rng.choice(_FM_EDGE_LINES))
+        blocks.append("\n".join(lines) + rng.choice(["", "\n"]))
+    return blocks
@@ -0,0 +1,70 @@
+# トリガー語の抽出・正規化 — use-when / description の引用フレーズと多言語トークン化 (CJK は文字 bigram)
+"""
+factorylib.triggers — ルーティング用のテキスト処理
+
+use-when: / description: には 'Triggers: "코드 리뷰", "review this", "バグチェック"' の形で
+日本語・韓国語・英語のトリガーフレーズが埋め込まれている。
+
+  extract_triggers(text)   → ["코드 리뷰", "review this", "バグチェック"]   (引用符内のフレーズ)
+  strip_triggers(text)     → 引用フレーズを除いた説明文
+  tokenize("バグチェックして") → ["バグ", "グチ", "チェ", "ェッ", "ック", "クし", "して"]
+
+正規化は NFKC + casefold (全角英数・半角カナを揃える)。
+英数字は単語単位 (短い語・ストップワードを除き、複数形の s を落とす)、
+分かち書きのない日本語・韓国語は文字種の連続ごとに文字 bigram にする (1 文字ならそのまま)。
+韓国語の助詞 (코드를 → 코드 / 드를) もこれで吸収できる。
+"""
+
+import re
+import unicodedata
+
+# 引用符の組: "…" / “…” / 「…」 / 『…』
+_QUOTED = re.compile(r'"([^"\n]+)"|“([^”\n]+)”|「([^」\n]+)」|『([^』\n]+)』')
+# 英数字 / ハングル / かな・漢字 (ー を含む) の連続
+_TOKEN = re.compile(r"[a-z0-9]+|[\uac00-\ud7af]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# 英語の機能語と use-when の定型句 (どのスキルにも現れて順位に効かない語)
+STOPWORDS = frozenset("""
+a an and are as at be by do for from how i if in is it me my of on or so the this that to we with you your
+asks ask e g etc trigger triggers use used user users want wants when
+""".split())
+
+
+def normalize(text: str) -> str:
+    """NFKC + casefold。空白の連続は 1 つにまとめる"""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def extract_triggers(text: str) -> list[str]:
+    """引用符で囲まれたトリガーフレーズ (出現順・重複除去、正規化前の表記のまま)"""
+    phrases: list[str] = []
+    for match in _QUOTED.finditer(text):
+        phrase = next(g for g in match.groups() if g is not None).strip()
+        if phrase and phrase not in phrases:
+            phrases.append(phrase)
+    return phrases
+
+
+def strip_triggers(text: str) -> str:
+    """引用フレーズを除いた説明文"""
+    return _QUOTED.sub(" ", text)
+
+
+def _stem(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):    # eventbus / analysis は除く
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """正規化したうえで英数字は単語、CJK は文字 bigram に分割する (重複はそのまま、出現順)"""
+    tokens: list[str] = []
+    for run in _TOKEN.findall(normalize(text)):
+        if run[0] < "\u0080":
+            if len(run) > 1 and run not in STOPWORDS:
+                tokens.append(_stem(run))
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[k:k + 2] for k in range(len(run) - 1))
+    return tokens
@@ -0,0 +1,68 @@
+# 変更監視 — plugins/ とドキュメントの mtime をポーリングし、変更されたパスだけを返す
+"""
+factorylib.watch — watch モード用の軽量ポーラー
+
+inotify などの OS 依存 API は使わず、os.scandir で (mtime_ns, size) を集めて
+前回のスナップショットと比較する。stat はディレクトリ走査の結果を再利用するため、
+数千ファイル規模でも 1 回のポーリングは数ミリ秒で終わる。
+
+  poller = MtimePoller(FACTORY_ROOT / "plugins", extra=lambda: doc_paths)
+  while True:
+      time.sleep(1.0)
+      changed = poller.poll()     # 追加・変更・削除されたパス
+"""
+
+import os
+from pathlib import Path
+from collections.abc import Callable, Iterable
+
+Stamp = tuple[int, int]     # (mtime_ns, size)
+
+
+def _walk(top: Path, stamps: dict[Path, Stamp]) -> None:
+    """top 以下の全ファイルの stamp を集める (ドットで始まるディレクトリは除外)"""
+    stack = [str(top)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        stamps[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+                except FileNotFoundError:
+                    continue    # 走査中に削除された
+
+
+class MtimePoller:
+    """監視対象ツリーと追加ファイルの stamp を保持し、差分を返す"""
+
+    def __init__(self, top: Path, extra: Callable[[], Iterable[Path]] = lambda: ()):
+        self.top = top
+        self.extra = extra
+        self.stamps = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, Stamp]:
+        stamps: dict[Path, Stamp] = {}
+        _walk(self.top, stamps)
+        for path in self.extra():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def poll(self) -> list[Path]:
+        """前回のポーリング以降に追加・変更・削除されたパス (ソート済み)"""
+        current = self._snapshot()
+        changed = {p for p, stamp in current.items() if self.stamps.get(p) != stamp}
+        changed.update(p for p in self.stamps if p not in current)
+        self.stamps = current
+        return sorted(changed)
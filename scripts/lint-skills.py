@@ -8,20 +8,69 @@ lint-skills.py — スキル・エージェント品質チェッカー
 install.sh から自動呼び出し、または単独実行:
   python3 scripts/lint-skills.py
   python3 scripts/lint-skills.py --strict   # 警告もエラー扱い
+  python3 scripts/lint-skills.py --no-cache # .cache/ のスナップショットを使わない
+  python3 scripts/lint-skills.py --jobs 8   # スキル・エージェントチェックを 8 プロセスで並列実行 (0 = CPU 数)
+  python3 scripts/lint-skills.py --drift-config drift.json  # Doc Drift ルール・対象を JSON から読み込む
+  python3 scripts/lint-skills.py --since origin/main   # 差分 lint: ref からの変更スキル + 逆依存 + 関連チームのみ
+  python3 scripts/lint-skills.py --staged              # 差分 lint: git add 済みの変更のみ (pre-commit 用)
+  python3 scripts/lint-skills.py --format ndjson            # 指摘を 1 行 1 JSON で stdout に逐次出力 (表示は stderr)
+  python3 scripts/lint-skills.py --format sarif --output lint.sarif   # SARIF 2.1.0 をファイルに出力
+  python3 scripts/lint-skills.py --profile  # フェーズ別の時間・読み込み量・正規表現評価数・ピークメモリ
+  python3 scripts/lint-skills.py --profile-trace lint.json  # 上記 + Chrome trace-event JSON
 """
 
-import json
-import os
+import contextlib
 import re
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
+from factorylib.catalog import AgentInfo, Catalog, SkillInfo, load_catalog
+from factorylib.changes import LintScope, git_changes, lint_scope, unstaged_conflicts
+from factorylib.collisions import find_collisions
+from factorylib.drift import DriftMatcher, DriftRule, DriftTarget, collect_targets, load_drift_config, scan_files
+from factorylib.findings import ERROR, FORMATS, WARNING, Finding, open_writer
+from factorylib.graph import DepGraph
+from factorylib.parallel import map_ordered, parse_jobs
+from factorylib.profile import count_regex, phase, profiled
+from factorylib.references import ReferenceResolver
+
 # ============================================================
 # 設定
 # ============================================================
 FACTORY_ROOT = Path(__file__).parent.parent
-PLUGINS_DIR  = FACTORY_ROOT / "plugins"
-STRICT_MODE  = "--strict" in sys.argv
+
+# コマンドラインオプション (import 時は既定値のみ。configure() が main の先頭で設定する)
+STRICT_MODE  = False
+USE_CACHE    = True
+JOBS         = 1
+DRIFT_CONFIG: str | None = None
+FORMAT       = "text"          # text | ndjson | sarif
+OUTPUT: str | None = None      # 機械可読出力の書き込み先 (None → stdout)
+SINCE: str | None = None       # --since <ref>: ref からの差分のみ lint
+STAGED       = False           # --staged: インデックスの差分のみ lint
+
+# 機械可読出力のライター (main が --format に応じて設定。None なら表示のみ)
+WRITER = None
+
+
+def _option(argv: list[str], flag: str) -> str | None:
+    return argv[argv.index(flag) + 1] if flag in argv[:-1] else None
+
+
+def configure(argv: list[str]) -> None:
+    """argv からオプションを読み込む。import だけでは何も解釈しない"""
+    global STRICT_MODE, USE_CACHE, JOBS, DRIFT_CONFIG, FORMAT, OUTPUT, SINCE, STAGED
+    STRICT_MODE  = "--strict" in argv
+    USE_CACHE    = "--no-cache" not in argv
+    JOBS         = parse_jobs(argv)
+    DRIFT_CONFIG = _option(argv, "--drift-config")
+    FORMAT       = _option(argv, "--format") or "text"
+    OUTPUT       = _option(argv, "--output")
+    SINCE        = _option(argv, "--since")
+    STAGED       = "--staged" in argv
+    if FORMAT not in FORMATS:
+        raise SystemExit(f"使い方: --format {{{'|'.join(FORMATS)}}}")
 
 # 実行時に生成されるパスは存在チェックから除外
 # (スキルが対象リポジトリで参照するファイルパスも含む)
@@ -33,168 +82,121 @@ RUNTIME_PATH_PREFIXES = (
     "package.json",     # npm プロジェクトファイル (対象リポジトリ)
 )
 
+# 本文のステップ定義: STEP_ / ## Step N / ## Phase N / ## Scan N / ### N. / ## .+ Checklist のいずれか
+STEP_PATTERNS = [
+    re.compile(r"STEP_[A-Z_]+"),
+    re.compile(r"##\s+\w+\s+\d"),                     # ## Step 1, ## Scan 2, ## Phase 3 など
+    re.compile(r"##\s+STEP_[A-Z_]+"),
+    re.compile(r"###\s+\d+\."),                        # ### 1. 形式
+    re.compile(r"###\s+[A-Z]\."),                       # ### A. 形式
+    re.compile(r"##\s+\w+\s+Checklist", re.IGNORECASE),  # ## Review Checklist など
+]
+# Read: path/to/file / Glob: pattern 形式のファイル参照
+FILE_REF_RE = re.compile(r"(?:Read|Glob):\s+([\w./\-*{}]+)")
+
 # ── ANSI カラー ──────────────────────────────────────────
 GREEN  = "\033[32m"
 YELLOW = "\033[33m"
 RED    = "\033[31m"
 BLUE   = "\033[34m"
 BOLD   = "\033[1m"
+DIM    = "\033[2m"
 RESET  = "\033[0m"
 
 def ok(msg):   print(f"  {GREEN}✓{RESET}  {msg}")
 def warn(msg): print(f"  {YELLOW}⚠{RESET}  {msg}")
 def err(msg):  print(f"  {RED}✗{RESET}  {msg}")
+def skip(msg): print(f"  {DIM}–  {msg}{RESET}")
 
 
-# ============================================================
-# フロントマターパーサー (sync-registry.py と共通ロジック)
-# ============================================================
-def parse_frontmatter(filepath: Path) -> dict:
-    try:
-        text = filepath.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return {}
-
-    if not text.startswith("---"):
-        return {}
-
-    end = text.find("\n---", 3)
-    if end == -1:
-        return {}
-
-    fm_block = text[3:end].strip()
-    result = {}
-
-    for line in fm_block.splitlines():
-        if ":" not in line:
-            continue
-        key, _, val = line.partition(":")
-        key = key.strip()
-        val = val.strip()
-        if key and val:
-            result[key] = val
-
-    # マルチライン YAML ブロックスカラー (use-when: > など) の収集
-    def collect_multiline(field_name: str) -> str | None:
-        lines_out = []
-        in_field = False
-        for line in fm_block.splitlines():
-            if line.startswith(f"{field_name}:"):
-                in_field = True
-                val = line.partition(":")[2].strip().strip('"').strip("'").lstrip(">").strip()
-                if val:
-                    lines_out.append(val)
-            elif in_field and (line.startswith("  ") or line.startswith("\t")):
-                lines_out.append(line.strip())
-            else:
-                if in_field:
-                    in_field = False
-        return " ".join(lines_out) if lines_out else None
-
-    for field in ("description", "use-when"):
-        val = collect_multiline(field)
-        if val:
-            result[field] = val
-
-    return result
-
-
-def read_body(filepath: Path) -> str:
-    """フロントマターを除いた本文を返す"""
-    try:
-        text = filepath.read_text(encoding="utf-8")
-    except FileNotFoundError:
+def _rel(path: Path | None) -> str:
+    """指摘の file 欄 (FACTORY_ROOT からの相対パス)"""
+    if path is None:
         return ""
-
-    if not text.startswith("---"):
-        return text
-
-    end = text.find("\n---", 3)
-    if end == -1:
-        return text
-
-    return text[end + 4:].strip()
+    try:
+        return path.relative_to(FACTORY_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
 
 
 # ============================================================
 # チェック関数
 # ============================================================
-def check_skill(skill_dir: Path, all_skill_names: set) -> tuple[int, int]:
-    """単一スキルをチェック。(errors, warnings) を返す"""
-    errors = 0
-    warnings = 0
-    skill_md  = skill_dir / "SKILL.md"
-    meta_md   = skill_dir / "metadata.md"
-    dir_name  = skill_dir.name
+def check_skill(skill: SkillInfo, all_skill_names: set) -> list[Finding]:
+    """単一スキルをチェックし、指摘の一覧を返す"""
+    findings: list[Finding] = []
+    dir_name  = skill.dir_name
+    md_path   = _rel(skill.skill_md)
 
     # ── SKILL.md 存在チェック ──────────────────────────
-    if not skill_md.exists():
-        err(f"[{dir_name}] SKILL.md が存在しない")
-        return 1, 0
-
-    # metadata.md がある場合はそちらから frontmatter を読む
-    fm_source = meta_md if meta_md.exists() else skill_md
-    fm   = parse_frontmatter(fm_source)
-    body = read_body(skill_md)
+    if not skill.has_skill_md:
+        findings.append(Finding(ERROR, f"[{dir_name}] SKILL.md が存在しない", "skill/missing-skill-md", _rel(skill.path)))
+        return findings
+
+    # metadata.md がある場合はそちらから frontmatter を読む (カタログで解析済み)
+    fm      = skill.fm
+    body    = skill.body
+    fm_path = _rel(skill.fm_source)
+
+    # ── フロントマター: 構文 ────────────────────────────
+    if skill.fm_error:
+        e = skill.fm_error
+        findings.append(Finding(ERROR, f"[{dir_name}] frontmatter の構文エラー ({fm_path}:{e.line}:{e.column}): {e.message}",
+                                "skill/frontmatter-syntax", fm_path, e.line))
+    for w in skill.fm_warnings:
+        findings.append(Finding(WARNING, f"[{dir_name}] frontmatter ({fm_path}:{w.line}:{w.column}): {w.message}",
+                                "skill/frontmatter-compat", fm_path, w.line))
 
     # ── フロントマター: name ────────────────────────────
     if "name" not in fm:
-        err(f"[{dir_name}] frontmatter に name: がない")
-        errors += 1
+        findings.append(Finding(ERROR, f"[{dir_name}] frontmatter に name: がない", "skill/missing-name", fm_path))
     elif fm["name"] != dir_name:
-        warn(f"[{dir_name}] name: '{fm['name']}' がディレクトリ名と不一致")
-        warnings += 1
+        findings.append(Finding(WARNING, f"[{dir_name}] name: '{fm['name']}' がディレクトリ名と不一致",
+                                "skill/name-mismatch", fm_path))
 
     # ── フロントマター: description または use-when ──────
     # metadata.md は use-when: を使用、SKILL.md は description: を使用
     desc_val = fm.get("description") or fm.get("use-when", "")
     if not desc_val:
-        err(f"[{dir_name}] frontmatter に description: / use-when: がない")
-        errors += 1
+        findings.append(Finding(ERROR, f"[{dir_name}] frontmatter に description: / use-when: がない",
+                                "skill/missing-description", fm_path))
     elif len(desc_val) < 20:
-        warn(f"[{dir_name}] description/use-when が短すぎる ({len(desc_val)} 文字) — トリガー精度が下がる可能性")
-        warnings += 1
+        findings.append(Finding(WARNING, f"[{dir_name}] description/use-when が短すぎる ({len(desc_val)} 文字) — トリガー精度が下がる可能性",
+                                "skill/short-description", fm_path))
 
     # ── フロントマター: status=deprecated チェック ───────
     if fm.get("status") == "deprecated":
-        warn(f"[{dir_name}] status: deprecated — このスキルは削除予定")
-        warnings += 1
-        return errors, warnings  # deprecated は以降チェックをスキップ
+        findings.append(Finding(WARNING, f"[{dir_name}] status: deprecated — このスキルは削除予定", "skill/deprecated", fm_path))
+        return findings  # deprecated は以降チェックをスキップ
 
     # ── フロントマター: requires 参照整合性 ──────────────
     if "requires" in fm:
-        requires_raw = fm["requires"]
-        # YAML inline array [a, b] または カンマ区切り 両対応
-        requires_raw = requires_raw.strip("[]")
-        required_skills = [r.strip() for r in requires_raw.split(",") if r.strip()]
-        for req in required_skills:
+        for req in skill.requires:
             if req not in all_skill_names:
-                err(f"[{dir_name}] requires: '{req}' — skills/ に存在しないスキルを参照")
-                errors += 1
+                findings.append(Finding(ERROR, f"[{dir_name}] requires: '{req}' — skills/ に存在しないスキルを参照",
+                                        "skill/unknown-requires", fm_path))
 
     # ── 本文: 空チェック ────────────────────────────────
     if not body:
-        err(f"[{dir_name}] SKILL.md の本文が空")
-        errors += 1
-        return errors, warnings
+        findings.append(Finding(ERROR, f"[{dir_name}] SKILL.md の本文が空", "skill/empty-body", md_path))
+        return findings
 
     # ── 本文: ステップ定義チェック ───────────────────────
-    # STEP_ / ## Step N / ## Phase N / ## Scan N / ### N. / ## .+ Checklist のいずれか
-    has_step = bool(
-        re.search(r"STEP_[A-Z_]+", body) or
-        re.search(r"##\s+\w+\s+\d", body) or           # ## Step 1, ## Scan 2, ## Phase 3 など
-        re.search(r"##\s+STEP_[A-Z_]+", body) or
-        re.search(r"###\s+\d+\.", body) or              # ### 1. 形式
-        re.search(r"###\s+[A-Z]\.", body) or            # ### A. 形式
-        re.search(r"##\s+\w+\s+Checklist", body, re.IGNORECASE)  # ## Review Checklist など
-    )
+    # STEP_PATTERNS のいずれか (最初に一致した時点で打ち切り)
+    has_step = False
+    for evaluated, pattern in enumerate(STEP_PATTERNS, 1):
+        if pattern.search(body):
+            has_step = True
+            break
+    count_regex(evaluated)
     if not has_step:
-        warn(f"[{dir_name}] ステップ定義が見当たらない (STEP_XXX / ## Step N / ## Scan N 形式)")
-        warnings += 1
+        findings.append(Finding(WARNING, f"[{dir_name}] ステップ定義が見当たらない (STEP_XXX / ## Step N / ## Scan N 形式)",
+                                "skill/no-steps", md_path))
 
     # ── 本文: ファイルパス参照チェック ───────────────────
     # Read: path/to/file パターンを抽出して実在確認
-    file_refs = re.findall(r"(?:Read|Glob):\s+([\w./\-*{}]+)", body)
+    file_refs = FILE_REF_RE.findall(body)
+    count_regex()
     for ref in file_refs:
         # ワイルドカードは除外
         if "*" in ref or "{" in ref:
@@ -207,307 +209,321 @@ def check_skill(skill_dir: Path, all_skill_names: set) -> tuple[int, int]:
             continue
         ref_path = FACTORY_ROOT / ref
         if not ref_path.exists():
-            warn(f"[{dir_name}] '{ref}' を参照しているが、ファイルが存在しない")
-            warnings += 1
+            findings.append(Finding(WARNING, f"[{dir_name}] '{ref}' を参照しているが、ファイルが存在しない",
+                                    "skill/missing-file", md_path))
 
-    return errors, warnings
+    return findings
 
 
-def check_agent(agent_file: Path, all_skill_names: set) -> tuple[int, int]:
-    """単一エージェントをチェック。(errors, warnings) を返す"""
-    errors = 0
-    warnings = 0
-    file_name = agent_file.stem
+def check_agent(agent: AgentInfo, resolver: ReferenceResolver) -> list[Finding]:
+    """単一エージェントをチェックし、指摘の一覧を返す"""
+    findings: list[Finding] = []
+    file_name = agent.stem
+    path      = _rel(agent.path)
 
-    fm = parse_frontmatter(agent_file)
-    body = read_body(agent_file)
+    fm = agent.fm
+    body = agent.body
 
     # ── description チェック ────────────────────────────
     if not body:
-        err(f"[agent:{file_name}] ファイルが空")
-        return 1, 0
+        findings.append(Finding(ERROR, f"[agent:{file_name}] ファイルが空", "agent/empty", path))
+        return findings
+
+    if agent.fm_error:
+        e = agent.fm_error
+        findings.append(Finding(ERROR, f"[agent:{file_name}] frontmatter の構文エラー ({path}:{e.line}:{e.column}): {e.message}",
+                                "agent/frontmatter-syntax", path, e.line))
+    for w in agent.fm_warnings:
+        findings.append(Finding(WARNING, f"[agent:{file_name}] frontmatter ({path}:{w.line}:{w.column}): {w.message}",
+                                "agent/frontmatter-compat", path, w.line))
 
     # エージェントは frontmatter ではなく description: フィールドで識別
     if "description" not in fm:
         # frontmatter なしでも description: フィールドが本文にあるか確認
+        count_regex()
         if not re.search(r"^description:", body, re.MULTILINE):
-            warn(f"[agent:{file_name}] description: フィールドがない — ルーティングに影響する可能性")
-            warnings += 1
+            findings.append(Finding(WARNING, f"[agent:{file_name}] description: フィールドがない — ルーティングに影響する可能性",
+                                    "agent/missing-description", path))
 
     # ── 本文: 存在スキル参照チェック ─────────────────────
     # バッククォートやコードブロック内のスキル名のみチェック (説明文の誤検知を防ぐ)
-    all_agent_names = {f.stem for f in collect_all_agent_files()}
-    skill_calls = re.findall(
-        r"`((?:devops|figma|project)-[a-z\-]+)`",
-        body
-    )
-    for skill_ref in set(skill_calls):
-        # エージェント名自身は除外
-        if skill_ref == file_name:
-            continue
-        # エージェント名リストにあるなら除外
-        if skill_ref in all_agent_names:
-            continue
-        if skill_ref not in all_skill_names:
-            warn(f"[agent:{file_name}] `{skill_ref}` を参照しているが plugins/ にも agents/ にも存在しない")
-            warnings += 1
+    # プラグイン名プレフィックスの参照を 1 パスで抽出し、スキル名・エージェント名と照合 (自身は除外)
+    for skill_ref in resolver.unresolved(body, exclude=file_name):
+        findings.append(Finding(WARNING, f"[agent:{file_name}] `{skill_ref}` を参照しているが plugins/ にも agents/ にも存在しない",
+                                "agent/unknown-reference", path))
+
+    return findings
+
+
+# ── 並列ワーカー (プロセスごとに 1 回だけ名前集合・参照リゾルバーを受け取る) ──
+_WORKER_CTX: tuple = (set(), None)
+
+
+def _init_worker(all_skill_names: set, resolver: ReferenceResolver) -> None:
+    global _WORKER_CTX
+    _WORKER_CTX = (all_skill_names, resolver)
+
+
+def _check_task(item: SkillInfo | AgentInfo) -> list[Finding]:
+    all_skill_names, resolver = _WORKER_CTX
+    if isinstance(item, SkillInfo):
+        return check_skill(item, all_skill_names)
+    return check_agent(item, resolver)
 
+
+def emit(findings) -> tuple[int, int]:
+    """指摘を 1 件ずつ表示し、--format 指定時は WRITER にも逐次書き出す。(errors, warnings) を返す"""
+    errors = warnings = 0
+    for f in findings:
+        (err if f.severity == ERROR else warn)(f.message)
+        if WRITER is not None:
+            WRITER.write(f)
+        if f.severity == ERROR:
+            errors += 1
+        else:
+            warnings += 1
     return errors, warnings
 
 
+def report_findings(name: str, findings: list[Finding]) -> tuple[int, int]:
+    """指摘を表示し (なければ ok)、(errors, warnings) を返す"""
+    if not findings:
+        ok(name)
+    return emit(findings)
+
+
 MAX_DEP_DEPTH = 3  # これ以上深い依存チェーンは警告
+COLLISION_THRESHOLD = 0.3   # トリガーのシングル集合の Jaccard 係数がこれ以上なら衝突として警告
 
-def _discover_known_teams() -> set[str]:
+def _discover_known_teams(catalog: Catalog) -> set[str]:
     """plugin.json の teams: キーから既知チーム名を自動収集"""
     teams = set()
-    if PLUGINS_DIR.exists():
-        for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-            if not plugin_dir.is_dir():
-                continue
-            pjson = plugin_dir / "plugin.json"
-            if not pjson.exists():
-                continue
-            try:
-                data = json.loads(pjson.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                continue
-            teams.update(data.get("teams", {}).keys())
+    for plugin in catalog.plugins:
+        teams.update(plugin.teams.keys())
     return teams
 
 
-KNOWN_TEAMS = _discover_known_teams()
-
-
-def check_teams(all_skill_names: set) -> tuple[int, int]:
+def check_teams(catalog: Catalog, all_skill_names: set, plugins: set[str] | None = None) -> list[Finding]:
     """
-    plugins/*/plugin.json の teams: フィールドを検証する。
+    plugins/*/plugin.json の teams: フィールドを検証し、指摘の一覧を返す (plugins 指定時はその名前のみ)。
     - 登録されたスキルが実際に存在するか
-    - チーム名が KNOWN_TEAMS に含まれるか
+    - チーム名が既知チーム (_discover_known_teams) に含まれるか
     - plugin.json に teams: フィールドがあるか
-    Returns (errors, warnings)
     """
-    errors = 0
-    warnings = 0
+    findings: list[Finding] = []
+    known_teams = _discover_known_teams(catalog)
 
-    if not PLUGINS_DIR.exists():
-        return errors, warnings
-
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
+    for plugin in catalog.plugins:
+        if plugins is not None and plugin.name not in plugins:
             continue
-        pjson = plugin_dir / "plugin.json"
-        if not pjson.exists():
-            warn(f"[{plugin_dir.name}] plugin.json が存在しない")
-            warnings += 1
+        path = _rel(plugin.path / "plugin.json")
+        if not plugin.has_manifest:
+            findings.append(Finding(WARNING, f"[{plugin.name}] plugin.json が存在しない", "teams/missing-manifest", path))
             continue
 
-        try:
-            data = json.loads(pjson.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as e:
-            err(f"[{plugin_dir.name}] plugin.json が不正な JSON: {e}")
-            errors += 1
+        if plugin.manifest_error is not None:
+            findings.append(Finding(ERROR, f"[{plugin.name}] plugin.json が不正な JSON: {plugin.manifest_error}",
+                                    "teams/invalid-manifest", path))
             continue
 
-        if "teams" not in data:
-            warn(f"[{plugin_dir.name}] plugin.json に teams: フィールドがない — Agent Teams に参加しない")
-            warnings += 1
+        if "teams" not in plugin.manifest:
+            findings.append(Finding(WARNING, f"[{plugin.name}] plugin.json に teams: フィールドがない — Agent Teams に参加しない",
+                                    "teams/missing-teams", path))
             continue
 
-        teams = data["teams"]
-        for team_name, members in teams.items():
+        for team_name, members in plugin.teams.items():
             # 未知のチーム名チェック
-            if team_name not in KNOWN_TEAMS:
-                warn(f"[{plugin_dir.name}] teams.{team_name} — 未定義のチーム名 (既知: {', '.join(sorted(KNOWN_TEAMS))})")
-                warnings += 1
+            if team_name not in known_teams:
+                findings.append(Finding(WARNING, f"[{plugin.name}] teams.{team_name} — 未定義のチーム名 (既知: {', '.join(sorted(known_teams))})",
+                                        "teams/unknown-team", path))
             # メンバーの存在チェック
             for skill in members:
                 if skill not in all_skill_names:
-                    err(f"[{plugin_dir.name}] teams.{team_name}: '{skill}' — plugins/ に存在しないスキルを参照")
-                    errors += 1
+                    findings.append(Finding(ERROR, f"[{plugin.name}] teams.{team_name}: '{skill}' — plugins/ に存在しないスキルを参照",
+                                            "teams/unknown-member", path))
 
-    return errors, warnings
+    return findings
 
 
-def _build_deps() -> dict[str, list[str]]:
-    """requires: フィールドから依存グラフを構築 (plugins/ ベース)"""
-    deps: dict[str, list[str]] = {}
-    for skill_dir in collect_all_skill_dirs():
-        meta_md  = skill_dir / "metadata.md"
-        skill_md = skill_dir / "SKILL.md"
-        source = meta_md if meta_md.exists() else (skill_md if skill_md.exists() else None)
-        if source is None:
-            continue
-        fm = parse_frontmatter(source)
-        name = fm.get("name", skill_dir.name)
-        if "requires" in fm:
-            raw = fm["requires"].strip("[]")
-            deps[name] = [r.strip() for r in raw.split(",") if r.strip()]
-        else:
-            deps[name] = []
-    return deps
-
-
-def check_circular_requires(all_skill_names: set) -> int:
-    """requires: の循環参照を検出。エラー数を返す"""
-    errors = 0
-    deps = _build_deps()
-
-    # DFS で循環検出
-    def has_cycle(node: str, visited: set, stack: set) -> bool:
-        visited.add(node)
-        stack.add(node)
-        for neighbor in deps.get(node, []):
-            if neighbor not in visited:
-                if has_cycle(neighbor, visited, stack):
-                    return True
-            elif neighbor in stack:
-                return True
-        stack.discard(node)
-        return False
-
-    visited: set = set()
-    for skill in deps:
-        if skill not in visited:
-            if has_cycle(skill, visited, set()):
-                err(f"requires: に循環参照が検出された (関連: {skill})")
-                errors += 1
-
-    return errors
-
-
-def check_dep_depth(all_skill_names: set) -> int:
-    """依存チェーンが MAX_DEP_DEPTH 以上のスキルを警告。警告数を返す"""
-    warnings = 0
-    deps = _build_deps()
-
-    def depth(node: str, visited: set) -> int:
-        if node in visited or node not in deps:
-            return 0
-        children = deps[node]
-        if not children:
-            return 0
-        return 1 + max(depth(c, visited | {node}) for c in children)
-
-    for skill in sorted(deps.keys()):
-        d = depth(skill, set())
+def check_circular_requires(graph: DepGraph) -> list[Finding]:
+    """requires: の循環参照を SCC 単位で検出し、循環ごとに 1 件の指摘を返す"""
+    return [
+        Finding(ERROR, f"requires: に循環参照が検出された ({' ↔ '.join(members)})", "requires/cycle")
+        for members in graph.cycles()
+    ]
+
+
+def check_dep_depth(graph: DepGraph, only: set[str] | None = None) -> list[Finding]:
+    """依存チェーンが MAX_DEP_DEPTH 以上のスキルの警告一覧を返す (only 指定時はその名前のみ)"""
+    findings: list[Finding] = []
+    depths = graph.depths()
+
+    for skill in sorted(graph.deps.keys() if only is None else only & graph.deps.keys()):
+        d = depths[skill]
         if d >= MAX_DEP_DEPTH:
-            warn(
+            findings.append(Finding(
+                WARNING,
                 f"[{skill}] 依存チェーン深さ {d} (推奨: {MAX_DEP_DEPTH} 未満) "
-                f"— 'python3 scripts/dep-graph.py' で詳細確認"
-            )
-            warnings += 1
+                f"— 'python3 scripts/dep-graph.py' で詳細確認",
+                "requires/depth",
+            ))
 
-    return warnings
+    return findings
+
+
+def check_trigger_collisions(catalog: Catalog, only: set[Path] | None = None) -> list[Finding]:
+    """
+    use-when / description のトリガーフレーズが重なりすぎているスキル・エージェントの組を警告する。
+    MinHash / LSH で候補の組だけを比較する (factorylib.collisions)。
+    only 指定時は、そのパス (スキルディレクトリ / エージェント .md) を含む組のみ報告する
+    """
+    entries: list[tuple[str, str, Path]] = [
+        (s.name, s.fm.get("use-when") or s.fm.get("description") or "", s.fm_source)
+        for s in catalog.indexed_skills
+    ]
+    entries += [(a.name, a.fm.get("description") or "", a.path) for a in catalog.agents if not a.deprecated]
+    paths = {name: path for name, _, path in entries}
+    keys = {name: path.parent if path.name in ("metadata.md", "SKILL.md") else path for name, _, path in entries}
+
+    findings: list[Finding] = []
+    for c in find_collisions([(name, text) for name, text, _ in entries], COLLISION_THRESHOLD):
+        if only is not None and keys[c.a] not in only and keys[c.b] not in only:
+            continue
+        shared = ", ".join(f'"{p}"' for p in c.shared[:4]) + (" ..." if len(c.shared) > 4 else "")
+        findings.append(Finding(
+            WARNING,
+            f"[{c.a}] トリガーが '{c.b}' と重複 (類似度 {c.similarity:.2f})"
+            + (f" — 共通: {shared}" if shared else "")
+            + " — ルーティングが曖昧になるためトリガーを絞ってください",
+            "triggers/collision",
+            _rel(paths[c.a]),
+        ))
+    return findings
 
 
 # ============================================================
 # ドキュメント drift チェック
 # ============================================================
 # deprecated/removed になったキーワードがドキュメントに残っていないか検査する。
-# 各エントリ: (pattern, message, is_error)
+# 各エントリ: DriftRule(pattern, message, is_error, rule_id)
 #   is_error=True  → ✗ ERROR (--strict 不要でも失敗)
 #   is_error=False → ⚠ WARN
-DOC_FORBIDDEN: list[tuple[str, str, bool]] = [
-    (
+# --drift-config <file.json> で置き換え可能 (形式は factorylib.drift 参照)
+DOC_FORBIDDEN: list[DriftRule] = [
+    DriftRule(
         r"skill-router",
         "deprecated agent 'skill-router' の参照が残っている — CLAUDE.md 直接ルーティングに更新してください",
         True,
+        "drift/skill-router",
     ),
-    (
+    DriftRule(
         r"skills/\*/",
         "旧フラット構造 'skills/*/' の参照 — 'plugins/*/skills/*/' に更新してください",
         True,
+        "drift/flat-skills-path",
     ),
-    (
+    DriftRule(
         r"agents/\*/",
         "旧フラット構造 'agents/*/' の参照 — 'plugins/*/agents/' に更新してください",
         True,
+        "drift/flat-agents-path",
     ),
 ]
 
-# チェック対象ファイル (glob パターン, 除外パターン)
-DOC_TARGETS: list[tuple[str, list[str]]] = [
-    ("CLAUDE.md",          ["agents/                ← Legacy"]),   # Legacy note は許可
-    ("README.md",          []),
-    ("_docs/*.md",         ["Doc Drift",             # Drift 説明行は許可
-                            "✗ ERROR — Doc Drift"]),
-    ("categories/**/*.md", []),                                    # カテゴリ規約ファイル
+# チェック対象ファイル (glob パターン, 許可する行の部分文字列)
+DOC_TARGETS: list[DriftTarget] = [
+    DriftTarget("CLAUDE.md",          ("agents/                ← Legacy",)),  # Legacy note は許可
+    DriftTarget("README.md"),
+    DriftTarget("_docs/*.md",         ("Doc Drift",                           # Drift 説明行は許可
+                                       "✗ ERROR — Doc Drift")),
+    DriftTarget("categories/**/*.md"),                                         # カテゴリ規約ファイル
 ]
 
-def check_doc_drift() -> tuple[int, int]:
+def resolve_drift_rules() -> tuple[list[DriftRule], list[DriftTarget]]:
+    """DOC_FORBIDDEN / DOC_TARGETS を --drift-config の内容で上書きして返す (設定が不正なら ValueError)"""
+    rules, targets = DOC_FORBIDDEN, DOC_TARGETS
+    if DRIFT_CONFIG:
+        config_rules, config_targets = load_drift_config(Path(DRIFT_CONFIG))
+        rules   = config_rules if config_rules is not None else rules
+        targets = config_targets if config_targets is not None else targets
+    return rules, targets
+
+
+def check_doc_drift(
+    rules: list[DriftRule], targets: list[DriftTarget], only: set[Path] | None = None,
+) -> Iterator[Finding]:
     """
     ドキュメント内に deprecated キーワードが残っていないかチェックする。
-    (errors, warnings) を返す。
+    対象ファイル (only 指定時はそれとの積) は --jobs N に従って並列に走査し、
+    指摘をファイル順に 1 件ずつ yield する (全ファイル分の指摘をまとめてメモリに溜めない)。
     """
-    errors = warnings = 0
+    matcher = DriftMatcher(rules)
+    files   = collect_targets(FACTORY_ROOT, targets)
+    if only is not None:
+        files = [item for item in files if item[0] in only]
+    for file_findings in scan_files(files, matcher, JOBS):
+        yield from file_findings
 
-    for glob_pattern, allowlist in DOC_TARGETS:
-        for filepath in sorted(FACTORY_ROOT.glob(glob_pattern)):
-            rel = filepath.relative_to(FACTORY_ROOT)
-            try:
-                lines = filepath.read_text(encoding="utf-8").splitlines()
-            except Exception:
-                continue
-
-            for lineno, line in enumerate(lines, 1):
-                # allowlist にマッチする行はスキップ
-                if any(skip in line for skip in allowlist):
-                    continue
-                # ファイル自身の定義行はスキップ (lint-skills.py の DOC_FORBIDDEN 定義)
-                if filepath.name == "lint-skills.py" and "DOC_FORBIDDEN" in line:
-                    continue
-
-                for pattern, message, is_error in DOC_FORBIDDEN:
-                    if re.search(pattern, line):
-                        location = f"{rel}:{lineno}"
-                        if is_error:
-                            err(f"[{location}] {message}")
-                            errors += 1
-                        else:
-                            warn(f"[{location}] {message}")
-                            warnings += 1
-                        break   # 1行につき1件のみ報告
 
-    return errors, warnings
+# ============================================================
+# 差分モード
+# ============================================================
+def diff_scope(catalog: Catalog) -> LintScope | None:
+    """
+    --since / --staged の変更を lint 対象に写像する (factorylib.changes 参照)。
+    scripts/ や --drift-config の変更を含む場合はチェック内容自体が変わるため None (全件)。
+    git の実行に失敗した場合、--staged で lint 対象に未ステージの変更がある場合は ValueError
+    """
+    label = "--staged" if STAGED else f"--since {SINCE}"
+    changes = git_changes(FACTORY_ROOT, SINCE, STAGED)
+    scope = lint_scope(catalog, changes)
+    if STAGED:
+        conflicts = unstaged_conflicts(FACTORY_ROOT, changes, scope)
+        if conflicts:
+            listed = ", ".join(conflicts[:5]) + (f" … (+{len(conflicts) - 5})" if len(conflicts) > 5 else "")
+            raise ValueError(f"--staged: 未ステージの変更があるファイルを lint できない ({listed}) — "
+                             "git add するか git stash --keep-index してから再実行してください")
+    if DRIFT_CONFIG and Path(DRIFT_CONFIG).resolve() in {p.resolve() for p in scope.paths}:
+        scope.full = True
+    if scope.full:
+        print(f"{BOLD}🔀 差分モード ({label}): scripts/ または lint 設定の変更を含むため全件チェック{RESET}")
+        print()
+        return None
+    agents = "全件" if scope.all_agents else f"{len(scope.agents)} 件"
+    print(f"{BOLD}🔀 差分モード ({label}): 変更 {len(changes)} ファイル → "
+          f"スキル {len(scope.skills)} 件 (逆依存を含む) / エージェント {agents} / "
+          f"teams {len(scope.teams)} プラグイン{RESET}")
+    print()
+    return scope
 
 
 # ============================================================
 # メイン
 # ============================================================
-def collect_all_skill_dirs() -> list[Path]:
-    """plugins/*/skills/* のスキルディレクトリ一覧を返す"""
-    skill_dirs: list[Path] = []
-    if not PLUGINS_DIR.exists():
-        return skill_dirs
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-        skills_dir = plugin_dir / "skills"
-        if not skills_dir.exists():
-            continue
-        for skill_dir in sorted(skills_dir.iterdir()):
-            if skill_dir.is_dir():
-                skill_dirs.append(skill_dir)
-    return skill_dirs
-
-
-def collect_all_agent_files() -> list[Path]:
-    """plugins/*/agents/*.md のエージェントファイル一覧を返す"""
-    agent_files: list[Path] = []
-    if not PLUGINS_DIR.exists():
-        return agent_files
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-        agents_dir = plugin_dir / "agents"
-        if not agents_dir.exists():
-            continue
-        for agent_file in sorted(agents_dir.glob("*.md")):
-            agent_files.append(agent_file)
-    return agent_files
+@profiled
+def main(catalog: Catalog | None = None) -> int:
+    """catalog を渡すと走査を省略する (factory.py validate で他フェーズと共有)"""
+    global WRITER
+    configure(sys.argv)
+    if FORMAT == "text":
+        return run(catalog)
+
+    # --format ndjson|sarif: 指摘を逐次書き出す。stdout に出す場合、人間向けの表示は stderr へ回す
+    stream = open(OUTPUT, "w", encoding="utf-8") if OUTPUT else sys.stdout
+    human  = contextlib.nullcontext() if OUTPUT else contextlib.redirect_stdout(sys.stderr)
+    WRITER = open_writer(FORMAT, stream)
+    try:
+        with human:
+            return run(catalog)
+    finally:
+        WRITER.close()
+        WRITER = None
+        if OUTPUT:
+            stream.close()
 
 
-def main() -> int:
+def run(catalog: Catalog | None = None) -> int:
+    """全チェックを実行して結果を表示し、終了コードを返す"""
     total_errors   = 0
     total_warnings = 0
 
@@ -518,74 +534,130 @@ def main() -> int:
     print()
 
     # ── スキル一覧を収集 (plugins/ ベース) ───────────────
-    skill_dirs      = collect_all_skill_dirs()
-    all_skill_names = {d.name for d in skill_dirs}
-
-    # ── Skills チェック ─────────────────────────────────
-    print(f"{BOLD}📦 Skills ({len(skill_dirs)} 個){RESET}")
-    if skill_dirs:
-        for skill_dir in skill_dirs:
-            e, w = check_skill(skill_dir, all_skill_names)
-            if e == 0 and w == 0:
-                ok(skill_dir.name)
+    if catalog is None:
+        with phase("catalog.load"):
+            catalog = load_catalog(FACTORY_ROOT, use_cache=USE_CACHE)
+    all_skill_names = catalog.skill_dir_names()
+
+    # ── 差分モード (--since / --staged): 変更の影響範囲だけをチェック ──
+    scope = None
+    if SINCE or STAGED:
+        try:
+            scope = diff_scope(catalog)
+        except ValueError as e:
+            err(str(e))
+            return 1
+    skills = catalog.skills if scope is None else [s for s in catalog.skills if s.path in scope.skills]
+    agents = catalog.agents if scope is None or scope.all_agents else \
+        [a for a in catalog.agents if a.path in scope.agents]
+
+    # ── Skills / Agents チェック (--jobs N で並列、表示順は常にソート順) ──
+    resolver = ReferenceResolver.from_catalog(catalog)   # プラグイン名トライは 1 回だけ構築
+    results  = map_ordered(
+        _check_task, skills + agents, JOBS, _init_worker, (all_skill_names, resolver),
+    )
+
+    print(f"{BOLD}📦 Skills ({len(skills)} 個){RESET}")
+    with phase("lint.skills"):
+        for skill in skills:
+            e, w = report_findings(skill.dir_name, next(results))
             total_errors   += e
             total_warnings += w
-    else:
-        warn("plugins/*/skills/ にスキルが見つからない")
-        total_warnings += 1
+    if not catalog.skills:
+        total_warnings += emit([Finding(WARNING, "plugins/*/skills/ にスキルが見つからない", "catalog/no-skills")])[1]
 
     print()
 
-    # ── Agents チェック ─────────────────────────────────
-    agent_files = collect_all_agent_files()
-    print(f"{BOLD}🤖 Agents ({len(agent_files)} 個){RESET}")
-    if not agent_files:
-        warn("plugins/*/agents/ にエージェントが見つからない")
-        total_warnings += 1
-    for agent_file in agent_files:
-        e, w = check_agent(agent_file, all_skill_names)
-        if e == 0 and w == 0:
-            ok(agent_file.stem)
-        total_errors   += e
-        total_warnings += w
+    print(f"{BOLD}🤖 Agents ({len(agents)} 個){RESET}")
+    if not catalog.agents:
+        total_warnings += emit([Finding(WARNING, "plugins/*/agents/ にエージェントが見つからない", "catalog/no-agents")])[1]
+    with phase("lint.agents"):
+        for agent in agents:
+            e, w = report_findings(agent.stem, next(results))
+            total_errors   += e
+            total_warnings += w
 
     print()
 
     # ── 循環参照チェック ────────────────────────────────
     print(f"{BOLD}🔄 循環参照チェック{RESET}")
-    cycle_errors = check_circular_requires(all_skill_names)
-    if cycle_errors == 0:
-        ok("循環参照なし")
-    total_errors += cycle_errors
+    graph_skipped = scope is not None and not scope.graph
+    if graph_skipped:
+        skip("requires: に影響する変更なし — スキップ")
+    else:
+        with phase("lint.circular"):
+            graph        = DepGraph(catalog.deps())
+            cycle_errors, _ = emit(check_circular_requires(graph))
+        if cycle_errors == 0:
+            ok("循環参照なし")
+        total_errors += cycle_errors
 
     print()
 
     # ── 依存チェーン深さチェック ─────────────────────────
     print(f"{BOLD}📏 依存チェーン深さチェック (推奨: {MAX_DEP_DEPTH} 未満){RESET}")
-    depth_warnings = check_dep_depth(all_skill_names)
-    if depth_warnings == 0:
-        ok(f"全チェーン深さ {MAX_DEP_DEPTH} 未満")
-    total_warnings += depth_warnings
+    if graph_skipped:
+        skip("requires: に影響する変更なし — スキップ")
+    else:
+        with phase("lint.depth"):
+            _, depth_warnings = emit(check_dep_depth(graph, None if scope is None else scope.skill_names))
+        if depth_warnings == 0:
+            ok(f"全チェーン深さ {MAX_DEP_DEPTH} 未満")
+        total_warnings += depth_warnings
 
     print()
 
     # ── Teams 整合性チェック ─────────────────────────────
     print(f"{BOLD}🤝 Teams 整合性チェック{RESET}")
-    teams_errors, teams_warnings = check_teams(all_skill_names)
-    total_errors   += teams_errors
-    total_warnings += teams_warnings
-    if teams_errors == 0 and teams_warnings == 0:
-        ok("全 teams エントリの参照が正常")
+    if scope is not None and not scope.teams:
+        skip("plugin.json・チームメンバーに影響する変更なし — スキップ")
+    else:
+        with phase("lint.teams"):
+            teams_errors, teams_warnings = emit(check_teams(
+                catalog, all_skill_names, None if scope is None else scope.teams,
+            ))
+        total_errors   += teams_errors
+        total_warnings += teams_warnings
+        if teams_errors == 0 and teams_warnings == 0:
+            ok("全 teams エントリの参照が正常")
+
+    print()
+
+    # ── トリガー衝突チェック ─────────────────────────────
+    print(f"{BOLD}🔀 トリガー衝突チェック (類似度 {COLLISION_THRESHOLD} 以上){RESET}")
+    if scope is not None and not scope.skills and not scope.agents and not scope.all_agents:
+        skip("スキル・エージェントの変更なし — スキップ")
+    else:
+        only = None if scope is None or scope.all_agents else scope.skills | scope.agents
+        with phase("lint.trigger_collisions"):
+            _, collision_warnings = emit(check_trigger_collisions(catalog, only))
+        if collision_warnings == 0:
+            ok("トリガーの重複なし")
+        total_warnings += collision_warnings
 
     print()
 
     # ── ドキュメント drift チェック ──────────────────────
     print(f"{BOLD}📄 ドキュメント Drift チェック{RESET}")
-    drift_errors, drift_warnings = check_doc_drift()
-    total_errors   += drift_errors
-    total_warnings += drift_warnings
-    if drift_errors == 0 and drift_warnings == 0:
-        ok("deprecated キーワードなし")
+    try:
+        drift_rules, drift_targets = resolve_drift_rules()
+    except ValueError as e:
+        err(str(e))
+        return 1
+    drift_changed = scope is None or any(
+        path in scope.paths for path, _, _ in collect_targets(FACTORY_ROOT, drift_targets)
+    )
+    if not drift_changed:
+        skip("drift 対象ドキュメントの変更なし — スキップ")
+    else:
+        with phase("lint.doc_drift"):
+            drift_errors, drift_warnings = emit(check_doc_drift(
+                drift_rules, drift_targets, None if scope is None else scope.paths,
+            ))
+        total_errors   += drift_errors
+        total_warnings += drift_warnings
+        if drift_errors == 0 and drift_warnings == 0:
+            ok("deprecated キーワードなし")
 
     print()
 
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+perf-gate.py — 性能リグレッションゲート (ベースライン比較 + スケーリング検査)
+
+bench-factory.py と同じフェーズを計測し、次の 2 つを検査する。失敗時は exit 1。
+
+  1. ベースライン比較
+     scripts/perf-baseline.json (コミット済み) の各フェーズ時間と比べ、
+     baseline × (1 + tolerance) + min_ms を超えたらリグレッションとする。
+     上限を超えたフェーズは attempts 回まで計測し直し、最小値で判定する (スケーリング検査と同じ)。
+     計測したのにベースラインにないフェーズもエラー (新しいフェーズを素通りさせない)。
+  2. スケーリング検査
+     カタログを n → 2n に倍増したときの時間比が max_ratio (既定 2.6 ≒ 線形 + 揺らぎ)
+     を超えたら「超線形」とする。random / diamond / chain の各形で検査する。
+     上限を超えたフェーズは attempts 回まで計測し直し、最小の比で判定する
+     (本当に O(n²) なら毎回 ×4 前後になり、一時的な揺らぎとは区別できる)。
+
+使い方:
+  python3 scripts/perf-gate.py                  # 両方を実行
+  python3 scripts/perf-gate.py --baseline-only  # ベースライン比較のみ
+  python3 scripts/perf-gate.py --scaling-only   # スケーリング検査のみ
+  python3 scripts/perf-gate.py --update         # 現在の計測値でベースラインを書き換える
+
+ベースラインはマシン性能に依存するため、CI と同じ種類のマシンで --update すること。
+--update は attempts 回計測したフェーズごとの中央値を書き込む (たまたま速かった回を基準にしない)。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from factorylib.loader import load_script
+from factorylib.synth import SynthSpec
+
+# ============================================================
+# 設定
+# ============================================================
+BASELINE_PATH = Path(__file__).parent / "perf-baseline.json"
+
+# ベースラインがない場合・gate セクションがない場合の既定値
+DEFAULT_GATE = {
+    "sizes":          [1000],
+    "repeat":         5,
+    "attempts":       3,        # 上限を超えたフェーズの再計測回数 / --update で中央値を取る回数
+    "tolerance":      0.5,      # +50% まで許容
+    "min_ms":         5.0,      # 小さなフェーズの揺らぎを吸収する絶対値の余裕
+    "phase_tolerance": {},      # { phase: tolerance } で個別に上書き
+    "scaling": {
+        "sizes":     [2000, 4000],
+        "shapes":    ["random", "diamond", "chain"],
+        "max_ratio": 2.6,
+        "attempts":  3,
+        "min_ms":    5.0,       # 2n 側がこれ未満なら比を判定しない (計測誤差が支配的)
+        "phases": [
+            "catalog.load_cold",
+            "lint.check_skill",
+            "lint.check_circular_requires",
+            "lint.check_dep_depth",
+            "lint.check_doc_drift",
+            "sync.scan_skills",
+            "sync.render_registry",
+            "sync.render_index",
+            "sync.build_route_index",
+            "lint.check_trigger_collisions",
+            "dep.cmd_check",
+            "dep.cmd_tree_dedup",
+        ],
+    },
+}
+
+# 既知の指数的フェーズ (旧ツリー表示) はゲート対象外
+SKIP_PHASES = frozenset({"dep.print_tree"})
+BUDGET_S = 30.0
+
+GREEN  = "\033[32m"
+YELLOW = "\033[33m"
+RED    = "\033[31m"
+BOLD   = "\033[1m"
+RESET  = "\033[0m"
+
+def ok(msg):   print(f"  {GREEN}✓{RESET}  {msg}")
+def warn(msg): print(f"  {YELLOW}⚠{RESET}  {msg}")
+def err(msg):  print(f"  {RED}✗{RESET}  {msg}")
+
+
+# ============================================================
+# ベースライン比較
+# ============================================================
+def load_baseline(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def gate_config(baseline: dict | None) -> dict:
+    gate = json.loads(json.dumps(DEFAULT_GATE))     # deep copy
+    if baseline:
+        user = baseline.get("gate", {})
+        scaling = user.pop("scaling", {})
+        gate.update(user)
+        gate["scaling"].update(scaling)
+    return gate
+
+
+def _limit(gate: dict, phase: str, before: float) -> float:
+    tol = gate["phase_tolerance"].get(phase, gate["tolerance"])
+    return before * (1 + tol) + gate["min_ms"] / 1000
+
+
+def measure(bench, size: int, gate: dict, base_phases: dict[str, float | None]) -> dict:
+    """
+    size のカタログを計測する。base_phases の上限を超えたフェーズは attempts 回まで計測し直し、
+    最小値を採る (揺らぎは毎回は起きないが、本当のリグレッションは毎回上限を超える)
+    """
+    run = bench.bench_size(SynthSpec(skills=size), gate["repeat"], BUDGET_S, SKIP_PHASES)
+    for _ in range(max(1, gate["attempts"]) - 1):
+        over = [phase for phase, seconds in run["phases"].items()
+                if seconds is not None and base_phases.get(phase) is not None
+                and seconds > _limit(gate, phase, base_phases[phase])]
+        if not over:
+            break
+        retry = bench.bench_size(SynthSpec(skills=size), gate["repeat"], BUDGET_S, SKIP_PHASES)
+        for phase in over:
+            if retry["phases"].get(phase) is not None:
+                run["phases"][phase] = min(run["phases"][phase], retry["phases"][phase])
+    return run
+
+
+def median_run(bench, size: int, gate: dict) -> dict:
+    """--update 用: attempts 回計測し、フェーズごとの中央値 (打ち切りが半数以上なら None) を持つ run"""
+    samples = [bench.bench_size(SynthSpec(skills=size), gate["repeat"], BUDGET_S, SKIP_PHASES)
+               for _ in range(max(1, gate["attempts"]))]
+    run = samples[0]
+    for phase in run["phases"]:
+        values = sorted(s["phases"].get(phase) for s in samples if s["phases"].get(phase) is not None)
+        run["phases"][phase] = values[len(values) // 2] if len(values) * 2 > len(samples) else None
+    return run
+
+
+def compare(baseline: dict, current: list[dict], gate: dict) -> int:
+    """ベースラインを超えたフェーズ・ベースラインにないフェーズの数を返す"""
+    failures = 0
+    base_runs = {r["size"]: r for r in baseline.get("runs", [])}
+    for run in current:
+        base = base_runs.get(run["size"])
+        if base is None:
+            err(f"[{run['size']:,}] ベースラインにこの規模の計測がない — 'perf-gate.py --update' で追加してください")
+            failures += 1
+            continue
+        for phase in base["phases"].keys() - run["phases"].keys():
+            warn(f"[{run['size']:,}] {phase}: 計測されなくなった — 'perf-gate.py --update' でベースラインから除く")
+        for phase, seconds in run["phases"].items():
+            if phase not in base["phases"]:
+                err(f"[{run['size']:,}] {phase}: ベースラインにない — 'perf-gate.py --update' で追加してください")
+                failures += 1
+                continue
+            before = base["phases"][phase]
+            if before is None or seconds is None:
+                if seconds is None and before is not None:
+                    err(f"[{run['size']:,}] {phase}: 打ち切り ({run['notes'].get(phase)}) — ベースライン {before * 1000:.1f}ms")
+                    failures += 1
+                continue
+            tol = gate["phase_tolerance"].get(phase, gate["tolerance"])
+            limit = _limit(gate, phase, before)
+            label = f"[{run['size']:,}] {phase}: {seconds * 1000:.1f}ms (baseline {before * 1000:.1f}ms, 上限 {limit * 1000:.1f}ms)"
+            if seconds > limit:
+                err(label)
+                failures += 1
+            elif seconds < before / (1 + tol) - gate["min_ms"] / 1000:
+                ok(f"{label} — 改善。--update でベースラインを更新できる")
+    if failures == 0:
+        ok("全フェーズがベースラインの許容範囲内")
+    return failures
+
+
+# ============================================================
+# スケーリング検査
+# ============================================================
+def check_scaling(bench, gate: dict) -> int:
+    """n → 2n の時間比が max_ratio を超えたフェーズ数を返す"""
+    cfg = gate["scaling"]
+    small, large = cfg["sizes"]
+    max_ratio = cfg["max_ratio"] * (large / small) / 2     # sizes が 2 倍でない場合も線形換算
+    failures = 0
+    for shape in cfg["shapes"]:
+        best: dict[str, tuple[float, float, float]] = {}    # phase → (ratio, t_small, t_large)
+        notes: dict[str, str] = {}
+        pending = list(cfg["phases"])
+        for _ in range(max(1, cfg["attempts"])):
+            runs = [bench.bench_size(SynthSpec(skills=n, shape=shape), gate["repeat"], BUDGET_S, SKIP_PHASES)
+                    for n in (small, large)]
+            for phase in pending:
+                t_small, t_large = runs[0]["phases"].get(phase), runs[1]["phases"].get(phase)
+                if t_small is None or t_large is None:
+                    notes[phase] = runs[1]["notes"].get(phase) or runs[0]["notes"].get(phase) or "—"
+                    continue
+                notes.pop(phase, None)
+                ratio = t_large / t_small if t_small > 0 else 0.0
+                if phase not in best or ratio < best[phase][0]:
+                    best[phase] = (ratio, t_small, t_large)
+            pending = [p for p in pending
+                       if p in notes or (best[p][0] > max_ratio and best[p][2] * 1000 >= cfg["min_ms"])]
+            if not pending:
+                break
+
+        for phase in cfg["phases"]:
+            if phase in notes:
+                err(f"[{shape}] {phase}: 計測できない ({notes[phase]})")
+                failures += 1
+                continue
+            ratio, t_small, t_large = best[phase]
+            label = (f"[{shape}] {phase}: {small:,}→{large:,} で "
+                     f"{t_small * 1000:.1f}ms → {t_large * 1000:.1f}ms (×{ratio:.2f}, 上限 ×{max_ratio:.2f})")
+            if t_large * 1000 < cfg["min_ms"]:
+                ok(f"{label} — 計測下限未満のため判定なし")
+            elif ratio > max_ratio:
+                err(f"{label} — 超線形の疑い")
+                failures += 1
+            else:
+                ok(label)
+    return failures
+
+
+# ============================================================
+# メイン
+# ============================================================
+def main() -> int:
+    args = sys.argv[1:]
+    bench = load_script("bench-factory")
+    baseline = load_baseline(BASELINE_PATH)
+    gate = gate_config(baseline)
+    failures = 0
+
+    if "--update" in args:
+        runs = [median_run(bench, n, gate) for n in gate["sizes"]]
+        payload = {"meta": bench.run_meta(gate["repeat"], BUDGET_S), "gate": gate, "runs": runs}
+        BASELINE_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"✅ ベースラインを更新: {BASELINE_PATH.name}")
+        return 0
+
+    if "--scaling-only" not in args:
+        print(f"\n{BOLD}📊 ベースライン比較 (許容 +{gate['tolerance']:.0%} / +{gate['min_ms']:g}ms){RESET}")
+        if baseline is None:
+            err(f"{BASELINE_PATH.name} がない — 'perf-gate.py --update' で作成してください")
+            failures += 1
+        else:
+            base_runs = {r["size"]: r["phases"] for r in baseline.get("runs", [])}
+            runs = [measure(bench, n, gate, base_runs.get(n, {})) for n in gate["sizes"]]
+            failures += compare(baseline, runs, gate)
+
+    if "--baseline-only" not in args:
+        print(f"\n{BOLD}📈 スケーリング検査 (カタログ倍増時の時間比){RESET}")
+        failures += check_scaling(bench, gate)
+
+    print()
+    if failures:
+        print(f"{RED}{BOLD}❌  PERF REGRESSION: {failures} 件 — 上記 ✗ のフェーズを確認してください{RESET}")
+        return 1
+    print(f"{GREEN}{BOLD}✅  性能ゲートをパス{RESET}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
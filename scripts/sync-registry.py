@@ -3,177 +3,98 @@
 # スキル・エージェントファクトリー — レジストリ自動同期スクリプト
 # plugins/*/skills/*/metadata.md と plugins/*/agents/*.md をスキャンして
 # registry.md と README.md を更新する
+# あわせて機械可読な registry.json と照会用の .cache/registry.db (SQLite)、
+# ルーティング用の .cache/route-index.json (トリガーの転置インデックス) も生成する
 # Phase B: plugin 単位スキャンに対応
+#
+#   python3 scripts/sync-registry.py             # .cache/ のスナップショットを利用
+#   python3 scripts/sync-registry.py --no-cache  # 全ファイルを再パース
+#   python3 scripts/sync-registry.py --check     # 書き込まず、差分があれば exit 1
+#   python3 scripts/sync-registry.py --profile   # フェーズ別の時間・読み込み量・メモリを表示
+#                                    (--profile-trace FILE で Chrome trace-event JSON も出力)
+#
+# 出力はすべてメモリ上でレンダリングし、内容が変わったファイルのみ書き込む。
+# 各ファイルの生成箇所は <!-- SYNC:XXX_START/END --> マーカーで囲み、
+# factorylib.markers で 1 パス置換する。
+# Last Modified / Last updated の日付は内容が変わった行・ブロックのみ更新する。
 """
 
-import json
-import re
+import sys
 from datetime import date
+from functools import cache
 from pathlib import Path
 
+from factorylib.catalog import AgentInfo, Catalog, SkillInfo, load_catalog
+from factorylib.index import INDEX_NAME, build_index, ensure_db, render_index
+from factorylib.markers import MarkerError, parse_markers
+from factorylib.profile import count_read, phase, profiled
+from factorylib.route import ensure_route_index
+
 # ============================================================
 # 設定
 # ============================================================
 FACTORY_ROOT     = Path(__file__).parent.parent
-PLUGINS_DIR      = FACTORY_ROOT / "plugins"
 REGISTRY_MD      = FACTORY_ROOT / "registry.md"
+REGISTRY_JSON    = FACTORY_ROOT / INDEX_NAME
 README_MD        = FACTORY_ROOT / "README.md"
 HOW_IT_WORKS_MD  = FACTORY_ROOT / "_docs" / "how-it-works.md"
-TODAY            = date.today().isoformat()
-
 
-# ============================================================
-# フロントマターパーサー
-# ============================================================
-def parse_frontmatter(filepath: Path) -> dict:
-    """YAML フロントマター (---..---) をパースして dict を返す"""
-    try:
-        text = filepath.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return {}
 
-    if not text.startswith("---"):
-        return {}
+@cache
+def today() -> str:
+    """更新日 (初回呼び出し時に 1 回だけ決定し、1 回の実行内で統一する)"""
+    return date.today().isoformat()
 
-    end = text.find("\n---", 3)
-    if end == -1:
-        return {}
 
-    fm_block = text[3:end].strip()
-    result = {}
+# ============================================================
+# スキャン (plugins/ 単位 — factorylib.catalog の結果を asset dict に変換)
+# ============================================================
+def skill_asset(skill: SkillInfo) -> dict:
+    """indexed スキル 1 件の asset dict (metadata.md 優先、なければ SKILL.md)"""
+    fm          = skill.fm
+    plugin_name = skill.plugin
+    skill_path  = f"plugins/{plugin_name}/skills/{skill.dir_name}"
+
+    return {
+        "name":        skill.name,
+        "type":        "skill",
+        "plugin":      plugin_name,
+        "category":    fm.get("category") or plugin_name,
+        "tags":        fm.get("tags", []),
+        "model":       fm.get("model", "sonnet"),
+        "version":     fm.get("version", "v1.0"),
+        "description": (fm.get("use-when") or fm.get("description", "—")).strip(),   # > / | の末尾改行を除く
+        "file_path":   f"{skill_path}/SKILL.md",
+        "meta_path":   f"{skill_path}/{skill.source_name}",
+        "requires":    fm.get("requires", ""),
+    }
 
-    for line in fm_block.splitlines():
-        if ":" not in line:
-            continue
-        key, _, val = line.partition(":")
-        key = key.strip()
-        val = val.strip().strip('"').strip("'")
-        if key and val:
-            result[key] = val
-
-    def collect_multiline(field_name: str) -> str | None:
-        lines_out = []
-        in_field = False
-        for line in fm_block.splitlines():
-            if line.startswith(f"{field_name}:"):
-                in_field = True
-                val = line.partition(":")[2].strip().strip('"').strip("'").lstrip(">").strip()
-                if val:
-                    lines_out.append(val)
-            elif in_field and (line.startswith("  ") or line.startswith("\t")):
-                lines_out.append(line.strip())
-            else:
-                if in_field:
-                    in_field = False
-        return " ".join(lines_out) if lines_out else None
-
-    for field in ("description", "use-when"):
-        val = collect_multiline(field)
-        if val:
-            result[field] = val
-
-    # tags: [a, b, c] パース
-    if "tags" in result:
-        raw = result["tags"].strip("[]")
-        result["tags"] = [t.strip() for t in raw.split(",") if t.strip()]
-    else:
-        result["tags"] = []
 
-    return result
+def agent_asset(agent: AgentInfo) -> dict:
+    """エージェント 1 件の asset dict"""
+    fm = agent.fm
+    return {
+        "name":        agent.name,
+        "type":        "agent",
+        "plugin":      agent.plugin,
+        "category":    agent.plugin,
+        "tags":        fm.get("tags", []),
+        "model":       fm.get("model", "sonnet"),
+        "version":     fm.get("version", "v1.0"),
+        "description": fm.get("description", "—").strip(),
+        "file_path":   f"plugins/{agent.plugin}/agents/{agent.path.name}",
+        "requires":    fm.get("requires", ""),
+    }
 
 
-# ============================================================
-# スキャン (plugins/ 単位)
-# ============================================================
-def scan_skills() -> list[dict]:
+def scan_skills(catalog: Catalog) -> list[dict]:
     """plugins/*/skills/*/metadata.md を優先スキャン。なければ SKILL.md にフォールバック"""
-    assets = []
-    if not PLUGINS_DIR.exists():
-        return assets
+    return [skill_asset(skill) for skill in catalog.indexed_skills]
 
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-        skills_dir = plugin_dir / "skills"
-        if not skills_dir.exists():
-            continue
-        plugin_name = plugin_dir.name
-
-        for skill_dir in sorted(skills_dir.iterdir()):
-            if not skill_dir.is_dir():
-                continue
-
-            metadata_md = skill_dir / "metadata.md"
-            skill_md    = skill_dir / "SKILL.md"
-
-            if metadata_md.exists():
-                fm = parse_frontmatter(metadata_md)
-                source = "metadata.md"
-            elif skill_md.exists():
-                fm = parse_frontmatter(skill_md)
-                source = "SKILL.md"
-            else:
-                continue
-
-            name     = fm.get("name") or skill_dir.name
-            category = fm.get("category") or plugin_name
-            tags     = fm.get("tags", [])
-            desc     = fm.get("use-when") or fm.get("description", "—")
-            model    = fm.get("model", "sonnet")
-            requires = fm.get("requires", "")
-
-            assets.append({
-                "name":        name,
-                "type":        "skill",
-                "plugin":      plugin_name,
-                "category":    category,
-                "tags":        tags,
-                "model":       model,
-                "version":     fm.get("version", "v1.0"),
-                "description": desc,
-                "file_path":   f"plugins/{plugin_name}/skills/{skill_dir.name}/SKILL.md",
-                "meta_path":   f"plugins/{plugin_name}/skills/{skill_dir.name}/{source}",
-                "modified":    TODAY,
-                "requires":    requires,
-            })
-    return assets
-
-
-def scan_agents() -> list[dict]:
-    """plugins/*/agents/*.md をスキャン"""
-    assets = []
-    if not PLUGINS_DIR.exists():
-        return assets
-
-    for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-        if not plugin_dir.is_dir():
-            continue
-        agents_dir = plugin_dir / "agents"
-        if not agents_dir.exists():
-            continue
-        plugin_name = plugin_dir.name
-
-        for agent_md in sorted(agents_dir.glob("*.md")):
-            fm   = parse_frontmatter(agent_md)
-            name = fm.get("name") or agent_md.stem
-
-            if fm.get("status") == "deprecated":
-                continue
-
-            assets.append({
-                "name":        name,
-                "type":        "agent",
-                "plugin":      plugin_name,
-                "category":    plugin_name,
-                "tags":        fm.get("tags", []),
-                "model":       fm.get("model", "sonnet"),
-                "version":     fm.get("version", "v1.0"),
-                "description": fm.get("description", "—"),
-                "file_path":   f"plugins/{plugin_name}/agents/{agent_md.name}",
-                "modified":    TODAY,
-                "requires":    fm.get("requires", ""),
-            })
-    return assets
+
+def scan_agents(catalog: Catalog) -> list[dict]:
+    """plugins/*/agents/*.md をスキャン (deprecated は除外)"""
+    return [agent_asset(agent) for agent in catalog.agents if not agent.deprecated]
 
 
 # ============================================================
@@ -185,7 +106,26 @@ def fmt_tags(tags: list[str]) -> str:
     return ", ".join(f"`{t}`" for t in tags)
 
 
-def build_registry_table(assets: list[dict]) -> str:
+def _split_dated_row(line: str) -> tuple[str, str]:
+    """'| ... | 2026-03-01 |' を ('| ... |', '2026-03-01') に分割"""
+    body = line.rstrip()[:-1].rstrip()
+    idx = body.rfind("|")
+    return body[:idx + 1], body[idx + 1:].strip()
+
+
+def previous_row_dates(table: str) -> dict[str, tuple[str, str]]:
+    """既存 Registry Table の { name: (日付を除いた行, Last Modified) } を返す"""
+    rows: dict[str, tuple[str, str]] = {}
+    for line in table.splitlines():
+        if not line.startswith("| ") or line.startswith("| Name | Type |"):
+            continue
+        prefix, modified = _split_dated_row(line)
+        rows[line.split("|")[1].strip()] = (prefix, modified)
+    return rows
+
+
+def build_registry_table(assets: list[dict], previous: dict[str, tuple[str, str]]) -> str:
+    """previous に同一内容の行があればその日付を引き継ぎ、変わった行のみ today() を付ける"""
     header = (
         "| Name | Type | Plugin | Model | Tags | Version | Description | File Path | Last Modified |\n"
         "|------|------|--------|-------|------|---------|-------------|-----------|---------------|\n"
@@ -196,15 +136,18 @@ def build_registry_table(assets: list[dict]) -> str:
         if len(desc) > 100:
             desc = desc[:97] + "..."
         tags_str = fmt_tags(a.get("tags", []))
-        rows.append(
+        prefix = (
             f"| {a['name']} | {a['type']} | {a.get('plugin','—')} | {a.get('model','sonnet')} "
             f"| {tags_str} | {a['version']} "
-            f"| {desc} | {a['file_path']} | {a['modified']} |"
+            f"| {desc} | {a['file_path']} |"
         )
+        old_prefix, old_modified = previous.get(a["name"], ("", ""))
+        modified = old_modified if old_prefix == prefix else today()
+        rows.append(f"{prefix} {modified} |")
     return header + "\n".join(rows)
 
 
-def build_statistics(assets: list[dict]) -> str:
+def build_statistics(assets: list[dict], previous_stats: str = "") -> str:
     skills = [a for a in assets if a["type"] == "skill"]
     agents = [a for a in assets if a["type"] == "agent"]
 
@@ -230,39 +173,29 @@ def build_statistics(assets: list[dict]) -> str:
         "- **MCP Servers**: 0",
         "- **Output Styles**: 0",
         "",
-        f"*Last updated: {TODAY}*",
     ]
-    return "\n".join(lines)
+    body = "\n".join(lines)
 
+    # 統計が前回と同一なら Last updated の日付も引き継ぐ
+    old_body, _, old_footer = previous_stats.rpartition("\n")
+    if old_body == body and old_footer.startswith("*Last updated:"):
+        return previous_stats
+    return f"{body}\n*Last updated: {today()}*"
 
-def update_registry(assets: list[dict]):
-    text = REGISTRY_MD.read_text(encoding="utf-8")
 
-    table_str = build_registry_table(assets)
-    text = re.sub(
-        r"(## Registry Table\n\n).*?(\n---)",
-        rf"\g<1>{table_str}\n\2",
-        text,
-        flags=re.DOTALL,
-    )
-
-    stats_str = build_statistics(assets)
-    text = re.sub(
-        r"(## Statistics\n\n).*",
-        rf"\g<1>{stats_str}",
-        text,
-        flags=re.DOTALL,
-    )
-
-    REGISTRY_MD.write_text(text, encoding="utf-8")
-    print(f"✅ registry.md 更新完了 ({len(assets)} 件)")
+def render_registry(text: str, assets: list[dict]) -> str:
+    """registry.md の REGISTRY_TABLE / STATISTICS ブロックを再生成したテキストを返す"""
+    doc = parse_markers(text)
+    table_str = build_registry_table(assets, previous_row_dates(doc.block("REGISTRY_TABLE") or ""))
+    stats_str = build_statistics(assets, doc.block("STATISTICS") or "")
+    return doc.render({"REGISTRY_TABLE": table_str, "STATISTICS": stats_str})
 
 
 # ============================================================
 # README.md 更新
 # ============================================================
-def update_readme(assets: list[dict]):
-    text = README_MD.read_text(encoding="utf-8")
+def build_current_assets(assets: list[dict]) -> str:
+    """README.md の Current Skills & Agents (プラグイン別スキル + エージェント) テーブル"""
 
     skills = [a for a in assets if a["type"] == "skill"]
     agents = [a for a in assets if a["type"] == "agent"]
@@ -293,16 +226,7 @@ def update_readme(assets: list[dict]):
     ]
     agents_block = agent_header + "\n" + "\n".join(agent_rows)
 
-    replacement = f"## Current Skills & Agents\n\n{skills_block}\n\n{agents_block}"
-    text = re.sub(
-        r"## Current Skills & Agents.*?(?=\n## )",
-        replacement + "\n\n",
-        text,
-        flags=re.DOTALL,
-    )
-
-    README_MD.write_text(text, encoding="utf-8")
-    print(f"✅ README.md 更新完了")
+    return f"{skills_block}\n\n{agents_block}"
 
 
 # ============================================================
@@ -317,23 +241,9 @@ TEAM_EXECUTION = {
 }
 
 
-def build_teams_table() -> str:
+def build_teams_table(catalog: Catalog) -> str:
     """全 plugin.json の teams: を集約して Markdown テーブルを生成"""
-    # チームごとにメンバーを集約
-    team_members: dict[str, list[str]] = {}
-    if PLUGINS_DIR.exists():
-        for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-            if not plugin_dir.is_dir():
-                continue
-            pjson = plugin_dir / "plugin.json"
-            if not pjson.exists():
-                continue
-            try:
-                data = json.loads(pjson.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                continue
-            for team_name, members in data.get("teams", {}).items():
-                team_members.setdefault(team_name, []).extend(members)
+    team_members = catalog.teams()
 
     if not team_members:
         return "| Team | Execution | Members |\n|------|-----------|---------|"
@@ -349,15 +259,12 @@ def build_teams_table() -> str:
     return header + "\n" + "\n".join(rows)
 
 
-def update_readme_teams(text: str) -> str:
-    """README の TEAMS_TABLE_START ~ END ブロックを更新"""
-    table = build_teams_table()
-    return re.sub(
-        r"(<!-- TEAMS_TABLE_START -->).*?(<!-- TEAMS_TABLE_END -->)",
-        rf"\1\n{table}\n\2",
-        text,
-        flags=re.DOTALL,
-    )
+def render_readme(text: str, assets: list[dict], catalog: Catalog) -> str:
+    """README.md の CURRENT_ASSETS / TEAMS_TABLE ブロックを再生成したテキストを返す"""
+    return parse_markers(text).render({
+        "CURRENT_ASSETS": build_current_assets(assets),
+        "TEAMS_TABLE":    build_teams_table(catalog),
+    })
 
 
 # ============================================================
@@ -433,104 +340,128 @@ def build_team_table_kr(teams: dict[str, list[str]]) -> str:
     return "\n".join(lines)
 
 
-def collect_teams() -> dict[str, list[str]]:
-    """全 plugin.json の teams: を集約"""
-    team_members: dict[str, list[str]] = {}
-    if PLUGINS_DIR.exists():
-        for plugin_dir in sorted(PLUGINS_DIR.iterdir()):
-            if not plugin_dir.is_dir():
-                continue
-            pjson = plugin_dir / "plugin.json"
-            if not pjson.exists():
-                continue
-            try:
-                data = json.loads(pjson.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                continue
-            for team_name, members in data.get("teams", {}).items():
-                team_members.setdefault(team_name, []).extend(members)
-    return team_members
-
-
-def update_how_it_works(skills: list[dict], agents: list[dict]):
-    """how-it-works.md のマーカーブロックを自動更新"""
-    if not HOW_IT_WORKS_MD.exists():
-        print("⚠️  how-it-works.md が見つからない — スキップ")
-        return
-
-    text = HOW_IT_WORKS_MD.read_text(encoding="utf-8")
-    teams = collect_teams()
-
-    # AGENT_SUMMARY ブロック
-    agent_block = build_agent_summary_kr(agents)
-    text = re.sub(
-        r"(<!-- SYNC:AGENT_SUMMARY_START -->).*?(<!-- SYNC:AGENT_SUMMARY_END -->)",
-        rf"\g<1>\n{agent_block}\n\g<2>",
-        text,
-        flags=re.DOTALL,
-    )
-
-    # SKILL_SUMMARY ブロック
-    skill_block = build_skill_summary_kr(skills)
-    text = re.sub(
-        r"(<!-- SYNC:SKILL_SUMMARY_START -->).*?(<!-- SYNC:SKILL_SUMMARY_END -->)",
-        rf"\g<1>\n{skill_block}\n\g<2>",
-        text,
-        flags=re.DOTALL,
-    )
+def render_how_it_works(text: str, skills: list[dict], agents: list[dict], catalog: Catalog) -> str:
+    """how-it-works.md のマーカーブロックを再生成したテキストを返す"""
+    teams = catalog.teams()
+    return parse_markers(text).render({
+        "AGENT_SUMMARY": build_agent_summary_kr(agents),
+        "SKILL_SUMMARY": build_skill_summary_kr(skills),
+        "TEAM_COUNT":    f"### {len(teams)}가지 팀",
+        "TEAM_TABLE":    build_team_table_kr(teams),
+    })
 
-    # TEAM_COUNT ブロック
-    team_heading = f"### {len(teams)}가지 팀"
-    text = re.sub(
-        r"(<!-- SYNC:TEAM_COUNT_START -->).*?(<!-- SYNC:TEAM_COUNT_END -->)",
-        rf"\g<1>\n{team_heading}\n\g<2>",
-        text,
-        flags=re.DOTALL,
-    )
 
-    # TEAM_TABLE ブロック
-    team_table = build_team_table_kr(teams)
-    text = re.sub(
-        r"(<!-- SYNC:TEAM_TABLE_START -->).*?(<!-- SYNC:TEAM_TABLE_END -->)",
-        rf"\g<1>\n{team_table}\n\g<2>",
-        text,
-        flags=re.DOTALL,
-    )
+# ============================================================
+# registry.json / registry.db (factorylib.index)
+# ============================================================
+def sync_index(assets: list[dict], catalog: Catalog, check: bool) -> bool:
+    """
+    registry.json を再生成し、内容が変わった場合のみ書き込む (registry.md と同じく --check 対象)。
+    続けて .cache/registry.db と .cache/route-index.json を registry.json に合わせる
+    (--check ではどちらも書き込まない)
+    """
+    rel = REGISTRY_JSON.relative_to(FACTORY_ROOT)
+    new = render_index(build_index(assets, catalog.plugins))
+    old = None
+    if REGISTRY_JSON.exists():
+        raw = REGISTRY_JSON.read_bytes()
+        count_read(len(raw))
+        old = raw.decode("utf-8")
+
+    drift = new != old
+    if not drift:
+        print(f"✓  {rel} 変更なし")
+    elif check:
+        print(f"✗  {rel} が最新ではない — 'make sync' を実行してください")
+        return True
+    else:
+        REGISTRY_JSON.write_text(new, encoding="utf-8")
+        print(f"✅ {rel} 更新完了")
 
-    HOW_IT_WORKS_MD.write_text(text, encoding="utf-8")
-    print(f"✅ how-it-works.md 更新完了")
+    if not check and ensure_db(FACTORY_ROOT):
+        print("✅ .cache/registry.db 再構築")
+    if not check and ensure_route_index(FACTORY_ROOT):
+        print("✅ .cache/route-index.json 再構築")
+    return drift
 
 
 # ============================================================
 # エントリポイント
 # ============================================================
-def main():
+def sync_file(path: Path, render, check: bool, failures: list[Path] | None = None) -> bool:
+    """
+    path を render(text) で再生成し、内容が変わった場合のみ書き込む。
+    check=True なら書き込まない。差分 (drift) があれば True を返す。
+    SYNC マーカーの不備で再生成できなければ何も書かず、failures に path を追加して False を返す。
+    """
+    rel = path.relative_to(FACTORY_ROOT)
+    if not path.exists():
+        print(f"⚠️  {rel} が見つからない — スキップ")
+        return False
+
+    raw = path.read_bytes()
+    count_read(len(raw))
+    old = raw.decode("utf-8")
+    try:
+        new = render(old)
+    except MarkerError as e:
+        for problem in e.problems:
+            print(f"❌ {rel}: {problem}")
+        if failures is not None:
+            failures.append(path)
+        return False
+    if new == old:
+        print(f"✓  {rel} 変更なし")
+        return False
+    if check:
+        print(f"✗  {rel} が最新ではない — 'make sync' を実行してください")
+        return True
+
+    path.write_text(new, encoding="utf-8")
+    print(f"✅ {rel} 更新完了")
+    return True
+
+
+@profiled
+def main(catalog: Catalog | None = None) -> int:
+    """catalog を渡すと走査を省略する (factory.py validate で他フェーズと共有)"""
+    check = "--check" in sys.argv
     print(f"🔍 スキャン開始: {FACTORY_ROOT}")
     print(f"   Plugin 単位スキャン (Phase B)")
 
-    skills = scan_skills()
-    agents = scan_agents()
+    if catalog is None:
+        with phase("catalog.load"):
+            catalog = load_catalog(FACTORY_ROOT, use_cache="--no-cache" not in sys.argv)
+    with phase("sync.scan"):
+        skills  = scan_skills(catalog)
+        agents  = scan_agents(catalog)
     all_assets = skills + agents
 
     meta_count     = sum(1 for s in skills if "metadata.md" in s.get("meta_path", ""))
     fallback_count = len(skills) - meta_count
 
     print(f"   スキル: {len(skills)} 件 (metadata.md: {meta_count}, SKILL.md fallback: {fallback_count})")
-    print(f"   エージェント: {len(agents)} 件")
-
-    update_registry(all_assets)
-    update_readme(all_assets)
-
-    # Agent Teams テーブル更新
-    readme_text = README_MD.read_text(encoding="utf-8")
-    readme_text = update_readme_teams(readme_text)
-    README_MD.write_text(readme_text, encoding="utf-8")
-    print("✅ README.md Teams テーブル更新完了")
+    print(f"   エージェント: {len(agents)} 件 (合計 {len(all_assets)} 件)")
 
-    # how-it-works.md 自動更新
-    update_how_it_works(skills, agents)
-
-    print("\n✨ 同期完了!")
+    # 全出力をメモリ上でレンダリングし、変更があったものだけ書き込む
+    outputs = [
+        ("sync.registry",     REGISTRY_MD,     lambda t: render_registry(t, all_assets)),
+        ("sync.readme",       README_MD,       lambda t: render_readme(t, all_assets, catalog)),
+        ("sync.how_it_works", HOW_IT_WORKS_MD, lambda t: render_how_it_works(t, skills, agents, catalog)),
+    ]
+    drift = []
+    failures: list[Path] = []
+    for name, path, render in outputs:
+        with phase(name):
+            drift.append(sync_file(path, render, check, failures))
+    with phase("sync.index"):
+        drift.append(sync_index(all_assets, catalog, check))
+
+    # 構文エラーのキーは既定値 (model: sonnet など) で出力されるため、lint を待たずに知らせる
+    broken = [(s.fm_source, s.fm_error) for s in catalog.indexed_skills if s.fm_error]
+    broken += [(a.path, a.fm_error) for a in catalog.agents if a.fm_error and not a.deprecated]
+    for path, e in broken:
+        print(f"⚠️  frontmatter の構文エラー ({path.relative_to(FACTORY_ROOT)}:{e}) — 該当キーは既定値で出力")
 
     for a in all_assets:
         if a["description"] == "—":
@@ -538,6 +469,19 @@ def main():
         if a["type"] == "skill" and not a.get("tags"):
             print(f"⚠️  tags 未設定: {a['file_path']}")
 
+    if failures:
+        print(f"\n❌ SYNC マーカーの不備で {len(failures)} ファイルを同期できませんでした")
+        return 1
+    if check:
+        if any(drift):
+            print("\n❌ 生成ファイルが最新ではありません (--check)")
+            return 1
+        print("\n✨ 生成ファイルはすべて最新です (--check)")
+        return 0
+
+    print("\n✨ 同期完了!")
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+watch-factory.py — lint / sync / dep チェックの watch モード
+
+カタログをメモリ上に保持したまま plugins/ とドキュメントをポーリングし、
+変更されたファイルに関係するチェックだけを再実行する:
+  - 変更スキル + requires: の逆依存 (推移的) → スキルチェック
+  - 変更エージェント (スキル・エージェント名の増減時は全エージェント) → エージェントチェック
+  - plugin.json の変更・スキルの増減 → Teams チェック
+  - requires: の変更 → 循環参照・依存チェーン深さ
+  - スキル・エージェント・plugin.json の変更 → トリガー衝突 (全組を再比較)
+  - 変更ドキュメント → Doc Drift
+  - カタログの変更 → 生成ドキュメントを再レンダリングし、差分のあるファイルだけ書き込む
+
+使い方:
+  python3 scripts/watch-factory.py                  # 1 秒間隔でポーリング (Ctrl-C で終了)
+  python3 scripts/watch-factory.py --interval 0.3   # ポーリング間隔 (秒)
+  python3 scripts/watch-factory.py --no-sync        # 生成ドキュメントを書き込まない
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from factorylib.catalog import AgentInfo, SkillInfo, load_catalog
+from factorylib.drift import DriftMatcher, collect_targets
+from factorylib.findings import Finding, count
+from factorylib.graph import DepGraph
+from factorylib.loader import load_script
+from factorylib.references import ReferenceResolver
+from factorylib.watch import MtimePoller
+
+# ============================================================
+# 設定
+# ============================================================
+FACTORY_ROOT = Path(__file__).resolve().parent.parent
+
+# lint-skills.py / sync-registry.py のモジュール (import を軽くするため main() で読み込む)
+lint = sync = None
+
+# ── ANSI カラー ──────────────────────────────────────────
+GREEN  = "\033[32m"
+YELLOW = "\033[33m"
+RED    = "\033[31m"
+BLUE   = "\033[34m"
+BOLD   = "\033[1m"
+RESET  = "\033[0m"
+
+
+# ============================================================
+# セッション (カタログと各チェック結果をメモリ上に保持)
+# ============================================================
+class WatchSession:
+    def __init__(self, write_docs: bool):
+        self.write_docs = write_docs
+        self.catalog = load_catalog(FACTORY_ROOT)
+        self.drift_rules, self.drift_targets = lint.resolve_drift_rules()
+        self.matcher = DriftMatcher(self.drift_rules)
+
+        self.skill_findings: dict[Path, list[Finding]] = {}
+        self.agent_findings: dict[Path, list[Finding]] = {}
+        self.doc_findings: dict[Path, list[Finding]] = {}
+        self.global_counts: dict[str, tuple[int, int]] = {}    # teams / cycles / depth / collisions
+        self.assets: dict[Path, dict] = {}                      # sync 用 asset dict (未変更分を再利用)
+        self.deps: dict[str, list[str]] = {}
+
+    # ── 監視対象 ───────────────────────────────────────
+    def doc_paths(self) -> dict[Path, tuple[str, tuple[str, ...]]]:
+        return {path: (rel, allow) for path, rel, allow in collect_targets(FACTORY_ROOT, self.drift_targets)}
+
+    # ── 個別チェック ───────────────────────────────────
+    def _check_skills(self, skills: list[SkillInfo]) -> None:
+        names = self.catalog.skill_dir_names()
+        for skill in skills:
+            findings = lint.check_skill(skill, names)
+            lint.report_findings(skill.dir_name, findings)
+            self.skill_findings[skill.path] = findings
+
+    def _check_agents(self, agents: list[AgentInfo]) -> None:
+        self.global_counts["agents"] = (0, 0 if self.catalog.agents else 1)
+        if not self.catalog.agents:
+            lint.warn("plugins/*/agents/ にエージェントが見つからない")
+        resolver = ReferenceResolver.from_catalog(self.catalog)
+        for agent in agents:
+            findings = lint.check_agent(agent, resolver)
+            lint.report_findings(agent.stem, findings)
+            self.agent_findings[agent.path] = findings
+
+    def _check_teams(self) -> None:
+        e, w = lint.emit(lint.check_teams(self.catalog, self.catalog.skill_dir_names()))
+        if e == 0 and w == 0:
+            lint.ok("全 teams エントリの参照が正常")
+        self.global_counts["teams"] = (e, w)
+
+    def _check_collisions(self) -> None:
+        # 組ごとの指摘なので、1 件の変更でも全体を比較し直す (LSH で候補の組だけを比べるため軽い)
+        e, w = lint.emit(lint.check_trigger_collisions(self.catalog))
+        if e == 0 and w == 0:
+            lint.ok("トリガーの重複なし")
+        self.global_counts["collisions"] = (e, w)
+
+    def _check_graph(self) -> None:
+        graph = DepGraph(self.deps)
+        cycle_errors, _ = lint.emit(lint.check_circular_requires(graph))
+        if cycle_errors == 0:
+            lint.ok("循環参照なし")
+        _, depth_warnings = lint.emit(lint.check_dep_depth(graph))
+        if depth_warnings == 0:
+            lint.ok(f"全チェーン深さ {lint.MAX_DEP_DEPTH} 未満")
+        self.global_counts["cycles"] = (cycle_errors, 0)
+        self.global_counts["depth"] = (0, depth_warnings)
+
+    def _check_docs(self, paths: list[Path]) -> None:
+        targets = self.doc_paths()
+        for path in paths:
+            self.doc_findings.pop(path, None)
+            if path not in targets:
+                continue
+            rel, allow = targets[path]
+            try:
+                text = path.read_bytes().decode("utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            findings = self.matcher.scan(text, rel, allow)
+            lint.report_findings(rel, findings)
+            self.doc_findings[path] = findings
+
+    def _sync_docs(self, touched: set[Path]) -> None:
+        sync.today.cache_clear()    # 日付をまたいで監視し続けても更新日がずれないように
+        for path in touched:
+            self.assets.pop(path, None)
+        skills = [self._asset(s.path, s, sync.skill_asset) for s in self.catalog.indexed_skills]
+        agents = [self._asset(a.path, a, sync.agent_asset) for a in self.catalog.agents if not a.deprecated]
+        all_assets = skills + agents
+        check = not self.write_docs
+        sync.sync_file(sync.REGISTRY_MD, lambda t: sync.render_registry(t, all_assets), check)
+        sync.sync_file(sync.README_MD, lambda t: sync.render_readme(t, all_assets, self.catalog), check)
+        sync.sync_file(sync.HOW_IT_WORKS_MD,
+                       lambda t: sync.render_how_it_works(t, skills, agents, self.catalog), check)
+        sync.sync_index(all_assets, self.catalog, check)
+
+    def _asset(self, path: Path, item, build) -> dict:
+        if path not in self.assets:
+            self.assets[path] = build(item)
+        return self.assets[path]
+
+    # ── 実行 ──────────────────────────────────────────
+    def full_run(self) -> None:
+        self.deps = self.catalog.deps()
+        self._section("📦 Skills")
+        self._check_skills(self.catalog.skills)
+        self._section("🤖 Agents")
+        self._check_agents(self.catalog.agents)
+        self._section("🔄 依存グラフ")
+        self._check_graph()
+        self._section("🤝 Teams")
+        self._check_teams()
+        self._section(f"🔀 トリガー衝突 (類似度 {lint.COLLISION_THRESHOLD} 以上)")
+        self._check_collisions()
+        self._section("📄 Doc Drift")
+        self._check_docs(list(self.doc_paths()))
+        self._section("📝 Sync")
+        self._sync_docs(set())
+        self._summary()
+
+    def update(self, changed: list[Path]) -> None:
+        """変更パスに関係するチェックだけを再実行する"""
+        stamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\n{BOLD}{BLUE}🔁 [{stamp}] 変更検出: {len(changed)} ファイル{RESET}")
+        for path in changed[:5]:
+            print(f"   {path.relative_to(FACTORY_ROOT).as_posix()}")
+        if len(changed) > 5:
+            print(f"   … (+{len(changed) - 5})")
+
+        old_names = (self.catalog.skill_dir_names(), self.catalog.agent_stems())
+        old_graph = DepGraph(self.deps)
+        old_skill_names = {s.path: s.name for s in self.catalog.skills}
+
+        delta = self.catalog.refresh(changed)
+        new_deps = self.catalog.deps()
+        names_changed = old_names != (self.catalog.skill_dir_names(), self.catalog.agent_stems())
+        deps_changed = new_deps != self.deps
+        self.deps = new_deps
+
+        for path in delta.skills:
+            self.skill_findings.pop(path, None)
+        for path in delta.agents:
+            self.agent_findings.pop(path, None)
+
+        # 変更スキル + requires: で (推移的に) 依存しているスキル
+        touched = {s.name for s in self.catalog.skills if s.path in delta.skills}
+        touched |= {old_skill_names[p] for p in delta.skills if p in old_skill_names}
+        touched |= {p.name for p in delta.skills}
+        dependents = old_graph.dependents_of(touched) | DepGraph(new_deps).dependents_of(touched)
+        skills = [s for s in self.catalog.skills if s.path in delta.skills or s.name in dependents]
+        if skills:
+            self._section(f"📦 Skills (再チェック {len(skills)} 件)")
+            self._check_skills(skills)
+
+        agents = self.catalog.agents if names_changed or delta.plugins else \
+            [a for a in self.catalog.agents if a.path in delta.agents]
+        if agents:
+            self._section(f"🤖 Agents (再チェック {len(agents)} 件)")
+            self._check_agents(agents)
+
+        if deps_changed:
+            self._section("🔄 依存グラフ")
+            self._check_graph()
+
+        if delta.plugins or names_changed:
+            self._section("🤝 Teams")
+            self._check_teams()
+
+        if delta.skills or delta.agents or delta.plugins:
+            self._section(f"🔀 トリガー衝突 (類似度 {lint.COLLISION_THRESHOLD} 以上)")
+            self._check_collisions()
+
+        doc_paths = self.doc_paths()
+        docs = [p for p in changed if p in self.doc_findings or p in doc_paths]
+        if docs:
+            self._section("📄 Doc Drift")
+            self._check_docs(docs)
+
+        if delta:
+            self._section("📝 Sync")
+            self._sync_docs(delta.skills | delta.agents)
+        self._summary()
+
+    # ── 表示 ──────────────────────────────────────────
+    @staticmethod
+    def _section(title: str) -> None:
+        print(f"\n{BOLD}{title}{RESET}")
+
+    def _summary(self) -> None:
+        errors = warnings = 0
+        for table in (self.skill_findings, self.agent_findings, self.doc_findings):
+            for findings in table.values():
+                e, w = count(findings)
+                errors, warnings = errors + e, warnings + w
+        for e, w in self.global_counts.values():
+            errors, warnings = errors + e, warnings + w
+
+        if errors == 0 and warnings == 0:
+            status = f"{GREEN}{BOLD}✅ すべてのチェックをパス{RESET}"
+        elif errors == 0:
+            status = f"{YELLOW}{BOLD}⚠  警告 {warnings} 件 (エラーなし){RESET}"
+        else:
+            status = f"{RED}{BOLD}❌ エラー {errors} 件 / 警告 {warnings} 件{RESET}"
+        print(f"\n{status}  — 監視中 (Ctrl-C で終了)")
+
+
+# ============================================================
+# メイン
+# ============================================================
+def main() -> int:
+    global lint, sync
+    args = sys.argv[1:]
+    interval = 1.0
+    if "--interval" in args:
+        idx = args.index("--interval")
+        try:
+            interval = float(args[idx + 1])
+        except (IndexError, ValueError):
+            print(f"{RED}使い方: watch-factory.py --interval <秒>{RESET}")
+            return 1
+
+    lint = load_script("lint-skills")
+    sync = load_script("sync-registry")
+    try:
+        lint.configure(sys.argv)
+        session = WatchSession(write_docs="--no-sync" not in args)
+    except ValueError as e:
+        lint.err(str(e))
+        return 1
+
+    print(f"{BOLD}{BLUE}👀 watch 開始: {FACTORY_ROOT}{RESET}")
+    session.full_run()
+    poller = MtimePoller(FACTORY_ROOT / "plugins", extra=lambda: session.doc_paths())
+
+    try:
+        while True:
+            time.sleep(interval)
+            changed = poller.poll()
+            if changed:
+                session.update(changed)
+    except KeyboardInterrupt:
+        print("\n👋 watch 終了")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())